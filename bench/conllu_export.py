@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+'''
+Speed benchmark for exporter.CoNLLUPlusExporter and CoNLLUExporter.
+
+Exports a synthetic document with the previous line-by-line
+implementation and with the current exporters
+and reports the number of tokens written per second.
+
+Usage: python conllu_export.py [number of tokens]
+'''
+
+import os
+import sys
+import random
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from document import Doc, Sentence, Token
+from exporter import CoNLLUPlusExporter, CoNLLUExporter
+
+############################
+
+class LineCoNLLUExporter(CoNLLUExporter):
+    """
+    Previous implementation, which sorts the columns for each token
+    and prints each line separately.
+    """
+
+    def export(self, doc, outdir):
+
+        outfile = self.create_outfile(doc.filename, outdir)
+        if not outfile: return
+
+        header = "# global.columns = " + " ".join([key for key,val in sorted(self.COLUMNS.items(), key=lambda l: l[1])])
+        print(header, file=outfile)
+
+        for sent in doc.sentences:
+
+            for metainfo, _ in sorted(self.META.items(), key=lambda l: l[1]):
+                val = sent.__dict__.get(metainfo, None)
+                if val: print("# {0} = {1}".format(metainfo, val), file=outfile)
+
+            for word in sent.tokens:
+                print("\t".join([str(word.__dict__.get(col, "_")) \
+                                 for col, _ in sorted(self.COLUMNS.items(), key=lambda l: l[1])]), \
+                      file=outfile)
+
+            if not sent is doc.sentences[-1]:
+                print(file=outfile)
+
+        outfile.close()
+
+############################
+
+class LineCoNLLUPlusExporter(CoNLLUPlusExporter):
+    """
+    Previous implementation of the CoNLL-U Plus export.
+    """
+
+    def set_colums(self, doc):
+        additional_annos = set()
+        for sent in doc.sentences:
+            for tok in sent.tokens:
+                for anno, val in tok.__dict__.items():
+                    if not anno in self.COLUMNS and not val in (None, "_"):
+                        additional_annos.add(anno)
+        if additional_annos:
+            for i, anno in enumerate(sorted(additional_annos)):
+                self.COLUMNS[anno] = i+len(self.COLUMNS)+1
+
+    def export(self, doc, outdir):
+        self.set_colums(doc)
+        LineCoNLLUExporter.export(self, doc, outdir)
+
+############################
+
+def synthetic_doc(n, seed=42):
+    """
+    Return a doc with n tokens in sentences of up to 30 tokens.
+    """
+    rand = random.Random(seed)
+    xpos = ["NN", "ART", "ADJA", "VVFIN", "APPR", "$,", "$.", "ADV", "KON", "PPER"]
+    deprel = ["nsubj", "obj", "det", "amod", "case", "punct", "root", "advmod", "cc"]
+    doc = Doc("bench.conllu")
+    while n > 0:
+        k = min(n, rand.randint(1, 30))
+        sent = Sentence(**{"sent_id" : str(len(doc.sentences)+1)})
+        for i in range(k):
+            sent.add_token(Token(**{"ID" : str(i+1), "FORM" : "wort" + str(rand.randint(0, 5000)),
+                                    "LEMMA" : "lemma" + str(rand.randint(0, 3000)), "XPOS" : rand.choice(xpos),
+                                    "HEAD" : str(rand.randint(0, k)), "DEPREL" : rand.choice(deprel),
+                                    "TopF" : rand.choice(["MF", "VF", "LK", "_"])}))
+        sent.text = " ".join(tok.FORM for tok in sent.tokens)
+        doc.add_sent(sent)
+        n -= k
+    return doc
+
+############################
+
+def measure(exporter, doc, outdir):
+    """
+    Return the time in seconds to export the doc.
+    """
+    start = perf_counter()
+    exporter.export(doc, outdir)
+    return perf_counter() - start
+
+############################
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    doc = synthetic_doc(n)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+
+        for name, exporter in [("conllu (lines)", LineCoNLLUExporter()),
+                               ("conllu", CoNLLUExporter()),
+                               ("conlluplus (lines)", LineCoNLLUPlusExporter()),
+                               ("conlluplus", CoNLLUPlusExporter())]:
+            outdir = os.path.join(tmpdir, name.replace(" ", ""))
+            os.makedirs(outdir)
+            seconds = measure(exporter, doc, outdir)
+            print("{0:<20} {1:>6.2f} s {2:>10.0f} tokens/s".format(name, seconds, n/seconds))
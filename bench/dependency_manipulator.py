@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+'''
+Throughput benchmark for processor.DependencyManipulator.
+
+Converts synthetic UD sentences of growing length with
+copula, auxiliaries, prepositions, coordination and flat names.
+For a linear implementation, the number of tokens per second
+does not depend on the sentence length.
+
+Usage: python dependency_manipulator.py [number of tokens per length]
+'''
+
+import os
+import sys
+import random
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from document import Sentence, Token
+from processor import DependencyManipulator
+
+############################
+
+def clause(rand, tokens, head, deprel):
+    """
+    Append the tokens of a clause attached to the given head
+    (0 for the root) and return the position of the main verb.
+    Tokens are lists [FORM, XPOS, HEAD, DEPREL] with 1-based heads.
+    """
+    def add(form, xpos, head, deprel):
+        tokens.append([form, xpos, head, deprel])
+        return len(tokens)
+
+    kind = rand.choice(["aux", "cop", "simple"])
+
+    if kind == "cop":
+        pred = add("alt", "ADJD", head, deprel)
+        add("ist", "VAFIN", pred, "cop")
+        add("er", "PPER", pred, "nsubj")
+    else:
+        verb = add("gesehen", "VVPP", head, deprel)
+        if kind == "aux":
+            add("hat", "VAFIN", verb, "aux")
+            if rand.random() < 0.3:
+                add("worden", "VAPP", verb, "aux:pass")
+        add("sie", "PPER", verb, "nsubj")
+        pred = verb
+
+    #Prepositional phrases
+    for _ in range(rand.randint(0, 2)):
+        noun = add("Haus", "NN", pred, "obl")
+        add("in", "APPR", noun, "case")
+        add("das", "ART", noun, "det")
+        if rand.random() < 0.2:
+            add("hinein", "APZR", noun, "fixed")
+
+    #Names
+    if rand.random() < 0.3:
+        name = add("Anna", "NE", pred, "obj")
+        add("Maria", "NE", name, "flat")
+        add("Müller", "NE", name, "flat")
+
+    #Coordination
+    if rand.random() < 0.4:
+        conj = add("lief", "VVFIN", pred, "conj")
+        add("und", "KON", conj, "cc")
+
+    return pred
+
+############################
+
+def long_sentence(n, seed=42):
+    """
+    Return a sentence with about n tokens
+    in coordinated clauses.
+    """
+    rand = random.Random(seed)
+    tokens = []
+    root = clause(rand, tokens, 0, "root")
+    while len(tokens) < n:
+        clause(rand, tokens, root, rand.choice(["conj", "ccomp", "advcl"]))
+
+    sent = Sentence()
+    for i, (form, xpos, head, deprel) in enumerate(tokens):
+        sent.add_token(Token(**{"ID" : str(i+1), "FORM" : form, "XPOS" : xpos,
+                                "HEAD" : str(head), "DEPREL" : deprel}))
+    return sent
+
+############################
+
+def measure(length, n_tokens):
+    """
+    Return the tokens per second for sentences
+    of the given length (n_tokens in total).
+    """
+    sentences = [long_sentence(length, seed=i) for i in range(max(1, n_tokens // length))]
+    tokens = sum(len(sent.tokens) for sent in sentences)
+
+    manipulator = DependencyManipulator()
+    start = perf_counter()
+    for sent in sentences:
+        manipulator.process_sentence(sent)
+    return tokens / (perf_counter() - start)
+
+############################
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    for length in [10, 50, 300, 1000, 5000]:
+        print("{0:>5} tokens/sentence {1:>10.0f} tokens/s".format(length, measure(length, n)))
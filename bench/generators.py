@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+'''
+Seeded generators for synthetic input files.
+
+Each generator yields the lines of a file in one of the input
+formats with n sentences of 1 to 25 tokens. The same seed always
+produces the same file. Tags are taken from the mapping tables
+in res, so the tagset mappers can process the generated files.
+
+Use write_input(importer name, directory, n, seed) to write
+an input file (and the additional files some importers need).
+'''
+
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from tagsets import get_tagset
+from ptb_parser import long_tree
+
+############################
+
+FORMS = ["Haus", "der", "alte", "geht", "ſo", "vnd", "Frau", ",", "."]
+POS = ["NN", "ART", "ADJA", "VVFIN", "ADV", "KON", "NN", "$,", "$."]
+DEPRELS = ["nsubj", "obj", "det", "amod", "case", "obl", "advmod", "cc", "conj", "punct"]
+
+############################
+
+def lengths(rand, n):
+    """
+    Yield the lengths of n sentences.
+    """
+    for _ in range(n):
+        yield rand.randint(1, 25)
+
+############################
+
+def words(rand, k):
+    """
+    Return k (form, STTS tag) pairs,
+    the last one is a full stop.
+    """
+    pairs = []
+    for _ in range(k-1):
+        i = rand.randrange(len(FORMS)-1)
+        pairs.append((FORMS[i], POS[i]))
+    pairs.append((".", "$."))
+    return pairs
+
+############################
+
+def conllu(n, seed=42, comments=False):
+    """
+    Yield the lines of a CoNLL-U file with n sentences.
+    Each sentence is a valid dependency tree.
+    The CoNLL-U importer does not read comment lines,
+    so sent_id and text are only given if comments is True.
+    """
+    rand = random.Random(seed)
+    for s, k in enumerate(lengths(rand, n)):
+        pairs = words(rand, k)
+        if comments:
+            yield "# sent_id = {0}".format(s+1)
+            yield "# text = {0}".format(" ".join(form for form, _ in pairs))
+        for i, (form, xpos) in enumerate(pairs):
+            head = 0 if i == 0 else rand.randint(1, i)
+            deprel = "root" if head == 0 else ("punct" if xpos.startswith("$") else rand.choice(DEPRELS))
+            yield "\t".join([str(i+1), form, form.lower(), "_", xpos, "_", str(head), deprel, "_", "_"])
+        yield ""
+
+############################
+
+def conlluplus(n, seed=42):
+    """
+    Yield the lines of a CoNLL-U Plus file with n sentences
+    and additional columns for topological fields and chunks.
+    """
+    yield "# global.columns = ID FORM LEMMA UPOS XPOS FEATS HEAD DEPREL DEPS MISC TopF CHUNK"
+    rand = random.Random(seed)
+    for line in conllu(n, seed, comments=True):
+        if line and not line.startswith("#"):
+            line += "\t" + rand.choice(["VF", "LK", "MF", "RK", "NF"]) + "\t" + rand.choice(["B-NC", "I-NC", "O"])
+        yield line
+
+############################
+
+def dta_tsv(n, seed=42):
+    """
+    Yield the lines of a DTA TSV (WebAnno) file with n sentences.
+    """
+    rand = random.Random(seed)
+    yield "#FORMAT=WebAnno TSV 3.2"
+    yield "#T_SP=de.tudarmstadt.ukp.dkpro.core.api.lexmorph.type.pos.POS|PosValue"
+    yield ""
+    offset = 0
+    for s, k in enumerate(lengths(rand, n)):
+        pairs = words(rand, k)
+        yield ""
+        yield "#Text={0}".format(" ".join(form for form, _ in pairs))
+        for i, (form, xpos) in enumerate(pairs):
+            cols = ["{0}-{1}".format(s+1, i+1), "{0}-{1}".format(offset, offset+len(form)), form, xpos, xpos, form.lower()]
+            yield "\t".join(cols + ["_"] * 20)
+            offset += len(form) + 1
+
+############################
+
+def tiger_xml(n, seed=42):
+    """
+    Yield the lines of a TIGER-XML file with n sentences.
+    """
+    rand = random.Random(seed)
+    yield '<?xml version="1.0" encoding="UTF-8"?>'
+    yield '<corpus>'
+    for s in range(1, n+1):
+        k = rand.randint(1, 25)
+        yield '<s id="s{0}"><graph root="s{0}_500"><terminals>'.format(s)
+        for t in range(1, k+1):
+            yield '<t id="s{0}_{1}" word="{2}" lemma="--" pos="{3}" morph="--" case="--" number="--" gender="--" person="--" degree="--" tense="--" mood="--"/>'.format(s, t, rand.choice(FORMS), rand.choice(POS))
+        yield '</terminals><nonterminals><nt id="s{0}_500" cat="S">'.format(s)
+        for t in range(1, k+1):
+            yield '<edge label="--" idref="s{0}_{1}"/>'.format(s, t)
+        yield '</nt></nonterminals></graph></s>'
+    yield '</corpus>'
+
+############################
+
+def tcf(n, seed=42):
+    """
+    Yield the lines of a TCF file with n sentences.
+    """
+    rand = random.Random(seed)
+    sent_lengths = list(lengths(rand, n))
+    n_toks = sum(sent_lengths)
+    yield '<?xml version="1.0" encoding="UTF-8"?>'
+    yield '<D-Spin xmlns="http://www.dspin.de/data" version="0.4">'
+    yield '<TextCorpus xmlns="http://www.dspin.de/data/textcorpus" lang="de"><tokens>'
+    for t in range(n_toks):
+        yield '<token ID="w{0:x}">{1}</token>'.format(t, rand.choice(FORMS))
+    yield '</tokens><sentences>'
+    start = 0
+    for s, k in enumerate(sent_lengths):
+        yield '<sentence ID="s{0:x}" tokenIDs="{1}"/>'.format(s, " ".join("w{0:x}".format(t) for t in range(start, start+k)))
+        start += k
+    yield '</sentences><POStags tagset="stts">'
+    for t in range(n_toks):
+        yield '<tag tokenIDs="w{0:x}">{1}</tag>'.format(t, rand.choice(POS))
+    yield '</POStags><lemmas>'
+    for t in range(n_toks):
+        yield '<lemma tokenIDs="w{0:x}">{1}</lemma>'.format(t, rand.choice(FORMS).lower())
+    yield '</lemmas></TextCorpus></D-Spin>'
+
+############################
+
+def dta_tei(n, seed=42):
+    """
+    Yield the lines of a DTA TEI file with n sentences.
+    """
+    rand = random.Random(seed)
+    yield '<?xml version="1.0" encoding="UTF-8"?>'
+    yield '<TEI xmlns="http://www.tei-c.org/ns/1.0"><teiHeader><fileDesc><titleStmt><title type="main">Titel</title></titleStmt></fileDesc></teiHeader>'
+    yield '<text><body><div type="chapter">'
+    w = 0
+    for s in range(n):
+        if s % 10 == 0:
+            yield '<p>'
+        tokens = []
+        for _ in range(rand.randint(1, 25)):
+            form = rand.choice(FORMS)
+            tokens.append('<w xml:id="w{0:x}" pos="{1}" lemma="{2}" norm="{2}">{3}</w>'.format(w, rand.choice(POS), form.lower(), form))
+            w += 1
+        yield '<s xml:id="s{0:x}">{1}</s>'.format(s, " ".join(tokens))
+        if s % 10 == 9 or s == n-1:
+            yield '<lb/></p>'
+    yield '</div></body></text></TEI>'
+
+############################
+
+REM_META = ["text", "abbr_ddd", "abbr_mwb", "topic", "text-type", "genre", "reference", "reference-secondary",
+            "library", "library-shelfmark", "online", "medium", "extent", "extract", "language", "language-type",
+            "language-region", "language-area", "place", "time", "notes-manuscript", "date", "text-place",
+            "text-author", "text-language", "text-source", "edition", "notes-transcription", "notes-annotation"]
+
+def cora_rem(n, seed=42):
+    """
+    Yield the lines of a CoraXML file (ReM) with n sentences.
+    Some tokens have two annotation tokens (tok_anno),
+    lines and shift tags span ranges of several tokens.
+    """
+    rand = random.Random(seed)
+    tags = sorted(key for key in get_tagset("HiTS") if not key[0].startswith("$"))
+
+    yield '<?xml version="1.0" encoding="UTF-8"?>'
+    yield '<text id="t1">'
+    yield '<header>' + "".join("<{0}>{1}</{0}>".format(cat, "x") for cat in REM_META) + '</header>'
+
+    tokens = []
+    t = 0
+    for k in lengths(rand, n):
+        for i in range(k):
+            t += 1
+            last = (i == k-1)
+            n_annos = 2 if not last and rand.random() < 0.1 else 1
+            annos = []
+            for a in range(n_annos):
+                if last:
+                    form, pos, pos_gen, punc = ".", "$_", "--", "DE"
+                else:
+                    form = rand.choice(FORMS[:-2])
+                    pos, pos_gen = rand.choice(tags)
+                    punc = None
+                annos.append('<tok_anno id="t{0}_m{1}" utf="{2}" trans="{2}" ascii="{2}">'
+                             '<norm tag="{2}"/><lemma tag="{3}"/><pos tag="{4}"/><pos_gen tag="{5}"/>{6}</tok_anno>'.format(
+                             t, a+1, form, form.lower(), pos, pos_gen,
+                             '<punc tag="{0}"/>'.format(punc) if punc else ""))
+            trans = "".join(rand.choice(FORMS[:-2]) for _ in range(n_annos)) if not last else "."
+            tokens.append('<token id="t{0}" trans="{1}"><tok_dipl id="t{0}_d1" utf="{1}" trans="{1}"/>{2}</token>'.format(
+                          t, trans, "".join(annos)))
+
+    #Lines of up to 8 tokens
+    yield '<layoutinfo>'
+    start = 1
+    while start <= t:
+        end = min(t, start + rand.randint(0, 7))
+        yield '<line id="l{0}" loc="{0}" range="t{0}_d1..t{1}_d1"/>'.format(start, end) if end > start \
+              else '<line id="l{0}" loc="{0}" range="t{0}_d1"/>'.format(start)
+        start = end + 1
+    yield '</layoutinfo>'
+
+    #Shift tags over a few tokens
+    yield '<shifttags>'
+    for start in range(1, t+1, 50):
+        end = min(t, start + rand.randint(0, 4))
+        yield '<quote range="t{0}_m1..t{1}_m1"/>'.format(start, end)
+    yield '</shifttags>'
+
+    for token in tokens:
+        yield token
+    yield '</text>'
+
+############################
+
+ANSELM_META = ["Sigle", "Aufbewahrungsort", "Signatur", "Druck", "Handschrift_Druck", "Prosa_Vers",
+               "Datum", "Sprache", "Sprachtyp", "Sprachraum", "Token", "Kenn-Name", "URL_Faksimile"]
+
+def cora_anselm(n, seed=42):
+    """
+    Yield the lines of a CoraXML file (Anselm) with n sentences.
+    """
+    rand = random.Random(seed)
+    tags = sorted(tag for tag in get_tagset("Anselm") if tag not in ("$.", "_"))
+
+    yield '<?xml version="1.0" encoding="UTF-8"?>'
+    yield '<text id="t1">'
+    yield '<header>' + "\n".join("{0}: x".format(cat) for cat in ANSELM_META) + '</header>'
+    yield '<shifttags>'
+    for start in range(1, 25*n, 50):
+        yield '<fm range="t{0}..t{1}"/>'.format(start, start+2)
+    yield '</shifttags>'
+
+    t = 0
+    for k in lengths(rand, n):
+        for i in range(k):
+            t += 1
+            if i == k-1:
+                form, pos = ".", "$."
+            else:
+                form, pos = rand.choice(FORMS[:-2]), rand.choice(tags)
+            yield ('<token id="t{0}" trans="{1}"><tok_dipl id="t{0}_d1" utf="{1}" trans="{1}"/>'
+                   '<tok_anno id="t{0}_m1" utf="{1}" trans="{1}" ascii="{1}">'
+                   '<norm tag="{1}"/><lemma tag="{2}"/><pos tag="{3}"/></tok_anno></token>').format(t, form, form.lower(), pos)
+    yield '</text>'
+
+############################
+
+def exb_event(start, end, text):
+    return '<event start="T{0}" end="T{1}">{2}</event>'.format(start, end, text)
+
+############################
+
+def fuerstinnen_exb(n, seed=42):
+    """
+    Yield the lines of an EXMARaLDA file (Fuerstinnenkorrespondenz)
+    with n sentences in text, pos and lemma tiers.
+    """
+    rand = random.Random(seed)
+    tags = sorted(tag for tag in get_tagset("Fuerstinnen") if tag != "$.")
+
+    tokens = []
+    for k in lengths(rand, n):
+        for i in range(k):
+            if i == k-1:
+                tokens.append((".", "$.", "."))
+            else:
+                form = rand.choice(FORMS[:-2])
+                tokens.append((form, rand.choice(tags), form.lower()))
+
+    yield '<?xml version="1.0" encoding="UTF-8"?>'
+    yield '<basic-transcription><head><speakertable><speaker id="SPK0"><comment>x</comment>'
+    yield '<ud-speaker-information><ud-information attribute-name="pers1">A</ud-information>'
+    yield '<ud-information attribute-name="pers2">B</ud-information></ud-speaker-information></speaker></speakertable></head>'
+    yield '<basic-body><common-timeline>'
+    for t in range(len(tokens)+1):
+        yield '<tli id="T{0}"/>'.format(t)
+    yield '</common-timeline>'
+    for i, cat in enumerate(["text", "pos", "lemma"]):
+        yield '<tier id="TIE{0}" speaker="SPK0" category="{1}" type="a">'.format(i, cat)
+        for t, token in enumerate(tokens):
+            yield exb_event(t, t+1, token[i])
+        yield '</tier>'
+    yield '</basic-body></basic-transcription>'
+
+############################
+
+def fuerstinnen_header():
+    """
+    Yield the lines of the TEI header file
+    that belongs to a Fuerstinnen EXB file.
+    """
+    yield '<?xml version="1.0" encoding="UTF-8"?>'
+    yield '<TEI xmlns="http://www.tei-c.org/ns/1.0"><teiHeader style="Brief"><fileDesc>'
+    yield '<extent type="Tokens">0</extent><publicationStmt><pubPlace>Ort</pubPlace><date>1600</date></publicationStmt>'
+    yield '</fileDesc></teiHeader></TEI>'
+
+############################
+
+def graphvar_exb(n, seed=42):
+    """
+    Yield the lines of an EXMARaLDA file (GraphVar) with n sentences.
+    Sentences (NORMALS) and topological fields are span annotations.
+    """
+    rand = random.Random(seed)
+
+    yield '<?xml version="1.0" encoding="UTF-8"?>'
+    yield '<basic-transcription><head><meta-information><ud-meta-information>'
+    for cat in ["Jahr", "Fach", "Punkte", "Geschlecht", "Topologie"]:
+        yield '<ud-information attribute-name="{0}">x</ud-information>'.format(cat)
+    yield '</ud-meta-information></meta-information></head>'
+
+    sents = [words(rand, k) for k in lengths(rand, n)]
+    n_toks = sum(len(sent) for sent in sents)
+
+    yield '<basic-body><common-timeline>'
+    for t in range(n_toks+1):
+        yield '<tli id="T{0}"/>'.format(t)
+    yield '</common-timeline>'
+
+    tiers = {"NORMAL" : [], "NORMALpos" : [], "NORMALlemma" : [], "NORMALS" : [], "E1::TopField" : []}
+    t = 0
+    for sent in sents:
+        tiers["NORMALS"].append(exb_event(t, t+len(sent), "S"))
+        for i, (form, xpos) in enumerate(sent):
+            tiers["NORMAL"].append(exb_event(t+i, t+i+1, form))
+            tiers["NORMALpos"].append(exb_event(t+i, t+i+1, xpos))
+            tiers["NORMALlemma"].append(exb_event(t+i, t+i+1, form.lower()))
+        #Fields of up to 5 tokens
+        i = 0
+        while i < len(sent):
+            k = min(len(sent)-i, rand.randint(1, 5))
+            tiers["E1::TopField"].append(exb_event(t+i, t+i+k, rand.choice(["VF", "LK", "MF", "RK"])))
+            i += k
+        t += len(sent)
+
+    for i, (cat, events) in enumerate(tiers.items()):
+        yield '<tier id="TIE{0}" speaker="SPK0" category="{1}" type="a">'.format(i, cat)
+        for event in events:
+            yield event
+        yield '</tier>'
+    yield '</basic-body></basic-transcription>'
+
+############################
+
+ANNIS_META = ["doc", "Auswahl", "Edition", "Ueberlieferungstraeger", "Sprachstufe", "Teilkorpus"]
+
+def annis_grid(n, seed=42):
+    """
+    Yield the lines of an ANNIS grid file with n sentences.
+    """
+    rand = random.Random(seed)
+    tags = sorted(get_tagset("HIPKON"))
+
+    for s, k in enumerate(lengths(rand, n)):
+        pairs = words(rand, k)
+        yield "{0}.\ttok\t{1}".format(s+1, " ".join(form for form, _ in pairs))
+        yield "\tPOS\t" + " ".join("{0}[{1}-{1}]".format(rand.choice(tags), i+1) for i in range(k))
+        #Spans of up to 5 tokens
+        spans = []
+        i = 1
+        while i <= k:
+            end = min(k, i + rand.randint(0, 4))
+            spans.append("{0}[{1}-{2}]".format(rand.choice(["SUBJ", "OBJ", "ADV"]), i, end))
+            i = end + 1
+        yield "\tGF\t" + " ".join(spans)
+        for cat in ANNIS_META:
+            yield "\tmeta::{0}\tx".format(cat)
+        yield ""
+
+############################
+
+def ptb(n, seed=42):
+    """
+    Yield the lines of a file with n TueBa-D/Z trees
+    in PTB format (one tree per line).
+    """
+    rand = random.Random(seed)
+    for k in lengths(rand, n):
+        yield long_tree(k, rand.randrange(2**32))
+
+############################
+
+#Importer name : (generator, file extension)
+GENERATORS = {"conllu" : (conllu, ".conllu"), "conlluplus" : (conlluplus, ".conllup"),
+              "dtatsv" : (dta_tsv, ".tsv"), "tigerxml" : (tiger_xml, ".xml"),
+              "tcfdta" : (tcf, ".tcf"), "xmldta" : (dta_tei, ".xml"),
+              "coraxmlrem" : (cora_rem, ".xml"), "coraxmlanselm" : (cora_anselm, ".xml"),
+              "fuerstinnenexb" : (fuerstinnen_exb, ".exb"), "graphvar" : (graphvar_exb, ".exb"),
+              "annisgrid" : (annis_grid, ".txt"), "tuebatrees" : (ptb, ".txt")}
+
+############################
+
+def write_lines(file, lines):
+    with open(file, mode="w", encoding="utf-8") as outfile:
+        for line in lines:
+            print(line, file=outfile)
+
+############################
+
+def write_input(name, directory, n, seed=42):
+    """
+    Write a synthetic input file for an importer.
+    Input: Importer name (see GENERATORS), target directory,
+           number of sentences, seed
+    Output: Filename
+    """
+    generate, ext = GENERATORS[name]
+    #The EXB importers find their meta files by replacing
+    #"exb" in the filename, so it must not contain the importer name
+    file = os.path.join(directory, "bench" + ext)
+    write_lines(file, generate(n, seed))
+
+    #Meta data in separate files
+    if name == "fuerstinnenexb":
+        metadir = os.path.join(directory, "fuerstinnenkorrespondenz-v1.1TEI-HEADERS", "document")
+        os.makedirs(metadir, exist_ok=True)
+        write_lines(os.path.join(metadir, "bench.xml"), fuerstinnen_header())
+    elif name == "graphvar":
+        write_lines(os.path.join(directory, "bench.xml"), ['<?xml version="1.0" encoding="UTF-8"?>', '<meta/>'])
+
+    return file
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+'''
+Check that parallel, cached and incremental conversions write
+the same files as a sequential run.
+
+Generates CoNLL-U Plus files with different additional columns
+(and a copy of the first file under another name) and converts them
+(1) sequentially, (2) with two worker processes, (3) with an empty
+and a filled doc cache and (4) incrementally after one of the files
+was changed. All output and meta files are compared byte by byte.
+
+Usage: python output_check.py [number of files] [number of sentences]
+'''
+
+import os
+import sys
+import random
+import shutil
+import filecmp
+import tempfile
+import subprocess
+
+from generators import conllu, write_lines
+from manifest import Manifest
+
+############################
+
+C6C = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "C6C.py")
+
+#Additional columns of the generated files
+EXTRA = [["NER"], [], ["NER", "CHUNK"], ["CHUNK"], ["TopF"], []]
+
+############################
+
+def conlluplus(n, seed, extra):
+    """
+    Yield the lines of a CoNLL-U Plus file with n sentences
+    and the given additional columns.
+    """
+    yield "# global.columns = ID FORM LEMMA UPOS XPOS FEATS HEAD DEPREL DEPS MISC " + " ".join(extra)
+    rand = random.Random(seed)
+    for line in conllu(n, seed):
+        if line and extra:
+            line += "\t" + "\t".join(rand.choice(["A", "B", "_"]) for _ in extra)
+        yield line
+
+############################
+
+def convert(files, outdir, *options):
+    """
+    Convert the files with C6C in a new process.
+    """
+    metadir = os.path.join(outdir, "meta")
+    subprocess.run([sys.executable, C6C, "convert", *files, outdir, "-i", "conlluplus",
+                    "-e", "conlluplus", "-m", metadir, *options],
+                   cwd=os.path.dirname(C6C), check=True, stdout=subprocess.DEVNULL)
+
+############################
+
+def compare(dir1, dir2, ignore=(Manifest.FILENAME,)):
+    """
+    Return the files that differ between two directories (recursively).
+    """
+    cmp = filecmp.dircmp(dir1, dir2, ignore=list(ignore))
+    diffs = cmp.left_only + cmp.right_only + cmp.funny_files
+    #Compare contents, not only size and time
+    diffs += [f for f in cmp.common_files
+              if not filecmp.cmp(os.path.join(dir1, f), os.path.join(dir2, f), shallow=False)]
+    for sub in cmp.common_dirs:
+        diffs += [os.path.join(sub, f) for f in compare(os.path.join(dir1, sub), os.path.join(dir2, sub), ignore)]
+    return diffs
+
+############################
+
+if __name__ == '__main__':
+
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+
+        indir = os.path.join(tmpdir, "in")
+        os.makedirs(indir)
+        files = []
+        for i in range(n_files):
+            file = os.path.join(indir, "doc{0}.conllup".format(i))
+            write_lines(file, conlluplus(n, i, EXTRA[i % len(EXTRA)]))
+            files.append(file)
+
+        #Same content as the first file
+        duplicate = os.path.join(indir, "copy.conllup")
+        shutil.copyfile(files[0], duplicate)
+        files.insert(1, duplicate)
+
+        failed = False
+
+        #Sequential and parallel run
+        sequential = os.path.join(tmpdir, "sequential")
+        parallel = os.path.join(tmpdir, "parallel")
+        convert(files, sequential, "-j", "1")
+        convert(files, parallel, "-j", "2")
+        diffs = compare(sequential, parallel)
+        if diffs:
+            failed = True
+            print("ERROR: -j 1 and -j 2 differ: {0}".format(", ".join(diffs)))
+
+        #Runs with empty and filled cache
+        cachedir = os.path.join(tmpdir, "cache")
+        for run in ("empty", "filled"):
+            cached = os.path.join(tmpdir, "cached_" + run)
+            convert(files, cached, "--cache-dir", cachedir)
+            diffs = compare(sequential, cached)
+            if diffs:
+                failed = True
+                print("ERROR: Run with {0} cache differs: {1}".format(run, ", ".join(diffs)))
+
+        #Incremental run after changing the last file
+        incremental = os.path.join(tmpdir, "incremental")
+        convert(files, incremental, "--incremental")
+        write_lines(files[-1], conlluplus(n, n_files, EXTRA[0]))
+        convert(files, incremental, "--incremental")
+        full = os.path.join(tmpdir, "full")
+        convert(files, full)
+        #The meta files of an incremental run only contain the converted files
+        diffs = [f for f in compare(full, incremental) if not f.startswith("meta")]
+        if diffs:
+            failed = True
+            print("ERROR: Incremental and full run differ: {0}".format(", ".join(diffs)))
+
+        if failed:
+            sys.exit(1)
+        print("Outputs of sequential, parallel, cached and incremental runs are identical.")
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+'''
+Benchmark for document.Tree.from_PTB_string.
+
+Parses synthetic TueBa-D/Z style trees of growing size,
+once as long flat sentences and once as deeply nested trees.
+For a linear parser, the time per character stays constant.
+
+Usage: python ptb_parser.py [repetitions]
+'''
+
+import os
+import sys
+import random
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from document import Tree
+
+############################
+
+CATS = ["NX", "VXFIN", "ADVX", "PX", "ADJX"]
+LABELS = ["HD", "ON", "OA", "MOD", "-"]
+POS = [("NN", "Haus"), ("ART", "der"), ("KOMMA", ","), ("PUNKT", "."), ("VVFIN", "geht"), ("ADJA", "alte")]
+
+############################
+
+def token(rand):
+    pos, form = rand.choice(POS)
+    return "(" + pos + ":" + rand.choice(LABELS) + " " + form + ")"
+
+############################
+
+def long_tree(n, seed=42):
+    """
+    Return a flat tree string with n tokens
+    in phrases of up to five tokens.
+    """
+    rand = random.Random(seed)
+    phrases = []
+    while n > 0:
+        k = min(n, rand.randint(1, 5))
+        phrases.append("(" + rand.choice(CATS) + ":" + rand.choice(LABELS)
+                       + "".join(token(rand) for _ in range(k)) + ")")
+        n -= k
+    return "(VROOT(SIMPX:--" + "".join(phrases) + "))"
+
+############################
+
+def deep_tree(n, seed=42):
+    """
+    Return a tree string with n tokens,
+    in which each phrase contains one token and the next phrase.
+    """
+    rand = random.Random(seed)
+    s = ""
+    for _ in range(n):
+        s = "(" + rand.choice(CATS) + ":" + rand.choice(LABELS) + token(rand) + s + ")"
+    return "(VROOT" + s + ")"
+
+############################
+
+def measure(s, repetitions):
+    """
+    Return the average time in seconds to parse the tree string.
+    """
+    start = perf_counter()
+    for _ in range(repetitions):
+        Tree.from_PTB_string(s)
+    return (perf_counter() - start) / repetitions
+
+############################
+
+if __name__ == '__main__':
+
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    #Deep recursion in Tree.terminals()
+    sys.setrecursionlimit(20000)
+
+    for name, create in [("long", long_tree), ("deep", deep_tree)]:
+        for n in [100, 1000, 5000]:
+            s = create(n)
+            seconds = measure(s, repetitions)
+            print("{0:<5} {1:>6} tokens {2:>8} chars {3:>9.4f} s {4:>7.1f} ns/char".format(name, n, len(s), seconds, seconds/len(s)*1e9))
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+'''
+Benchmark suite for importers, processors and exporters.
+
+Generates a seeded synthetic input file for each importer
+(see generators.py), converts it with the C6C pipeline and reports
+the throughput (tokens per second) and the peak memory of each stage.
+Each file is converted twice: once to measure the time and once
+with tracemalloc to measure the memory (which slows down the run).
+
+The results are written to a JSON file, so runs before and
+after a change can be compared.
+
+Usage: python suite.py [number of sentences] [results file]
+'''
+
+import os
+import gc
+import sys
+import json
+import platform
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import C6C
+from processor import DependencyProcessor, DependencyManipulator
+from profiler import Profiler
+from generators import write_input
+
+############################
+
+#Importer : processors, exporters
+#(processors are given by name or as class)
+CASES = [("conllu", [DependencyProcessor, DependencyManipulator], ["conllu", "conlluplus"]),
+         ("conlluplus", ["virgelmapper", "pronominaladverb"], ["conlluplus", "conllu"]),
+         ("dtatsv", [], ["conlluplus", "dtatsv"]),
+         ("tigerxml", [], ["conlluplus"]),
+         ("tcfdta", [], ["conlluplus"]),
+         ("xmldta", [], ["conlluplus"]),
+         ("coraxmlrem", ["hitstostts"], ["conlluplus"]),
+         ("coraxmlanselm", ["anselmtostts"], ["conlluplus"]),
+         ("fuerstinnenexb", ["fuerstinnentostts"], ["conlluplus"]),
+         ("graphvar", [], ["conlluplus"]),
+         ("annisgrid", [], ["conlluplus", "text"]),
+         ("tuebatrees", ["treetobio"], ["conlluplus", "ptb"])]
+
+SEED = 42
+
+############################
+
+def make_pipeline(name, processors, exporters, outdir, metadir, profiler):
+    """
+    Return a pipeline with new components.
+    """
+    return C6C.Pipeline([], outdir, importer=C6C.importers[name](),
+                        processors=[C6C.processors[p]() if isinstance(p, str) else p() for p in processors],
+                        exporter=[(e, C6C.exporters[e]()) for e in exporters],
+                        column_order="alpha", metadir=metadir, profiler=profiler)
+
+############################
+
+def run(name, processors, exporters, n, tmpdir):
+    """
+    Convert a synthetic file of n sentences
+    and return the summary rows of the profiler.
+    Time and memory are measured in separate runs.
+    """
+    indir = os.path.join(tmpdir, name)
+    os.makedirs(indir)
+    file = write_input(name, indir, n, SEED)
+
+    rows = dict()
+    for memory in (False, True):
+        outdir = tempfile.mkdtemp(dir=tmpdir)
+        profiler = Profiler(memory=memory)
+        pipeline = make_pipeline(name, processors, exporters, outdir, outdir, profiler)
+        for e, _ in pipeline.exporter:
+            os.makedirs(pipeline.get_outdir(e), exist_ok=True)
+        #Free the docs of previous runs before measuring
+        gc.collect()
+        #Messages of the components are not part of the report
+        with open(os.devnull, mode="w") as devnull, redirect_stdout(devnull):
+            pipeline.convert(file)
+        #The profiler starts tracemalloc, which would slow down the next timing
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        for row in profiler.summary():
+            key = (row["stage"], row["component"])
+            if memory:
+                rows[key].update(peak=row["peak"], **{"bytes/token" : row["bytes/token"]})
+            else:
+                rows[key] = dict(row, case=name, size=os.path.getsize(file))
+
+    return list(rows.values())
+
+############################
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    resultfile = sys.argv[2] if len(sys.argv) > 2 else "bench_results.json"
+
+    #Deep recursion in the tree processors
+    sys.setrecursionlimit(20000)
+
+    results = []
+    print("{0:<16} {1:<8} {2:<30} {3:>10} {4:>12} {5:>12} {6:>12}".format(
+          "case", "stage", "component", "tokens", "tokens/s", "peak (MB)", "bytes/token"))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, processors, exporters in CASES:
+            try:
+                rows = run(name, processors, exporters, n, tmpdir)
+            except Exception as e:
+                print("ERROR: Benchmark {0} failed ({1}: {2}).".format(name, type(e).__name__, e))
+                continue
+            for row in rows:
+                print("{case:<16} {stage:<8} {component:<30} {tokens:>10} {tokens/s:>12.0f}".format(**row)
+                      + " {0:>12.1f} {1:>12.0f}".format(row["peak"]/2**20, row["bytes/token"]))
+            results.extend(rows)
+
+    with open(resultfile, mode="w", encoding="utf-8") as f:
+        json.dump({"python" : platform.python_version(), "platform" : platform.platform(),
+                   "sentences" : n, "seed" : SEED, "results" : results}, f, indent=1)
+    print("Results written to {0}.".format(resultfile))
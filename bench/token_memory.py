@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+'''
+Memory benchmark for document.Token.
+
+Compares the slotted token class with the previous
+dictionary-based implementation on synthetic CoNLL-U tokens.
+
+Usage: python token_memory.py [number of tokens]
+'''
+
+import os
+import sys
+import random
+import tracemalloc
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from document import Token
+
+############################
+
+class DictToken:
+    """
+    Previous token implementation with all annotations in __dict__.
+    """
+
+    def __init__(self, **kwargs):
+        for key in kwargs:
+            self.add_value(key, kwargs.get(key, "_"))
+
+    def add_value(self, key, val):
+        self.__dict__[key] = val
+
+############################
+
+def synthetic_lines(n, seed=42):
+    """
+    Yield n tab-separated CoNLL-U token lines
+    as they would be read from a file.
+    """
+    rand = random.Random(seed)
+    xpos = ["NN", "ART", "ADJA", "VVFIN", "APPR", "$,", "$.", "ADV", "KON", "PPER"]
+    deprel = ["nsubj", "obj", "det", "amod", "case", "punct", "root", "advmod", "cc"]
+    feats = ["Case=Nom|Number=Sing", "Case=Acc|Number=Plur", "_", "Mood=Ind|Tense=Pres"]
+    for i in range(n):
+        yield "\t".join([str(i % 30 + 1), "wort" + str(rand.randint(0, 5000)),
+                         "lemma" + str(rand.randint(0, 3000)), "_", rand.choice(xpos),
+                         rand.choice(feats), str(rand.randint(0, 30)), rand.choice(deprel),
+                         "_", "_", rand.choice(["MF", "VF", "LK", "_"])])
+
+############################
+
+def measure(cls, n):
+    """
+    Create n tokens of the given class.
+    Return peak memory in bytes and time in seconds.
+    """
+    columns = ["ID", "FORM", "LEMMA", "UPOS", "XPOS", "FEATS", "HEAD", "DEPREL", "DEPS", "MISC", "TopF"]
+    lines = list(synthetic_lines(n))
+
+    #Time without tracing
+    start = perf_counter()
+    tokens = [cls(**dict(zip(columns, line.split("\t")))) for line in lines]
+    seconds = perf_counter() - start
+    del tokens
+
+    #Memory
+    tracemalloc.start()
+    tokens = [cls(**dict(zip(columns, line.split("\t")))) for line in lines]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak, seconds
+
+############################
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    for name, cls in [("dict token", DictToken), ("slotted token", Token)]:
+        peak, seconds = measure(cls, n)
+        print("{0:<15} {1:>8.1f} MB {2:>7.1f} bytes/token {3:>6.2f} s".format(name, peak/2**20, peak/n, seconds))
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+'''
+Memory regression check for the XML importers.
+
+Imports synthetic TIGER-XML, TCF and DTA TEI files and measures
+the peak memory on top of the imported document. The importers read
+the files incrementally, so this overhead has to stay well below
+the size of the complete element tree (as read by ET.parse).
+
+Exits with status 1 if an importer keeps the element tree in memory.
+
+Usage: python xml_memory.py [number of sentences]
+'''
+
+import os
+import sys
+import tempfile
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from importer import TigerXMLImporter, TCFDTAImporter, XMLDTAImporter
+from generators import tiger_xml, tcf, dta_tei
+
+############################
+
+#Maximal share of the element tree allowed on top of the document
+#(the TCF importer needs a look-up table for the annotation layers)
+MAX_OVERHEAD = 0.5
+
+############################
+
+def measure(importer, file, metadir):
+    """
+    Import the file and return the memory used by the document
+    and the peak memory in bytes.
+    """
+    tracemalloc.start()
+    doc = importer.import_file(file, metadir)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak
+
+############################
+
+def tree_size(file):
+    """
+    Return the memory in bytes used by the complete element tree.
+    """
+    tracemalloc.start()
+    tree = ET.parse(file)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+############################
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    failed = False
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+
+        for name, importer, generate in [("tiger", TigerXMLImporter(), tiger_xml),
+                                         ("tcfDTA", TCFDTAImporter(), tcf),
+                                         ("xmlDTA", XMLDTAImporter(), dta_tei)]:
+
+            file = os.path.join(tmpdir, name + ".xml")
+            with open(file, mode="w", encoding="utf-8") as outfile:
+                for line in generate(n):
+                    print(line, file=outfile)
+
+            tree = tree_size(file)
+            doc, peak = measure(importer, file, tmpdir)
+            overhead = peak - doc
+
+            print("{0:<8} file {1:>7.1f} MB  tree {2:>7.1f} MB  doc {3:>7.1f} MB  peak {4:>7.1f} MB  overhead {5:>6.1f} MB".format(
+                  name, os.path.getsize(file)/2**20, tree/2**20, doc/2**20, peak/2**20, overhead/2**20))
+
+            if overhead > MAX_OVERHEAD * tree:
+                print("ERROR: {} importer keeps {:.0f}% of the element tree in memory.".format(name, 100*overhead/tree))
+                failed = True
+
+    sys.exit(1 if failed else 0)
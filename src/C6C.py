@@ -7,8 +7,17 @@ Created on 14.10.2019
 
 import os
 import sys
+import shutil
+import tempfile
+import multiprocessing
 import click
 import importer, exporter, processor
+from document import ColumnDoc
+from cache import DocCache
+from manifest import Manifest
+from profiler import Profiler
+from contextlib import nullcontext
+from utils import append_metainfo
 from ast import literal_eval
 
 ##############
@@ -59,28 +68,123 @@ class Pipeline(object):
     #################################
 
     def convert(self, file):
+        """
+        Convert a single file.
+        Input: Filename
+        Output: List of tuples (exporter name, output filename)
+        """
+        stream = getattr(self, "stream", False)
 
         #Import file
-        doc = self.importer.import_file(file, self.metadir)
+        #(from the cache or as stream of sentences, if possible)
+        #Cached docs are always read completely.
+        cache = getattr(self, "cache", None)
+        with self.measure(file, "import", self.importer) as stage:
+            if cache is not None:
+                doc = cache.import_file(self.importer, file, self.metadir)
+            elif stream:
+                doc = self.importer.import_stream(file, self.metadir)
+            else:
+                doc = self.importer.import_file(file, self.metadir)
+            stage["doc"] = doc
 
         #Additional processing
+        cdoc = None
         for p in self.processors:
-            doc = p.process(doc)
 
-        #Specify column order for export
-        self.exporter.column_order = self.column_order
-            
-        #Export file
-        self.exporter.export(doc, self.out)
+            with self.measure(file, "process", p) as stage:
+
+                #Use columnar fast path if possible
+                if getattr(self, "columnar", False) and hasattr(p, "process_columns"):
+                    if cdoc is None:
+                        doc.buffer()
+                        cdoc = ColumnDoc.from_doc(doc)
+                    cdoc = p.process_columns(cdoc)
+                    stage["doc"] = cdoc
+
+                else:
+                    #Write back changes of columnar processors
+                    if cdoc is not None:
+                        doc = cdoc.write_to(doc)
+                        cdoc = None
+                    #Processors that need the whole doc buffer the stream
+                    if stream:
+                        doc = p.process_stream(doc)
+                    else:
+                        doc = p.process(doc)
+                    stage["doc"] = doc
+
+        if cdoc is not None:
+            doc = cdoc.write_to(doc)
+
+        #With several exporters, the doc is needed more than once
+        if len(self.exporter) > 1:
+            doc.buffer()
+
+        outputs = []
+        for name, exporter in self.exporter:
+
+            #Specify column order for export
+            exporter.column_order = self.column_order
+
+            #Export file
+            exporter.last_outfile = None
+            with self.measure(file, "export", exporter) as stage:
+                exporter.export(doc, self.get_outdir(name))
+                stage["doc"] = doc
+            if exporter.last_outfile:
+                outputs.append((name, exporter.last_outfile))
+
+        return outputs
+
+    #################################
+
+    def measure(self, file, stage, component):
+        """
+        Measure a stage of the conversion with the profiler
+        (if profiling is switched on).
+        """
+        profiler = getattr(self, "profiler", None)
+        if profiler is None:
+            return nullcontext(dict())
+        return profiler.measure(file, stage, component)
+
+    #################################
+
+    def get_outdir(self, name):
+        """
+        Return output directory for the given exporter.
+
+        With several exporters, each one writes
+        to a subdirectory named after the exporter.
+        """
+        if len(self.exporter) > 1:
+            return os.path.join(self.out, name)
+        return self.out
 
 ##############################
 
-def read_list(value):
-    if value:
-        try: return literal_eval(value)
-        except ValueError: return list()
+def read_list(value, allow_empty=True):
+    """
+    Read a list option like '["conllu", "ptb"]'.
+    Input: Option value (string),
+           whether an empty list is allowed
+    Output: List of names (strings)
+    """
+    if not value:
+        names = list()
     else:
-        return list()
+        try:
+            names = literal_eval(value)
+        except (ValueError, SyntaxError):
+            names = None
+        #Names have to be quoted
+        if not isinstance(names, list) \
+           or not all(isinstance(name, str) for name in names):
+            raise click.BadParameter("%s is not a list of quoted names." % (value))
+    if not names and not allow_empty:
+        raise click.BadParameter("%s is an empty list." % (value))
+    return names
 
 #########################################
 
@@ -147,13 +251,20 @@ def add_component(ctx, parameter, value):
         return imp
 
     elif parameter.name == "exporter":
-        name = value.lower()
-        exp = exporters.get(name, None)()
-        if not exp:
-            print("ERROR: %s is not a valid exporter." % (value))
-            raise ValueError
-        ctx.params[parameter.name] = exp
-        return exp
+        #Single exporter or list of exporters
+        if value.strip().startswith("["):
+            names = read_list(value, allow_empty=False)
+        else:
+            names = [value]
+        exps = list()
+        for name in names:
+            exp = exporters.get(name.lower(), None)
+            if not exp:
+                print("ERROR: %s is not a valid exporter." % (name))
+                raise ValueError
+            exps.append((name.lower(), exp()))
+        ctx.params[parameter.name] = exps
+        return exps
 
     elif parameter.name == "processors":
         if value:
@@ -206,6 +317,136 @@ def set_column_order(ctx, parameter, value):
 
 #########################################
 
+worker_pipeline = None
+
+def init_worker(pipeline):
+    """
+    Store the pipeline in the worker process.
+    """
+    global worker_pipeline
+    worker_pipeline = pipeline
+
+#########################################
+
+def convert_worker(task):
+    """
+    Convert a single file in a worker process.
+
+    Meta information is written to a private directory
+    for each file and merged in input order afterwards.
+    Errors are caught, so that one file does not stop the batch.
+
+    Input: Tuple (index of the file, filename, private meta directory)
+    Output: Tuple (index of the file, error message or None, output files,
+            profiler records)
+    """
+    index, file, metadir = task
+    pipeline = worker_pipeline
+    pipeline.metadir = metadir
+
+    #Number files as in a sequential run
+    if hasattr(pipeline.importer, "filenr"):
+        pipeline.importer.filenr = index
+
+    #Send only the records of this file
+    profiler = getattr(pipeline, "profiler", None)
+    if profiler is not None:
+        profiler.records = []
+
+    try:
+        outputs = pipeline.convert(file)
+    except Exception as e:
+        return index, "{0}: {1}".format(type(e).__name__, e), [], []
+
+    return index, None, outputs, profiler.records if profiler is not None else []
+
+#########################################
+
+def merge_metainfo(tmpdir, metadir, indices):
+    """
+    Append the meta files of the individual workers
+    to the meta files in metadir (in input order).
+    Headers are only written once.
+    """
+    for index in sorted(indices):
+        filedir = os.path.join(tmpdir, str(index))
+        if not os.path.isdir(filedir):
+            continue
+        for metafilename in sorted(os.listdir(filedir)):
+            lines = open(os.path.join(filedir, metafilename), mode="r", encoding="utf-8").readlines()
+            append_metainfo(metadir, metafilename, lines)
+
+#########################################
+
+def convert_parallel(pipeline, files, jobs, manifest=None):
+    """
+    Convert files with a pool of worker processes.
+
+    Each file is converted as a whole by one worker.
+    Output files and meta information are the same as in a sequential run.
+    Files that cannot be converted are reported at the end.
+
+    Input: Pipeline, list of tuples (position in the input files, filename),
+           number of processes, manifest to record the outputs (optional)
+    """
+    tmpdir = tempfile.mkdtemp(prefix="c6c_", dir=pipeline.metadir)
+    tasks = [(i, file, os.path.join(tmpdir, str(i))) for i, file in files]
+    for _, _, filedir in tasks:
+        os.makedirs(filedir)
+
+    files = dict(files)
+    errors = dict()
+    try:
+        with multiprocessing.Pool(jobs, initializer=init_worker, initargs=(pipeline,)) as pool:
+            with click.progressbar(length=len(tasks), label="Converting texts:") as bar:
+                for index, error, outputs, records in pool.imap_unordered(convert_worker, tasks):
+                    if error:
+                        errors[index] = error
+                    elif manifest is not None:
+                        manifest.update(files[index], pipeline, index, outputs)
+                    if records:
+                        pipeline.profiler.records.extend(records)
+                    bar.update(1)
+        merge_metainfo(tmpdir, pipeline.metadir, files.keys())
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        if manifest is not None:
+            manifest.save()
+
+    for index, error in sorted(errors.items()):
+        print("ERROR: Could not convert {0} ({1})".format(files[index], error))
+
+#########################################
+
+def convert_sequential(pipeline, files, manifest=None):
+    """
+    Convert files one after the other.
+
+    Input: Pipeline, list of tuples (position in the input files, filename),
+           manifest to record the outputs (optional)
+    """
+    try:
+        with click.progressbar(files, label="Converting texts:") as files:
+            for i, file in files:
+
+                #Skip non-existing files
+                if not file_exists(file):
+                    continue
+
+                #Number files as in a complete run
+                if manifest is not None and hasattr(pipeline.importer, "filenr"):
+                    pipeline.importer.filenr = i
+
+                outputs = pipeline.convert(file)
+
+                if manifest is not None:
+                    manifest.update(file, pipeline, i, outputs)
+    finally:
+        if manifest is not None:
+            manifest.save()
+
+#########################################
+
 @click.group()
 def cli():
     print("### C6C ###", end="\n\n")
@@ -222,10 +463,19 @@ def cli():
                                                                     "xmlkajuk", "xmlfnhdc", "conll2000", "sdewac", "germanc", "tuebatrees",
                                                                     "ddbtigernegra", "fuerstinnenexb", "graphvar", "refup", "mercuriustigerxml"], \
               case_sensitive=False), help="Importer for input file format.", callback=add_component)
-@click.option("-e", "--exporter", required=True, type=click.Choice(["conlluplus", "conllu", "DTAtsv", "HIPKONtsv", "text", "pos", "conll2000", "ptb"], case_sensitive=False), \
-              help="Exporter for desired output format.", callback=add_component)
+@click.option("-e", "--exporter", required=True, \
+              help="Exporter for desired output format (conlluplus, conllu, DTAtsv, HIPKONtsv, text, pos, conll2000, ptb) or list of exporters.", \
+              callback=add_component)
 @click.option("-p", "--processors", help="Specify list of processors in order of application.", callback=add_component)
 @click.option("-cols", "--column-order", default="alpha", callback=set_column_order)
+@click.option("-j", "--jobs", default=1, type=int, help="Number of parallel processes (0 = all cores).")
+@click.option("--stream", is_flag=True, default=False, help="Read, process and write one sentence at a time, if possible.")
+@click.option("--columnar", is_flag=True, default=False, help="Run supporting processors on a columnar copy of the document.")
+@click.option("--cache-dir", default=None, help="Directory where imported documents are cached.")
+@click.option("--cache-size", default=1024, type=int, help="Maximal size of the cache in MB.")
+@click.option("--profile", default=None, help="Measure time and throughput of each pipeline stage and write a report to this file (.json, .csv or .tsv).")
+@click.option("--profile-memory", is_flag=True, default=False, help="Also measure the memory of each pipeline stage (slows down the conversion).")
+@click.option("--incremental", is_flag=True, default=False, help="Only convert files that changed since the last run (see manifest in output directory).")
 
 
 def convert(f, out, **kwargs):
@@ -241,18 +491,62 @@ def convert(f, out, **kwargs):
     if not out:
         return None
 
-    #Create Pipeline
-    pipeline = Pipeline(files, out, **kwargs)
+    #Create cache for imported documents
+    cachedir = kwargs.pop("cache_dir", None)
+    cachesize = kwargs.pop("cache_size", 1024)
+    if cachedir:
+        kwargs["cache"] = DocCache(os.path.normpath(cachedir), max_size=cachesize*2**20)
+
+    incremental = kwargs.pop("incremental", False)
 
-    #For all files
-    with click.progressbar(files, label="Converting texts:") as files:
-        for file in files:
+    #Measure pipeline stages
+    report = kwargs.pop("profile", None)
+    profile_memory = kwargs.pop("profile_memory", False)
+    if report or profile_memory:
+        kwargs["profiler"] = Profiler(memory=profile_memory)
 
-            #Skip non-existing files
-            if not file_exists(file):
-                continue
+    #Create Pipeline
+    pipeline = Pipeline(files, out, **kwargs)
 
-            pipeline.convert(file)
+    #Create output directory for each exporter
+    for name, _ in pipeline.exporter:
+        if not get_output_dir(None, None, pipeline.get_outdir(name)):
+            return None
+
+    #Skip files that did not change since the last run
+    manifest = None
+    if incremental:
+        manifest = Manifest(out)
+        #Files are numbered without non-existing files
+        files = list(enumerate(file for file in files if file_exists(file)))
+        n_files = len(files)
+        files = [(i, file) for i, file in files if not manifest.is_current(file, pipeline, i)]
+        print("Skipping {0} of {1} files (unchanged).".format(n_files-len(files), n_files))
+        if not files:
+            #Store new modification times of unchanged files
+            manifest.save()
+            return
+    else:
+        files = list(enumerate(files))
+
+    #Convert files in parallel
+    jobs = kwargs.get("jobs", 1)
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs > 1 and len(files) > 1:
+        #Skip non-existing files
+        if manifest is None:
+            files = list(enumerate(file for _, file in files if file_exists(file)))
+        convert_parallel(pipeline, files, min(jobs, len(files)), manifest)
+    else:
+        convert_sequential(pipeline, files, manifest)
+
+    #Report time, throughput and memory of the pipeline stages
+    if "profiler" in pipeline.__dict__:
+        print()
+        pipeline.profiler.print_summary()
+        if report:
+            pipeline.profiler.write(report)
 
 ################################
 if __name__ == '__main__':
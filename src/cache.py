@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+'''
+On-disk cache for imported documents.
+
+Imported docs are stored as compressed pickles in a cache directory.
+The key of a doc is computed from the path and the content of the
+input file, the importer class and version and the source code of the
+modules the importers depend on (MODULES). A warm run skips parsing
+the input file. Importers that read other files than the input file
+(side_files, e.g. meta data) are not cached, because changes of these
+files would not be noticed.
+
+Meta information that the importer writes to the meta directory
+is stored with the doc and appended again when the doc is loaded
+from the cache, so the meta files are the same as without cache.
+
+If the cache is larger than its maximal size, the least recently
+used docs are removed.
+'''
+
+import os
+import zlib
+import pickle
+import shutil
+import hashlib
+import tempfile
+from utils import append_metainfo
+
+############################
+
+#Increase if the format of cache entries changes
+CACHE_FORMAT = 1
+
+#File extension of cache entries
+EXTENSION = ".doc"
+
+############################
+
+def hash_file(file, blocksize=2**20):
+    """
+    Return SHA-256 hash of the file content.
+    Input: Filename
+    Output: Hex digest
+    """
+    sha = hashlib.sha256()
+    with open(file, mode="rb") as f:
+        for block in iter(lambda: f.read(blocksize), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+############################
+
+#Modules that determine the imported docs
+#(the importers and all modules they import from this directory)
+MODULES = ("importer.py", "document.py", "detokenizer.py", "utils.py")
+
+def hash_modules(modules):
+    """
+    Return SHA-256 hash of the source code of the given modules
+    (in the directory of this module).
+    Input: Module filenames
+    Output: Hex digest
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    return hashlib.sha256("".join(hash_file(os.path.join(directory, module))
+                                  for module in modules).encode("utf-8")).hexdigest()
+
+#Hash of these modules
+CODE_VERSION = hash_modules(MODULES)
+
+############################
+
+class DocCache(object):
+
+    def __init__(self, cachedir, max_size=2**30, **kwargs):
+        """
+        Initialize a cache in the given directory.
+        Input: Cache directory, maximal size of the cache in bytes
+        """
+        self.cachedir = cachedir
+        self.max_size = max_size
+        for key,val in kwargs.items():
+            self.__dict__[key] = val
+
+        if not os.path.isdir(self.cachedir):
+            os.makedirs(self.cachedir)
+
+    ##########################
+
+    def get_key(self, importer, file):
+        """
+        Return cache key for a file and importer.
+
+        Docs contain the name of the input file and importers may
+        use its path, so the absolute path is part of the key.
+        Importers that number their files (filenr) name
+        the docs after this number, so it is part of the key, too.
+        Input: Importer object, filename
+        Output: Hex digest
+        """
+        sha = hashlib.sha256()
+        for part in (str(CACHE_FORMAT), CODE_VERSION,
+                     os.path.abspath(file), hash_file(file),
+                     type(importer).__module__, type(importer).__name__,
+                     str(getattr(importer, "version", None)),
+                     str(getattr(importer, "filenr", None))):
+            sha.update(part.encode("utf-8"))
+            sha.update(b"\0")
+        return sha.hexdigest()
+
+    ##########################
+
+    def get_path(self, key):
+        return os.path.join(self.cachedir, key + EXTENSION)
+
+    ##########################
+
+    def load(self, key):
+        """
+        Load a doc from the cache.
+        Input: Cache key
+        Output: Tuple (doc, {meta filename : lines}) or None
+        """
+        path = self.get_path(key)
+        try:
+            with open(path, mode="rb") as f:
+                entry = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        #Damaged or outdated entries are ignored
+        except Exception:
+            return None
+
+        #Mark entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry
+
+    ##########################
+
+    def store(self, key, doc, metainfo):
+        """
+        Store a doc and its meta information in the cache.
+        Entries are written to a temporary file first,
+        so parallel workers never read incomplete entries.
+        Input: Cache key, doc, {meta filename : lines}
+        """
+        try:
+            data = zlib.compress(pickle.dumps((doc, metainfo), protocol=pickle.HIGHEST_PROTOCOL), 1)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError) as e:
+            print("WARNING: Could not cache {0} ({1}).".format(doc.filename, type(e).__name__))
+            return
+
+        fd, tmpfile = tempfile.mkstemp(suffix=".tmp", dir=self.cachedir)
+        with os.fdopen(fd, mode="wb") as f:
+            f.write(data)
+        os.replace(tmpfile, self.get_path(key))
+
+        self.evict()
+
+    ##########################
+
+    def evict(self):
+        """
+        Remove least recently used entries
+        until the cache is not larger than max_size.
+        """
+        entries = []
+        for filename in os.listdir(self.cachedir):
+            if not filename.endswith(EXTENSION):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cachedir, filename))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filename))
+
+        size = sum(entry[1] for entry in entries)
+        for _, filesize, filename in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.cachedir, filename))
+            except FileNotFoundError:
+                pass
+            size -= filesize
+
+    ##########################
+
+    def import_file(self, importer, file, metadir):
+        """
+        Import a file with the given importer or load it from the cache.
+
+        On a cache miss, the importer writes its meta information
+        to a temporary directory, from where it is appended to metadir
+        and stored with the doc.
+        Importers that read side files always import the file.
+        Input: Importer object, filename, meta directory
+        Output: Doc object
+        """
+        if getattr(importer, "side_files", False):
+            return importer.import_file(file, metadir)
+
+        key = self.get_key(importer, file)
+
+        entry = self.load(key)
+        if entry is not None:
+            doc, metainfo = entry
+            #Count the file as if it had been imported
+            if hasattr(importer, "filenr"):
+                importer.filenr += 1
+
+        else:
+            tmpdir = tempfile.mkdtemp(prefix="c6c_", dir=metadir)
+            try:
+                doc = importer.import_file(file, tmpdir)
+                metainfo = dict()
+                for metafilename in sorted(os.listdir(tmpdir)):
+                    with open(os.path.join(tmpdir, metafilename), mode="r", encoding="utf-8") as metafile:
+                        metainfo[metafilename] = metafile.readlines()
+            finally:
+                shutil.rmtree(tmpdir, ignore_errors=True)
+
+            if doc is not None:
+                doc.buffer()
+                self.store(key, doc, metainfo)
+
+        for metafilename, lines in metainfo.items():
+            append_metainfo(metadir, metafilename, lines)
+
+        return doc
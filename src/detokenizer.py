@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+'''
+Reconstruction of the sentence text from the tokens.
+
+A detokenizer joins the word forms of a sentence with spaces,
+except for punctuation: tokens like "." or ")" are attached to the
+previous token and the token after "(" is attached to it.
+Which tokens are treated like this depends on the corpus,
+so each importer uses one of the profiles in PROFILES.
+
+The text is built in a single pass over the tokens
+(the parts are collected in a list and joined once).
+'''
+
+import re
+
+############################
+
+class Detokenizer(object):
+
+    def __init__(self, left=(), right=(), quotes=(), **kwargs):
+        """
+        Initialize a detokenizer.
+        Input: Tokens that are attached to the previous token (left),
+               tokens after which the next token is attached (right),
+               quotes that are attached to the previous word in
+               fix_spacing if they end a word (quotes)
+        """
+        self.left = frozenset(left)
+        self.right = frozenset(right)
+        self.quotes = frozenset(quotes)
+        for key,val in kwargs.items():
+            self.__dict__[key] = val
+
+        #Spacing fixes work on single characters
+        right_chars = "".join(sorted(re.escape(c) for c in self.right if len(c) == 1))
+        left_chars = "".join(sorted(re.escape(c) for c in self.left if len(c) == 1))
+        quote_chars = "".join(sorted(re.escape(c) for c in self.quotes if len(c) == 1))
+
+        #Space after a right character
+        self.right_space = re.compile("([" + right_chars + "]) ") if right_chars else None
+
+        #Space before a left character (or a quote at the end of a word)
+        left_space = []
+        if left_chars:
+            left_space.append("[" + left_chars + "]")
+        if quote_chars:
+            left_space.append("[" + quote_chars + r"](?= |\Z)")
+        self.left_space = re.compile(" (?=" + "|".join(left_space) + ")") if left_space else None
+
+    ##########################
+
+    def detokenize(self, forms):
+        """
+        Join the word forms of a sentence to its text.
+        Input: Iterable of word forms
+        Output: Text (string)
+        """
+        left = self.left
+        right = self.right
+
+        parts = []
+        #Last character of the text (None = text is still empty)
+        last = None
+
+        for form in forms:
+
+            #first token
+            if last is None:
+                if form:
+                    parts.append(form)
+                    last = form[-1]
+                continue
+
+            #token is punctuation
+            if form in left:
+                part = form
+            elif form in right:
+                part = " " + form
+            #other token
+            elif last in right:
+                part = form
+            else:
+                part = " " + form
+
+            parts.append(part)
+            if part:
+                last = part[-1]
+
+        return "".join(parts)
+
+    ##########################
+
+    def fix_spacing(self, text):
+        """
+        Remove the spaces around punctuation in a given text
+        (e.g. "( Haus ) ." -> "(Haus).").
+        Input: Text (string)
+        Output: Corrected text
+        """
+        if self.right_space is not None:
+            text = self.right_space.sub(r"\1", text)
+        if self.left_space is not None:
+            text = self.left_space.sub("", text)
+        return text
+
+############################
+
+#Punctuation profiles of the corpora
+PROFILES = {"default" : Detokenizer(left=[".", ",", ":", ";", "!", "?", ")", "]"],
+                                    right=["(", "["]),
+            "tiger" : Detokenizer(left=[".", ",", ":", ";", "!", "?", ")", "]", "''", "/"],
+                                  right=["(", "[", "`", "/"]),
+            "tuebadz" : Detokenizer(left=[".", ",", ":", ";", "!", "?", ")", "]", "/"],
+                                    right=["(", "[", "/"], quotes=['"']),
+            "germanc" : Detokenizer(left=[".", ",", ":", ";", "!", "?", ")", "]", "'"],
+                                    right=["(", "["]),
+            "annis" : Detokenizer(left=[".", ",", ":", ";", "!", "?"])}
@@ -4,13 +4,123 @@ Created on 14.10.2019
 @author: Katrin Ortmann
 '''
 
+import re
+from sys import intern
+from array import array
+from collections.abc import MutableMapping
+
+#NumPy is optional and only used to speed up the columnar backend
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+############################
+
+class TokenAnnotations(MutableMapping):
+    """
+    Dictionary view of the annotations of a token.
+
+    Makes 'tok.__dict__' behave like the attribute dictionary
+    of a normal object, i.e. reading, setting, deleting
+    and iterating over annotations works as before.
+    Only annotations are found, not methods or class attributes
+    of the token.
+    """
+
+    __slots__ = ("token",)
+
+    def __init__(self, token):
+        self.token = token
+
+    ####################
+
+    def __getitem__(self, key):
+        token = self.token
+        if key in Token.CORE_NAMES:
+            try:
+                return object.__getattribute__(token, key)
+            except AttributeError:
+                raise KeyError(key)
+        annos = token._annos
+        if annos and key in annos:
+            return annos[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        #Same as __getitem__, but without raising KeyError
+        #(exporters call this for every column)
+        token = self.token
+        if key in Token.CORE_NAMES:
+            return getattr(token, key, default)
+        annos = token._annos
+        if annos:
+            return annos.get(key, default)
+        return default
+
+    def __setitem__(self, key, val):
+        setattr(self.token, key, val)
+
+    def __delitem__(self, key):
+        try:
+            delattr(self.token, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self):
+        return iter(self.token.annotations())
+
+    def __len__(self):
+        return len(self.token.annotations())
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
 ############################
 
 class Token:
+    """
+    A token with its annotations as attributes.
+
+    The core columns (ID, FORM, LEMMA, UPOS, ...) are stored in slots,
+    all other annotations in an additional dictionary,
+    which is only created if needed.
+    Values of tag-like columns are interned,
+    so that each tag is only stored once in memory.
+
+    Annotations can be accessed as attributes (tok.XPOS)
+    or via 'tok.__dict__' (tok.__dict__.get("XPOS", "_")).
+    """
+
+    CORE = ("ID", "FORM", "LEMMA", "UPOS", "XPOS", "FEATS", "HEAD", "DEPREL", "DEPS", "MISC")
+    CORE_NAMES = frozenset(CORE)
+    TAGS = frozenset(("ID", "UPOS", "XPOS", "FEATS", "HEAD", "DEPREL", "DEPS", "MISC",
+                      "POS", "POS_GEN", "PUNC", "CHUNK", "TopF", "SentBrckt"))
+
+    __slots__ = CORE + ("_annos",)
+    SLOTS = frozenset(__slots__)
 
     def __init__(self, **kwargs):
-        for key in kwargs:
-            self.add_value(key, kwargs.get(key, "_"))
+        #Same as add_value for each annotation, but faster
+        annos = None
+        setslot = object.__setattr__
+        for key, val in kwargs.items():
+            if val.__class__ is str and (val == "_" or key in Token.TAGS):
+                val = intern(val)
+            if key in Token.SLOTS:
+                setslot(self, key, val)
+            elif annos is None:
+                annos = {key : val}
+            else:
+                annos[key] = val
+        setslot(self, "_annos", annos)
 
     ####################
 
@@ -22,8 +132,82 @@ class Token:
 
     ####################
 
+    def __getattr__(self, key):
+        #Only called if key is not a (filled) slot
+        if key != "_annos":
+            annos = self._annos
+            if annos and key in annos:
+                return annos[key]
+        raise AttributeError(key)
+
+    ####################
+
+    def __setattr__(self, key, val):
+        if val.__class__ is str and (val == "_" or key in Token.TAGS):
+            val = intern(val)
+        if key in Token.SLOTS:
+            object.__setattr__(self, key, val)
+        elif self._annos is None:
+            object.__setattr__(self, "_annos", {key : val})
+        else:
+            self._annos[key] = val
+
+    ####################
+
+    def __delattr__(self, key):
+        if key in Token.SLOTS:
+            object.__delattr__(self, key)
+        elif self._annos and key in self._annos:
+            del self._annos[key]
+        else:
+            raise AttributeError(key)
+
+    ####################
+
+    def __getstate__(self):
+        return dict(self.__dict__.items())
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "_annos", None)
+        for key, val in state.items():
+            self.add_value(key, val)
+
+    ####################
+
+    @property
+    def __dict__(self):
+        return TokenAnnotations(self)
+
+    ####################
+
+    def annotations(self):
+        """
+        Return list of annotation names of the token.
+        """
+        names = []
+        for key in Token.CORE:
+            try:
+                object.__getattribute__(self, key)
+                names.append(key)
+            except AttributeError:
+                pass
+        if self._annos:
+            names.extend(self._annos)
+        return names
+
+    ####################
+
+    def extra_annotations(self):
+        """
+        Return dictionary with all annotations that are not
+        core columns (should not be modified).
+        """
+        return self._annos or {}
+
+    ####################
+
     def add_value(self, key, val):
-        self.__dict__[key] = val
+        setattr(self, key, val)
 
 ############################
 
@@ -64,6 +248,152 @@ class Sentence:
     def __str__(self):
         return " ".join(str(tok) for tok in self.tokens)
 
+    #######################
+
+    def dependency_graph(self):
+        """
+        Return the dependency graph of the sentence,
+        built from the ID and HEAD annotations of the tokens.
+        """
+        return DependencyGraph(self)
+
+############################
+
+class DependencyGraph:
+    """
+    Index of the dependency relations of a sentence.
+
+    Built in one pass over the tokens. Looking up the head,
+    the dependents or the span of a token does not
+    require another scan over the sentence.
+    """
+
+    def __init__(self, sentence):
+        self.tokens = sentence.tokens
+
+        #Position of each token in the sentence
+        self.index = dict()
+        #Token for each ID (the first one, if IDs are not unique)
+        self.ids = dict()
+        for i, tok in enumerate(self.tokens):
+            self.index[tok] = i
+            self.ids.setdefault(getattr(tok, "ID", None), tok)
+
+        self.roots = []
+        self.heads = dict()
+        self.dependents = {tok : [] for tok in self.tokens}
+        self.spans = None
+
+        for tok in self.tokens:
+            head = getattr(tok, "HEAD", "_")
+            if head == "0":
+                self.roots.append(tok)
+                self.heads[tok] = None
+            elif head != "_":
+                head_tok = self.ids.get(head, None)
+                self.heads[tok] = head_tok
+                if head_tok is not None:
+                    self.dependents[head_tok].append(tok)
+            else:
+                self.heads[tok] = None
+
+    #######################
+
+    def head(self, tok):
+        """
+        Return the head token of tok or None
+        for roots and tokens without (valid) head.
+        """
+        return self.heads[tok]
+
+    #######################
+
+    def is_root(self, tok):
+        return tok in self.roots
+
+    #######################
+
+    def children(self, tok):
+        """
+        Return the dependents of tok in sentence order.
+        """
+        return self.dependents[tok]
+
+    #######################
+
+    def set_head(self, tok, head):
+        """
+        Attach tok to a new head and update the dependents.
+        Input: Token, new head token (or anything else,
+               e.g. None or 'ROOT', to detach the token)
+        """
+        old_head = self.heads[tok]
+        if old_head is head:
+            return
+        if old_head is not None:
+            self.dependents[old_head].remove(tok)
+
+        if head in self.dependents:
+            self.heads[tok] = head
+            dependents = self.dependents[head]
+            #Keep sentence order
+            i = len(dependents)
+            while i > 0 and self.index[dependents[i-1]] > self.index[tok]:
+                i -= 1
+            dependents.insert(i, tok)
+        else:
+            self.heads[tok] = None
+
+        self.spans = None
+
+    #######################
+
+    def span(self, tok):
+        """
+        Return the positions of the first and the last token
+        in the subtree of tok.
+        """
+        if self.spans is None:
+            self.spans = self.get_spans()
+        return self.spans[tok]
+
+    #######################
+
+    def get_spans(self):
+        """
+        Compute the subtree spans of all tokens bottom-up.
+        Cycles in the annotation are cut.
+        Output: Dictionary {token : (first position, last position)}
+        """
+        spans = dict()
+
+        for start in self.tokens:
+            if start in spans:
+                continue
+
+            #Iterative depth-first search (None marks open tokens)
+            spans[start] = None
+            stack = [(start, iter(self.dependents[start]))]
+
+            while stack:
+                tok, children = stack[-1]
+                child = next(children, None)
+
+                if child is None:
+                    stack.pop()
+                    first = last = self.index[tok]
+                    for dep in self.dependents[tok]:
+                        if spans[dep] is not None:
+                            first = min(first, spans[dep][0])
+                            last = max(last, spans[dep][1])
+                    spans[tok] = (first, last)
+
+                elif not child in spans:
+                    spans[child] = None
+                    stack.append((child, iter(self.dependents[child])))
+
+        return spans
+
 ############################
 
 class Doc(object):
@@ -97,6 +427,12 @@ class Doc(object):
 
     def add_sent(self, sentence):
         self.n_sents += 1
+        self.set_sent_id(sentence)
+        self.sentences.append(sentence)
+
+    #######################
+
+    def set_sent_id(self, sentence):
 
         if sentence.__dict__.get("sent_id", None) in ("_", None):
             sentence.sent_id = str(self.n_sents)
@@ -107,12 +443,374 @@ class Doc(object):
         elif "." in sentence.sent_id:
             pass
 
-        self.sentences.append(sentence)
+    #######################
+
+    def stream_sents(self, sentences):
+        """
+        Use an iterator of sentences as content of the doc.
+
+        Sentences are numbered as in add_sent when they are read,
+        but they are not kept in memory. The doc can only be
+        iterated once, unless it is buffered.
+        """
+        self.sentences = self.number_sents(sentences)
+
+    #######################
+
+    def number_sents(self, sentences):
+        for sentence in sentences:
+            self.n_sents += 1
+            self.set_sent_id(sentence)
+            yield sentence
+
+    #######################
+
+    def is_streamed(self):
+        """
+        Return if the sentences of the doc are an iterator.
+        """
+        return not isinstance(self.sentences, list)
+
+    #######################
+
+    def buffer(self):
+        """
+        Read all sentences of a streamed doc into memory.
+        """
+        if self.is_streamed():
+            self.sentences = list(self.sentences)
+
+#################################
+
+class Missing(object):
+    """
+    Placeholder for annotations that a token does not have.
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __reduce__(self):
+        return "MISSING"
+
+MISSING = Missing()
+
+#################################
+
+class Column(object):
+    """
+    One annotation column of a ColumnDoc.
+
+    Values are stored as integer codes, which index into
+    the vocabulary of the column. Code 0 (MISSING) marks
+    tokens without this annotation.
+
+    Codes are kept in a NumPy array if NumPy is available,
+    otherwise in an array from the standard library.
+    """
+
+    def __init__(self, name, codes=None):
+        self.name = name
+        self.vocab = [MISSING]
+        self.index = {MISSING : 0}
+        self.codes = make_codes(codes or [])
+        self.changed = False
+
+    ####################
+
+    def __len__(self):
+        return len(self.codes)
+
+    ####################
+
+    def __getitem__(self, i):
+        return self.vocab[self.codes[i]]
+
+    ####################
+
+    def code(self, val):
+        """
+        Return the code of a value.
+        Unknown values are added to the vocabulary.
+        """
+        try:
+            c = self.index.get(val)
+        except TypeError:
+            #Unhashable values (e.g. lists) get their own code
+            self.vocab.append(val)
+            return len(self.vocab)-1
+        if c is None:
+            if val.__class__ is str:
+                val = intern(val)
+            c = len(self.vocab)
+            self.vocab.append(val)
+            self.index[val] = c
+        return c
+
+    ####################
+
+    def values(self):
+        """
+        Return list of decoded values (MISSING for empty cells).
+        """
+        vocab = self.vocab
+        return [vocab[c] for c in self.codes.tolist()]
+
+    ####################
+
+    def equals(self, val):
+        """
+        Return a mask of all tokens with the given value.
+        """
+        try:
+            c = self.index.get(val, -1)
+        except TypeError:
+            c = -1
+        if numpy is not None:
+            return self.codes == c
+        return [x == c for x in self.codes]
+
+    ####################
+
+    def assign(self, val, mask=None):
+        """
+        Set the value for all tokens in the mask
+        (or for all tokens, if no mask is given).
+        """
+        c = self.code(val)
+        if mask is None:
+            self.codes = make_codes([c] * len(self.codes))
+        elif numpy is not None:
+            self.codes[mask] = c
+        else:
+            codes = self.codes
+            for i, m in enumerate(mask):
+                if m:
+                    codes[i] = c
+        self.changed = True
+
+#################################
+
+def make_codes(codes):
+    """
+    Return an integer code array for the given list of codes.
+    """
+    if numpy is not None:
+        return numpy.array(codes, dtype=numpy.int32)
+    return array("i", codes)
+
+#################################
+
+class ColumnDoc(object):
+    """
+    Column-oriented (struct-of-arrays) representation of a document.
+
+    Every annotation (FORM, XPOS, ...) is stored as one Column
+    of integer codes for all tokens of the document.
+    Sentence boundaries are kept in 'offsets': the tokens of
+    sentence i are the positions offsets[i] to offsets[i+1]-1.
+    Sentence and document attributes are kept as they are.
+
+    Bulk annotation changes (e.g. tagset mappings) work on
+    codes instead of tokens and only look at each distinct
+    value (combination) once.
+
+    Use ColumnDoc.from_doc(doc) and to_doc() or write_to(doc)
+    to convert between both representations.
+    """
+
+    def __init__(self, filename, **kwargs):
+
+        self.filename = filename
+        self.attributes = kwargs
+        self.columns = dict()
+        self.offsets = [0]
+        self.sent_attributes = []
+        self.n_toks = 0
+
+    ####################
+
+    def __len__(self):
+        return self.n_toks
+
+    ####################
+
+    @property
+    def n_sents(self):
+        return len(self.sent_attributes)
+
+    ####################
+
+    @classmethod
+    def from_doc(cls, doc):
+        """
+        Create a columnar representation of a document.
+
+        Input: Doc object
+        Output: ColumnDoc object
+        """
+        cdoc = cls(doc.filename, **{key : val for key, val in doc.__dict__.items()
+                                    if key not in ("filename", "sentences", "n_sents")})
+        columns = cdoc.columns
+        codes = dict()
+
+        n = 0
+        for sent in doc.sentences:
+            cdoc.sent_attributes.append({key : val for key, val in sent.__dict__.items()
+                                         if key not in ("tokens", "n_toks")})
+            for tok in sent.tokens:
+                annotations = tok.annotations()
+                for key in annotations:
+                    col = columns.get(key)
+                    if col is None:
+                        col = columns[key] = Column(key)
+                        codes[key] = [0] * n
+                    codes[key].append(col.code(getattr(tok, key)))
+                n += 1
+                #Fill columns the token has no annotation for
+                if len(annotations) < len(columns):
+                    for colcodes in codes.values():
+                        if len(colcodes) < n:
+                            colcodes.append(0)
+            cdoc.offsets.append(n)
+
+        for key, col in columns.items():
+            col.codes = make_codes(codes[key])
+        cdoc.n_toks = n
+
+        return cdoc
+
+    ####################
+
+    def column(self, name):
+        """
+        Return the column with the given name.
+        Unknown columns are created empty.
+        """
+        col = self.columns.get(name)
+        if col is None:
+            col = self.columns[name] = Column(name, [0] * self.n_toks)
+        return col
+
+    ####################
+
+    def map(self, sources, target, func, mask=None):
+        """
+        Set the target column to the result of func,
+        applied to the values of the source columns.
+
+        func is called only once for each distinct
+        combination of source values that occurs in the document.
+        If a mask is given, only these tokens are changed.
+
+        Input: List of source column names, target column name,
+               function, optional mask
+        """
+        cols = [self.column(name) for name in sources]
+        target = self.column(target)
+        sizes = [len(col.vocab) for col in cols]
+
+        def result(key):
+            vals = []
+            for col, size in zip(reversed(cols), reversed(sizes)):
+                key, c = divmod(key, size)
+                vals.append(col.vocab[c])
+            return target.code(func(*reversed(vals)))
+
+        if numpy is not None:
+            #Combine codes of all sources into one key per token
+            keys = numpy.zeros(self.n_toks, dtype=numpy.int64)
+            for col, size in zip(cols, sizes):
+                keys = keys * size + col.codes
+            combos, inverse = numpy.unique(keys, return_inverse=True)
+            lut = numpy.array([result(key) for key in combos.tolist()], dtype=numpy.int32)
+            new = lut[inverse.reshape(-1)]
+            if mask is not None:
+                new = numpy.where(mask, new, target.codes)
+            target.codes = new.astype(numpy.int32)
+
+        else:
+            lut = dict()
+            keys = [0] * self.n_toks
+            for col, size in zip(cols, sizes):
+                keys = [key * size + c for key, c in zip(keys, col.codes)]
+            new = []
+            for key in keys:
+                c = lut.get(key)
+                if c is None:
+                    c = lut[key] = result(key)
+                new.append(c)
+            if mask is not None:
+                new = [n if m else o for n, o, m in zip(new, target.codes, mask)]
+            target.codes = make_codes(new)
+
+        target.changed = True
+
+    ####################
+
+    def to_doc(self):
+        """
+        Create a new Doc object from the columns.
+
+        Output: Doc object
+        """
+        doc = Doc(self.filename, **self.attributes)
+        cols = [(name, col.vocab, col.codes.tolist()) for name, col in self.columns.items()]
+
+        for s, attributes in enumerate(self.sent_attributes):
+            sent = Sentence(**attributes)
+            for i in range(self.offsets[s], self.offsets[s+1]):
+                sent.tokens.append(Token(**{name : vocab[codes[i]] for name, vocab, codes in cols
+                                            if codes[i]}))
+            sent.n_toks = len(sent.tokens)
+            doc.sentences.append(sent)
+        doc.n_sents = len(doc.sentences)
+
+        return doc
+
+    ####################
+
+    def write_to(self, doc):
+        """
+        Write changed columns back to the tokens of the
+        document this ColumnDoc was created from.
+
+        Token objects stay the same, so that references
+        to them (e.g. from trees) remain valid.
+
+        Input: Doc object
+        Output: Doc object
+        """
+        cols = [(name, col.vocab, col.codes.tolist())
+                for name, col in self.columns.items() if col.changed]
+        if not cols:
+            return doc
+
+        i = 0
+        for sent in doc.sentences:
+            for tok in sent.tokens:
+                for name, vocab, codes in cols:
+                    c = codes[i]
+                    if c:
+                        setattr(tok, name, vocab[c])
+                    elif name in tok.__dict__:
+                        delattr(tok, name)
+                i += 1
+
+        for _, col in self.columns.items():
+            col.changed = False
+
+        return doc
 
 #################################
 
 class Tree(object):
 
+    #End of category and label in PTB strings
+    CAT_END = re.compile(r"[^( :)]*")
+    LABEL_END = re.compile(r"[^( ]*")
+
     def __init__(self, ID, cat, label, nodes = None, parent = None, **kwargs):
         """
         Initialize a tree object.
@@ -136,6 +834,9 @@ class Tree(object):
         self.category = cat
         self.parent_node = parent
 
+        #Cached terminals, length and spans
+        self._cache = None
+
         #Add child nodes
         self.children = []
         if nodes != None and isinstance(nodes, list):
@@ -159,15 +860,58 @@ class Tree(object):
 
     def __len__(self):
         """
-        Return the number of dominated terminal nodes.
+        Return the number of dominated terminal nodes
+        (0 for terminal nodes).
         """
-        length = 0
-        for child in self.children:
-            if child.is_terminal:
-                length += 1
-            else:
-                length += len(child)
-        return length
+        if self.is_terminal():
+            return 0
+
+        cache = self.get_cache()
+        if not "length" in cache:
+            #Count bottom-up (children before parents)
+            for node in reversed(self.non_terminals()):
+                node.get_cache()["length"] = sum(len(child) if child.children else 1
+                                                 for child in node.children)
+        return cache["length"]
+
+    #################
+
+    def get_cache(self):
+        """
+        Return dictionary with the cached values of this node.
+
+        The cached values only depend on the subtree of the node.
+        A node only has a cache if all its descendants have one,
+        so a change only has to empty the caches up to the first
+        ancestor without a cache (see structure_changed).
+        """
+        if self._cache is None:
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                node._cache = dict()
+                stack.extend(child for child in node.children if child._cache is None)
+        return self._cache
+
+    #################
+
+    def structure_changed(self):
+        """
+        Invalidate the cached terminals and spans
+        of this node and its ancestors.
+        """
+        node = self
+        while node is not None and node._cache is not None:
+            node._cache = None
+            node = node.parent_node
+
+    #################
+
+    def __getstate__(self):
+        #Cached values are not stored
+        state = dict(self.__dict__)
+        state["_cache"] = None
+        return state
 
     #################
 
@@ -262,13 +1006,94 @@ class Tree(object):
 
         If self is a terminal node, return list including self.
         """
-        if self.is_terminal():
-            return [self]
+        cache = self.get_cache()
+        if not "terminals" in cache:
+            cache["terminals"] = list(self.iter_terminals())
+        return list(cache["terminals"])
+
+    ################
+
+    def iter_terminals(self, reverse=False):
+        """
+        Yield dominated terminal nodes from left to right
+        (or from right to left).
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.is_terminal():
+                yield node
+            elif reverse:
+                stack.extend(node.children)
+            else:
+                stack.extend(reversed(node.children))
+
+    ################
+
+    def non_terminals(self):
+        """
+        Return list of dominated non-terminal nodes
+        (including self) in pre-order.
+        """
+        nodes = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if not node.is_terminal():
+                nodes.append(node)
+                stack.extend(reversed(node.children))
+        return nodes
+
+    ################
+
+    def first_terminal(self):
+        """
+        Return the first dominated terminal node.
+        """
+        return self.outer_terminal("first", 0)
+
+    ################
+
+    def last_terminal(self):
+        """
+        Return the last dominated terminal node.
+        """
+        return self.outer_terminal("last", -1)
+
+    ################
+
+    def outer_terminal(self, key, index):
+        """
+        Follow the first (index 0) or last (index -1) child
+        down to a terminal and cache it for all nodes on the way.
+        """
+        caches = []
+        node = self
+        while not node.is_terminal():
+            cache = node.get_cache()
+            if key in cache:
+                node = cache[key]
+                break
+            caches.append(cache)
+            node = node.children[index]
+        for cache in caches:
+            cache[key] = node
+        return node
+
+    ################
+
+    def get_token_index(self):
+        """
+        Return zero-based index of the token of a terminal node
+        (None if there is no token or no numeric ID).
+        """
+        if "token" in self.__dict__:
+            try:
+                return int(self.__dict__["token"].__dict__.get("ID", None))-1
+            except ValueError:
+                return None
         else:
-            terminal_nodes = []
-            for child in self.nodes():
-                terminal_nodes.extend(child.terminals())
-        return terminal_nodes
+            return None
     
     ################
 
@@ -289,7 +1114,7 @@ class Tree(object):
 
         Root nodes are trees without parent node.
         """
-        if not self.parent_node:
+        if self.parent_node is None:
             return True
         else:
             return False
@@ -306,37 +1131,16 @@ class Tree(object):
 
         Otherwise returns None.
         """
-        #Get terminals
-        terminals = self.terminals()
-        if terminals:
-
-            #If punctuation should be ignored
-            if ignore_punct:
-                #Strip off punctuation
-                no_punct_terminals = [t for t in self.terminals() 
-                                      if "token" in t.__dict__ 
-                                         and not t.token.XPOS.startswith("$")]
-                #Return index of first non-punct terminal
-                if no_punct_terminals:
-                    try:
-                        return int(no_punct_terminals[0].__dict__["token"].__dict__.get("ID", None))-1
-                    except ValueError:
-                        return None
-                else: 
-                    pass
-            
-            #If punctuation should be included
-            #or there is only punctuation
-            if "token" in terminals[0].__dict__:
-                try:
-                    #Return index of first token
-                    return int(terminals[0].__dict__["token"].__dict__.get("ID", None))-1
-                except ValueError:
-                    return None
-            else:
-                return None
-        else:
-            return None
+        #If punctuation should be ignored
+        if ignore_punct:
+            #Return index of first non-punct terminal
+            for t in self.iter_terminals():
+                if "token" in t.__dict__ and not t.token.XPOS.startswith("$"):
+                    return t.get_token_index()
+
+        #If punctuation should be included
+        #or there is only punctuation
+        return self.first_terminal().get_token_index()
 
     ########################
 
@@ -350,37 +1154,16 @@ class Tree(object):
 
         Otherwise returns None.
         """
-        #Get terminals
-        terminals = self.terminals()
-        if terminals:
-
-            #If punctuation should be ignored
-            if ignore_punct:
-                #Strip off punctuation
-                no_punct_terminals = [t for t in self.terminals() 
-                                      if "token" in t.__dict__ 
-                                         and not t.token.XPOS.startswith("$")]
-                #Return index of last non-punct terminal
-                if no_punct_terminals:
-                    try:
-                        return int(no_punct_terminals[-1].__dict__["token"].__dict__.get("ID", None))-1
-                    except ValueError:
-                        return None
-                else: 
-                    pass
-            
-            #If punctuation should be included
-            #or there is only punctuation
-            if "token" in terminals[-1].__dict__:
-                try:
-                    #Return index of last token
-                    return int(terminals[-1].__dict__["token"].__dict__.get("ID", None))-1
-                except ValueError:
-                    return None
-            else:
-                return None
-        else:
-            return None
+        #If punctuation should be ignored
+        if ignore_punct:
+            #Return index of last non-punct terminal
+            for t in self.iter_terminals(reverse=True):
+                if "token" in t.__dict__ and not t.token.XPOS.startswith("$"):
+                    return t.get_token_index()
+
+        #If punctuation should be included
+        #or there is only punctuation
+        return self.last_terminal().get_token_index()
 
     ################
 
@@ -432,6 +1215,7 @@ class Tree(object):
         """
         self.children.append(node)
         node.set_parent(self)
+        self.structure_changed()
         
     ################
 
@@ -442,6 +1226,7 @@ class Tree(object):
         """
         if node in self.children:
             del self.children[self.children.index(node)]
+            self.structure_changed()
             return True
         else:
             return False
@@ -458,6 +1243,7 @@ class Tree(object):
         try:
             self.children.insert(index, node)
             node.set_parent(self)
+            self.structure_changed()
             return True
         except IndexError:
             return False
@@ -486,28 +1272,31 @@ class Tree(object):
         #Empty tree, return None
         if s == "(VROOT)":
             return tree
-        
-        #Go through tree string
-        while s:
-            char = s[0]
+
+        #All nodes in the order of creation
+        #(= order of terminals in the tree)
+        nodes = []
+
+        #Go through tree string with a cursor
+        i = 0
+        n = len(s)
+        while i < n:
+            char = s[i]
 
             #New subtree or token
             if char == "(":
-                s = s[1:]
+                i += 1
 
                 #Read cat (or POS in case of token)
-                cat = ""
-                while s[0] not in ["(", " ", ":", ")"]:
-                    cat += s[0]
-                    s = s[1:]
-                
+                end = Tree.CAT_END.match(s, i).end()
+                cat = s[i:end]
+                i = end
+
                 #Read label
-                if s[0] == ":":
-                    s = s[1:]
-                    label = ""
-                    while s[0] not in ["(", " "]:
-                        label += s[0]
-                        s = s[1:]
+                if s[i] == ":":
+                    end = Tree.LABEL_END.match(s, i+1).end()
+                    label = s[i+1:end]
+                    i = end
                     simple_cat = cat + ":" + label
                 #No label? Set default
                 else:
@@ -515,12 +1304,10 @@ class Tree(object):
                     simple_cat = cat
 
                 #If token: read token form
-                if s[0] == " ":
-                    s = s[1:]
-                    form = ""
-                    while s[0] != ")":
-                        form += s[0]
-                        s = s[1:]
+                if s[i] == " ":
+                    end = s.index(")", i+1)
+                    form = s[i+1:end]
+                    i = end + 1
 
                     #Create token object
                     #Map POS
@@ -529,13 +1316,14 @@ class Tree(object):
                                      "PTBLabel": label})
                     
                     #Create terminal node with token attribute
-                    child = Tree(str(len(tree.terminals())+1), cat=cat, label=label, 
+                    #(IDs are set when the tree is complete)
+                    child = Tree(None, cat=cat, label=label, 
                                  **{"token" : token, "simple_cat" : simple_cat})
                     
                     #Set parent of terminal node and add to tree
                     child.set_parent(tree)
                     tree.add_child(child)
-                    s = s[1:]
+                    nodes.append(child)
 
                 #If subtree: read subtree
                 else:
@@ -550,14 +1338,15 @@ class Tree(object):
                     #Or set root node
                     else:
                         tree = child                    
+                    nodes.append(child)
 
             #End of node
             elif char == ")":
-                s = s[1:]
+                i += 1
                 #Set terminal IDs
                 if tree != None and tree.is_root():
-                    for i, t in enumerate(tree.terminals()):
-                        t.ID = str(i+1)
+                    for j, t in enumerate([t for t in nodes if t.is_terminal()]):
+                        t.ID = str(j+1)
                     return tree
                 #Move up in tree and continue
                 elif tree != None:
@@ -568,11 +1357,15 @@ class Tree(object):
             #Neither start nor end
             else:
                 input("Error: Unexpected char '{0}'. Press any key to continue.".format(char))
-                s = s[1:]
+                i += 1
+
+        #Empty string
+        if tree is None:
+            return None
 
         #Set terminal IDs
-        for i, t in enumerate(tree.terminals()):
-            t.ID = str(i+1)
+        for j, t in enumerate(tree.terminals()):
+            t.ID = str(j+1)
 
         return tree
 
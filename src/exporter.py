@@ -11,16 +11,102 @@ import os
 
 class Exporter(object):
 
+    #Number of characters that are collected before writing
+    BUFFER_SIZE = 2**20
+
+    #Extension of output files
+    EXTENSION = ".txt"
+
     def __init__(self):
         pass
 
     def export(self, doc, outdir):
         pass
 
+    #########################
+
+    def create_outfile(self, filename, outdir):
+        """
+        Open the output file for a doc.
+        The name of the last opened file is kept in last_outfile.
+        Input: Filename of the doc, output directory
+        Output: File object or None
+        """
+        try:
+            filename, _ = os.path.splitext(filename)
+            filename = filename+self.EXTENSION
+            outfile = open(os.path.join(outdir, filename), mode="w", encoding="utf-8")
+            self.last_outfile = os.path.join(outdir, filename)
+            return outfile
+        except:
+            print("ERROR: Cannot open file {0}.".format(filename))
+            return None
+
+    #########################
+
+    def get_order(self, mapping):
+        """
+        Return the keys of a column or meta mapping sorted by their position.
+        Input: Dictionary {name : position}
+        Output: List of names
+        """
+        return [key for key, _ in sorted(mapping.items(), key=lambda l: l[1])]
+
+    #########################
+
+    def format_sentence(self, sent, meta, columns, separator="\t"):
+        """
+        Return the meta info and words of a sentence as one string.
+        Input: Sentence, list of meta info names, list of columns, column separator
+        Output: String with one line per meta info and word
+        """
+        lines = []
+
+        #Sentence meta info
+        for metainfo in meta:
+            val = sent.__dict__.get(metainfo, None)
+            if val: lines.append("# {0} = {1}\n".format(metainfo, val))
+
+        #Words
+        for word in sent.tokens:
+            annotations = word.__dict__
+            lines.append(separator.join([str(annotations.get(col, "_")) for col in columns]) + "\n")
+
+        return "".join(lines)
+
+    #########################
+
+    def write_sentences(self, doc, outfile, format_sentence):
+        """
+        Write the sentences of a doc separated by empty lines.
+        The output is collected and written in large chunks.
+        Input: Doc, outfile, function that formats a sentence as string
+        """
+        chunk = []
+        size = 0
+
+        for i, sent in enumerate(doc.sentences):
+
+            #Empty line between sentences
+            if i > 0:
+                chunk.append("\n")
+
+            block = format_sentence(sent)
+            chunk.append(block)
+            size += len(block)
+
+            if size >= self.BUFFER_SIZE:
+                outfile.write("".join(chunk))
+                chunk = []
+                size = 0
+
+        outfile.write("".join(chunk))
+
 ############################
 
 class CoNLLUPlusExporter(Exporter):
 
+    EXTENSION = ".conllup"
     COLUMNS = {"ID" : 0, "FORM" : 1, "LEMMA" : 2, "UPOS" : 3, "XPOS" : 4,
                "FEATS" : 5, "HEAD" : 6, "DEPREL" : 7, "DEPS" : 8, "MISC" : 9}
     META = {"doc_id(tueba)" : 0, "sent_id" : 1, "sent_id(DTA)" : 2, "sent_id(Tiger)" : 2, "sent_id(TSV)" : 2, "sent_id(tueba)" : 2, "sent_id(grid)" : 3,
@@ -29,22 +115,10 @@ class CoNLLUPlusExporter(Exporter):
     ##########################
 
     def __init__(self):
-        self.COLUMNS = CoNLLUPlusExporter.COLUMNS
+        self.COLUMNS = dict(CoNLLUPlusExporter.COLUMNS)
 
     ##########################
 
-    def create_outfile(self, filename, outdir):
-        try:
-            filename, _ = os.path.splitext(filename)
-            filename = filename+".conllup"
-            outfile = open(os.path.join(outdir, filename), mode="w", encoding="utf-8")
-            return outfile
-        except:
-            print("ERROR: Cannot open file {0}.".format(filename))
-            return None
-
-    #########################
-
     def set_colums(self, doc):
         # xxxxxxxxxx
         if self.__dict__.get("column_order", "alpha") != "alpha":
@@ -57,10 +131,16 @@ class CoNLLUPlusExporter(Exporter):
                 self.COLUMNS[col] = i+len(self.COLUMNS)+1
 
         else:
+            #Start with the core columns
+            #(columns of previously exported docs are not kept)
+            self.COLUMNS = dict(CoNLLUPlusExporter.COLUMNS)
+            #All sentences are needed to know the columns
+            doc.buffer()
             additional_annos = set()
             for sent in doc.sentences:
                 for tok in sent.tokens:
-                    for anno, val in tok.__dict__.items():
+                    #Core columns are always included
+                    for anno, val in tok.extra_annotations().items():
                         if not anno in self.COLUMNS and not val in (None, "_"):
                             additional_annos.add(anno)
             if additional_annos:
@@ -83,25 +163,16 @@ class CoNLLUPlusExporter(Exporter):
         #Add necessary columns for this doc
         self.set_colums(doc)
 
+        #Column and meta info order for this doc
+        columns = self.get_order(self.COLUMNS)
+        meta = self.get_order(self.META)
+
         #Print header
-        header = "# global.columns = " + " ".join([key for key,val in sorted(self.COLUMNS.items(), key=lambda l: l[1])])
+        header = "# global.columns = " + " ".join(columns)
         print(header, file=outfile)
 
-        for sent in doc.sentences:
-
-            #Print sentence meta info
-            for metainfo, _ in sorted(self.META.items(), key=lambda l: l[1]):
-                val = sent.__dict__.get(metainfo, None)
-                if val: print("# {0} = {1}".format(metainfo, val), file=outfile)
-
-            #Print words
-            for word in sent.tokens:
-                print("\t".join([str(word.__dict__.get(col, "_")) \
-                                 for col, _ in sorted(self.COLUMNS.items(), key=lambda l: l[1])]), \
-                      file=outfile)
-
-            if not sent is doc.sentences[-1]:
-                print(file=outfile)
+        #Print sentences
+        self.write_sentences(doc, outfile, lambda sent: self.format_sentence(sent, meta, columns))
 
         outfile.close()
 
@@ -109,6 +180,7 @@ class CoNLLUPlusExporter(Exporter):
 
 class CoNLLUExporter(Exporter):
 
+    EXTENSION = ".conllu"
     COLUMNS = {"ID" : 0, "FORM" : 1, "LEMMA" : 2, "UPOS" : 3, "XPOS" : 4, \
                "FEATS" : 5, "HEAD" : 6, "DEPREL" : 7, "DEPS" : 8, "MISC" : 9}
     META = {"doc_id(tueba)" : 0, "sent_id" : 1, "sent_id(DTA)" : 2, "sent_id(Tiger)" : 2, "sent_id(TSV)" : 2, "sent_id(tueba)" : 2, "sent_id(grid)" : 3, \
@@ -121,18 +193,6 @@ class CoNLLUExporter(Exporter):
 
     ##########################
 
-    def create_outfile(self, filename, outdir):
-        try:
-            filename, _ = os.path.splitext(filename)
-            filename = filename+".conllu"
-            outfile = open(os.path.join(outdir, filename), mode="w", encoding="utf-8")
-            return outfile
-        except:
-            print("ERROR: Cannot open file {0}.".format(filename))
-            return None
-
-    #########################
-
     def set_meta(self, doc):
         pass
 
@@ -144,26 +204,16 @@ class CoNLLUExporter(Exporter):
         outfile = self.create_outfile(doc.filename, outdir)
         if not outfile: return
 
+        #Column and meta info order for this doc
+        columns = self.get_order(self.COLUMNS)
+        meta = self.get_order(self.META)
+
         #Print header
-        header = "# global.columns = " + " ".join([key for key,val in sorted(self.COLUMNS.items(), key=lambda l: l[1])])
+        header = "# global.columns = " + " ".join(columns)
         print(header, file=outfile)
 
-        for sent in doc.sentences:
-
-            #Print sentence meta info
-            for metainfo, _ in sorted(self.META.items(), key=lambda l: l[1]):
-                val = sent.__dict__.get(metainfo, None)
-                if val: print("# {0} = {1}".format(metainfo, val), file=outfile)
-
-            #Print words
-            for word in sent.tokens:
-
-                print("\t".join([str(word.__dict__.get(col, "_")) \
-                                 for col, _ in sorted(self.COLUMNS.items(), key=lambda l: l[1])]), \
-                      file=outfile)
-
-            if not sent is doc.sentences[-1]:
-                print(file=outfile)
+        #Print sentences
+        self.write_sentences(doc, outfile, lambda sent: self.format_sentence(sent, meta, columns))
 
         outfile.close()
 
@@ -171,6 +221,7 @@ class CoNLLUExporter(Exporter):
 
 class DTATSVExporter(Exporter):
 
+    EXTENSION = ".tsv"
     COLUMNS = ["TSVID", "CHARS", "FORM", "XPOS", "POS", "LEMMA", "OrthCorr",
                         "OrthCorrOp", "OrthCorrReason", "Cite", "AntecDepLink", "AntecMovElem",
                         "AntecHeadLink", "AntecHead", "AntecHeadLemLink", "AntecHeadLem",
@@ -185,18 +236,6 @@ class DTATSVExporter(Exporter):
 
     ##########################
 
-    def create_outfile(self, filename, outdir):
-        try:
-            filename, _ = os.path.splitext(filename)
-            filename = filename+".tsv"
-            outfile = open(os.path.join(outdir, filename), mode="w", encoding="utf-8")
-            return outfile
-        except:
-            print("ERROR: Cannot open file {0}.".format(filename))
-            return None
-
-    #########################
-
     def set_colums(self, doc):
         pass
 
@@ -224,7 +263,11 @@ class DTATSVExporter(Exporter):
 #T_SP=webanno.custom.Extraposition|ROLE_webanno.custom.Extraposition:antecedent_webanno.custom.ExtrapositionAntecedentLink|webanno.custom.Antezedens|category|position|relctype|role|typ|ROLE_webanno.custom.Extraposition:verb_webanno.custom.ExtrapositionVerbLink|de.tudarmstadt.ukp.dkpro.core.api.lexmorph.type.pos.POS"""
         print(header, end="\n\n\n", file=outfile)
 
-        for sent in doc.sentences:
+        for i, sent in enumerate(doc.sentences):
+
+            #Empty line between sentences
+            if i > 0:
+                print(file=outfile)
 
             #Print text
             print("#Text=" + sent.text, file=outfile)
@@ -235,15 +278,13 @@ class DTATSVExporter(Exporter):
                                      for col in self.COLUMNS]), \
                       file=outfile)
 
-            if not sent is doc.sentences[-1]:
-                print(file=outfile)
-
         outfile.close()
 
 ############################
 
 class HIPKONTSVExporter(Exporter):
 
+    EXTENSION = ".tsv"
     COLUMNS = ["TSVID", "CHARS", "FORM", "XPOS", "LEMMA", "TopF"]
 
     ##########################
@@ -253,18 +294,6 @@ class HIPKONTSVExporter(Exporter):
 
     ##########################
 
-    def create_outfile(self, filename, outdir):
-        try:
-            filename, _ = os.path.splitext(filename)
-            filename = filename+".tsv"
-            outfile = open(os.path.join(outdir, filename), mode="w", encoding="utf-8")
-            return outfile
-        except:
-            print("ERROR: Cannot open file {0}.".format(filename))
-            return None
-
-    #########################
-
     def set_colums(self, doc):
         pass
 
@@ -288,7 +317,11 @@ class HIPKONTSVExporter(Exporter):
 #T_SP=webanno.custom.TopF|TopologicalField"""
         print(header, end="\n\n\n", file=outfile)
 
-        for sent in doc.sentences:
+        for i, sent in enumerate(doc.sentences):
+
+            #Empty line between sentences
+            if i > 0:
+                print(file=outfile)
 
             #Print text
             print("#Text=" + sent.text, file=outfile)
@@ -299,9 +332,6 @@ class HIPKONTSVExporter(Exporter):
                                      for col in self.COLUMNS]), \
                       file=outfile)
 
-            if not sent is doc.sentences[-1]:
-                print(file=outfile)
-
         outfile.close()
 
 ############################
@@ -309,6 +339,8 @@ class HIPKONTSVExporter(Exporter):
 
 class TextExporter(Exporter):
 
+    EXTENSION = ".txt"
+
     ##########################
 
     def __init__(self):
@@ -316,18 +348,6 @@ class TextExporter(Exporter):
 
     ##########################
 
-    def create_outfile(self, filename, outdir):
-        try:
-            filename, _ = os.path.splitext(filename)
-            filename = filename+".txt"
-            outfile = open(os.path.join(outdir, filename), mode="w", encoding="utf-8")
-            return outfile
-        except:
-            print("ERROR: Cannot open file {0}.".format(filename))
-            return None
-
-    #########################
-
     def export(self, doc, outdir):
 
         #Open outfile
@@ -348,6 +368,8 @@ class TextExporter(Exporter):
 
 class POSExporter(Exporter):
 
+    EXTENSION = ".txt"
+
     ##########################
 
     def __init__(self):
@@ -355,18 +377,6 @@ class POSExporter(Exporter):
 
     ##########################
 
-    def create_outfile(self, filename, outdir):
-        try:
-            filename, _ = os.path.splitext(filename)
-            filename = filename+".txt"
-            outfile = open(os.path.join(outdir, filename), mode="w", encoding="utf-8")
-            return outfile
-        except:
-            print("ERROR: Cannot open file {0}.".format(filename))
-            return None
-
-    #########################
-
     def export(self, doc, outdir):
 
         #Open outfile
@@ -395,6 +405,7 @@ class POSExporter(Exporter):
 
 class CoNLL2000Exporter(Exporter):
 
+    EXTENSION = ".conll"
     COLUMNS = {"FORM" : 0, "XPOS" : 1, "CHUNK" : 2}
     META = {"sent_id" : 0, "text" : 1}
     SEPARATOR = " "
@@ -406,18 +417,6 @@ class CoNLL2000Exporter(Exporter):
 
     ##########################
 
-    def create_outfile(self, filename, outdir):
-        try:
-            filename, _ = os.path.splitext(filename)
-            filename = filename+".conll"
-            outfile = open(os.path.join(outdir, filename), mode="w", encoding="utf-8")
-            return outfile
-        except:
-            print("ERROR: Cannot open file {0}.".format(filename))
-            return None
-
-    #########################
-
     def set_meta(self, doc):
         pass
 
@@ -429,17 +428,11 @@ class CoNLL2000Exporter(Exporter):
         outfile = self.create_outfile(doc.filename, outdir)
         if not outfile: return
 
-        for sent in doc.sentences:
-
-            #Print words
-            for word in sent.tokens:
-
-                print(self.SEPARATOR.join([str(word.__dict__.get(col, "_")) \
-                                 for col, _ in sorted(self.COLUMNS.items(), key=lambda l: l[1])]), \
-                      file=outfile)
+        #Column order for this doc
+        columns = self.get_order(self.COLUMNS)
 
-            if not sent is doc.sentences[-1]:
-                print(file=outfile)
+        #Print words (without meta info)
+        self.write_sentences(doc, outfile, lambda sent: self.format_sentence(sent, [], columns, self.SEPARATOR))
 
         outfile.close()
 
@@ -447,23 +440,13 @@ class CoNLL2000Exporter(Exporter):
 
 class PTBExporter(Exporter):
 
+    EXTENSION = ".txt"
+
     def __init__(self):
         pass
 
     ##########################
 
-    def create_outfile(self, filename, outdir):
-        try:
-            filename, _ = os.path.splitext(filename)
-            filename = filename+".txt"
-            outfile = open(os.path.join(outdir, filename), mode="w", encoding="utf-8")
-            return outfile
-        except:
-            print("ERROR: Cannot open file {0}.".format(filename))
-            return None
-
-    #########################
-
     def export(self, doc, outdir):
 
         #Open outfile
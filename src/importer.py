@@ -6,14 +6,25 @@ Created on 14.10.2019
 '''
 
 import os, re, html
+from bisect import bisect_left
 import xml.etree.ElementTree as ET
 from collections import OrderedDict
+from operator import itemgetter
 from document import Doc, Sentence, Token, Tree
+from detokenizer import PROFILES
 from utils import normalize_filename
 ############################
 
 class Importer(object):
 
+    #Increase if the docs of an importer change
+    #(invalidates docs in the cache, see cache.py)
+    version = 1
+
+    #True if the importer reads other files than the input file
+    #(e.g. meta data); docs of these importers are not cached
+    side_files = False
+
     def __init__(self, **kwargs):
         for key,val in kwargs.items():
             self.__dict__[key] = val
@@ -21,6 +32,16 @@ class Importer(object):
     def import_file(self, file, metadir):
         pass
 
+    def import_stream(self, file, metadir):
+        """
+        Import a file as a stream of sentences.
+
+        Importers that can read a file sentence by sentence
+        return a doc with a sentence iterator (see Doc.stream_sents).
+        All others return the complete doc.
+        """
+        return self.import_file(file, metadir)
+
 ############################
 
 class TCFDTAImporter(Importer):
@@ -44,29 +65,16 @@ class TCFDTAImporter(Importer):
 
         doc = Doc(filename)
 
-        #Read tcf tree
-        tree = ET.parse(file)
-        root = tree.getroot()
-
-        #Store tcf annotations in dictionary to speed up conversion
-        tcf_dict = self.get_annotations_from_tcf(root.find(".//corpus:TextCorpus", self.namespaces))
-
-        #Find text element
-        textElem = root.find(".//corpus:TextCorpus", self.namespaces)
-
-        #Find sentences element
-        sentencesElem = textElem.find(".//corpus:sentences", self.namespaces)
+        #Read tcf file, store tcf annotations in dictionary to speed up conversion
+        tcf_dict, sentences = self.read_text_corpus(file)
 
         #Create sentence object for each sentence
-        for sentElem in sentencesElem:
+        for sent_id, tok_ids in sentences:
 
-            sent = Sentence(**{"tcf_id" : sentElem.attrib["ID"]})
+            sent = Sentence(**{"tcf_id" : sent_id})
 
             #TODO Reconstruct original text
 
-            #Get token ids for tokens in the sentence
-            tok_ids = [tok_id for tok_id in sentElem.attrib["tokenIDs"].split()]
-
             #Get annotations for tokens from tcf file
             #(use dictionary here to speed up look-up)
             for tok_id in tok_ids:
@@ -99,41 +107,78 @@ class TCFDTAImporter(Importer):
 
     #################################
 
-    def get_annotations_from_tcf(self, textElem):
+    def read_text_corpus(self, file):
         """
-        Store all annotations (except sentences) from a given TCF file
-        in a dictionary to speed up the conversion.
-        Input: Text element of the TCF file.
+        Read the text corpus of a given TCF file incrementally
+        and store all annotations (except sentences) in a dictionary
+        to speed up the conversion. Each element is removed from the tree
+        after it has been read.
+        Input: TCF file.
         Output: Dictionary with token indices as keys and annotations as key value pairs
                 { "w1" : { "token" : "Vier", "lemma" : "vier", "pos" : "CARD",
                            "norm" : "", "norm_operation" : "", "norm_reason" : ""},
                   ...
                 }
-                "norm", "norm_operation" and "norm_reason" keys may be missing for single tokens
+                "norm", "norm_operation" and "norm_reason" keys may be missing for single tokens,
+                List of sentences as (sentence ID, list of token IDs)
         """
+        corpus = "{" + self.namespaces["corpus"] + "}"
+
         tcf_dict = dict()
+        sentences = []
+
+        parents = []
+        textElem = None
+        sentencesElem = None
+
+        for event, elem in ET.iterparse(file, events=("start", "end")):
+
+            if event == "start":
+                #Only the first text corpus is converted
+                if textElem is None and elem.tag == corpus+"TextCorpus":
+                    textElem = elem
+                #Sentences are taken from the first sentences element
+                elif sentencesElem is None and textElem is not None \
+                 and textElem in parents and elem.tag == corpus+"sentences":
+                    sentencesElem = elem
+                parents.append(elem)
+                continue
 
-        for token in textElem.findall(".//corpus:token", self.namespaces):
-            tcf_dict[token.attrib["ID"]] = {"token" : token.text}
+            parents.pop()
 
-        for pos in textElem.findall(".//corpus:POStags/corpus:tag", self.namespaces):
-            tcf_dict[pos.attrib["tokenIDs"]]["pos"] = pos.text
+            if textElem is not None and textElem in parents:
 
-        for lemma in textElem.findall(".//corpus:lemma", self.namespaces):
-            tcf_dict[lemma.attrib["tokenIDs"]]["lemma"] = lemma.text
+                parent = parents[-1].tag
 
-        for norm in textElem.findall(".//corpus:orthography/corpus:correction", self.namespaces):
-            tcf_dict[norm.attrib["tokenIDs"]]["norm"] = norm.text
-            if "operation" in norm.attrib:
-                tcf_dict[norm.attrib["tokenIDs"]]["norm_operation"] = norm.attrib["operation"]
-            else:
-                tcf_dict[norm.attrib["tokenIDs"]]["norm_operation"] = "*"
-            if "reason" in norm.attrib:
-                tcf_dict[norm.attrib["tokenIDs"]]["norm_reason"] = norm.attrib["reason"]
-            else:
-                tcf_dict[norm.attrib["tokenIDs"]]["norm_reason"] = "*"
+                if elem.tag == corpus+"token":
+                    tcf_dict.setdefault(elem.attrib["ID"], dict())["token"] = elem.text
 
-        return tcf_dict
+                elif elem.tag == corpus+"tag" and parent == corpus+"POStags":
+                    tcf_dict.setdefault(elem.attrib["tokenIDs"], dict())["pos"] = elem.text
+
+                elif elem.tag == corpus+"lemma":
+                    tcf_dict.setdefault(elem.attrib["tokenIDs"], dict())["lemma"] = elem.text
+
+                elif elem.tag == corpus+"correction" and parent == corpus+"orthography":
+                    annotations = tcf_dict.setdefault(elem.attrib["tokenIDs"], dict())
+                    annotations["norm"] = elem.text
+                    if "operation" in elem.attrib:
+                        annotations["norm_operation"] = elem.attrib["operation"]
+                    else:
+                        annotations["norm_operation"] = "*"
+                    if "reason" in elem.attrib:
+                        annotations["norm_reason"] = elem.attrib["reason"]
+                    else:
+                        annotations["norm_reason"] = "*"
+
+                elif parents[-1] is sentencesElem:
+                    sentences.append((elem.attrib["ID"], elem.attrib["tokenIDs"].split()))
+
+            #Remove element
+            if parents:
+                parents[-1].remove(elem)
+
+        return tcf_dict, sentences
 
 ############################
 
@@ -312,133 +357,186 @@ class XMLDTAImporter(Importer):
 
     ################################
 
-    def get_paragraphs(self, textElem):
+    def read_tei(self, file):
         """
-        Find all paragraphs and store the IDs of sentences appearing in them
-        to facilitate parsing and look-up of paragraph IDs.
-        Input: Text element
-        Output: Dictionary with sentence IDs (s145, s235_3, ...) as keys
-                and their corresponding paragraph ID (1..n) as value.
+        Read a DTA TEI file incrementally in a single pass.
+        Each sentence element is reduced to its IDs, words and
+        structural context and then removed from the tree.
+        Input: DTA TEI file
+        Output: Dictionary with meta info,
+                Dictionary with sentence hex values as keys
+                and lists of (part number, sentence part) as value,
+                Dictionary with the position of the last div per type
+                and of the last header, title, etc.
         """
-        paragraphs = textElem.findall(".//default:p", namespaces=self.namespaces)
-        pdict = dict()
-        for i,paragraph in enumerate(paragraphs):
-            pdict[str(i+1)] = set()
-            for sentence in paragraph.findall(".//default:s", namespaces=self.namespaces):
-                pdict[str(i+1)].add(sentence.attrib.get(r"{http://www.w3.org/XML/1998/namespace}id", None))
-        reversedpdict = dict()
-        for p, v in pdict.items():
-            for s in v:
-                if s != None:
-                    reversedpdict[s] = p
-        return reversedpdict
+        tei = "{" + self.namespaces["default"] + "}"
 
-    ################################
+        metainfo = None
+        sentences = OrderedDict()
+        last = dict()
+
+        #Open elements and the paragraph or section they start
+        parents = []
+        contexts = []
+        textElem = None
+        sentElem = None
+        n_paragraphs = 0
+        n_sections = 0
+
+        #Tail of a sentence is only known at the next event
+        #(iterparse may also report events after the tail has been read)
+        prevElem = None
+        prevPart = None
+
+        for event, elem in ET.iterparse(file, events=("start", "end")):
+
+            if prevPart is not None:
+                prevPart["tail_nl"] = bool(prevElem.tail and prevElem.tail.endswith("\n"))
+                prevPart = None
+
+            if event == "start":
+
+                paragraph = None
+                section = None
+
+                #Only the first text element is converted
+                if textElem is None and len(parents) == 1 and elem.tag == tei+"text":
+                    textElem = elem
+
+                elif textElem is not None and len(parents) > 1 and parents[1] is textElem:
+
+                    #Paragraphs
+                    if elem.tag == tei+"p":
+                        n_paragraphs += 1
+                        paragraph = str(n_paragraphs)
+
+                    #Div types
+                    elif elem.tag == tei+"div" and "type" in elem.attrib:
+                        section = ("div", elem.attrib["type"])
+
+                    #Headers, titles, ...
+                    elif elem.tag == tei+"titlePart" and elem.attrib.get("type", None) == "main":
+                        section = ("text_section", "title")
+                    elif elem.tag == tei+"titlePart" and elem.attrib.get("type", None) == "sub":
+                        section = ("text_section", "subtitle")
+                    elif elem.tag == tei+"head":
+                        section = ("text_section", "head")
+                    elif elem.tag == tei+"note":
+                        section = ("text_section", "note")
+
+                    #Sentences
+                    elif elem.tag == tei+"s" and sentElem is None:
+                        sentElem = elem
+
+                    if section:
+                        n_sections += 1
+                        last[section] = n_sections
+                        section = (section, n_sections)
+
+                parents.append(elem)
+                contexts.append((paragraph, section))
+                continue
 
-    def get_divtypes(self, textElem):
-        """
-        Find all div elements with a specified type
-        and store the IDs of sentences appearing in them
-        to facilitate parsing and look-up of div types.
-        Input: Text element
-        Output: Dictionary with sentence IDs (s145, s235_3, ...) as keys
-                and their corresponding div types as value.
-        """
-        #Check if type is specified and not a number
-        div_types = textElem.findall(".//default:div[@type]", namespaces=self.namespaces)
-        divdict = dict()
-        for div in div_types:
-            divdict[div.attrib.get("type", None)] = set()
-            for sentence in div.findall(".//default:s", namespaces=self.namespaces):
-                divdict[div.attrib.get("type", None)].add(sentence.attrib.get(r"{http://www.w3.org/XML/1998/namespace}id", None))
-        reverseddivdict = dict()
-        for k, v in divdict.items():
-            if k == None: continue
-            for s in v:
-                if s != None:
-                    if s in reverseddivdict:
-                        reverseddivdict[s].add(k)
-                    else:
-                        reverseddivdict[s] = {k}
-        return reverseddivdict
+            parents.pop()
+            contexts.pop()
 
-    ################################
+            if elem is sentElem:
+                sentpart = self.get_sentence_part(elem, contexts)
 
-    def get_headlines_etc(self, textElem):
-        """
-        Find all headers, titles, ... and store the IDs of sentences appearing in them
-        to facilitate parsing and look-up of headers, titles, etc.
-        Input: Text element
-        Output: Dictionary with sentence IDs (s145, s235_3, ...) as keys
-                and their corresponding headers, titles, etc. as value.
-        """
-        headerdict = dict()
-
-        for tag,name in [("titlePart[@type='main']", "title"), \
-                         ("titlePart[@type='sub']", "subtitle"), \
-                         ("head", "head"), ("note", "note")]:
-            elems = textElem.findall(".//default:"+tag, namespaces=self.namespaces)
-
-            for elem in elems:
-                headerdict[name] = set()
-                for sentence in elem.findall(".//default:s", namespaces=self.namespaces):
-                    headerdict[name].add(sentence.attrib.get(r"{http://www.w3.org/XML/1998/namespace}id", None))
-
-        reverseddict = dict()
-        for k, v in headerdict.items():
-            for s in v:
-                if s != None:
-                    if s in reverseddict:
-                        reverseddict[s].add(k)
-                    else:
-                        reverseddict[s] = {k}
-        return reverseddict
+                #Parse ID
+                if "_" in sentpart["id"]:
+                    match = re.match(r"s(?P<hex>[\d\w]+)_(?P<part>\d+)", sentpart["id"])
+                    partnr = int(match.group("part"))
+                else:
+                    match = re.match(r"s(?P<hex>[\d\w]+)", sentpart["id"])
+                    partnr = 1
+                hexval = match.group("hex")
 
-    ################################
+                #Join sentence parts
+                if hexval in sentences:
+                    sentences[hexval].append((partnr, sentpart))
+                else:
+                    sentences[hexval] = [(partnr, sentpart)]
 
-    def get_sentences(self, textElem):
+                sentElem = None
+                prevElem = elem
+                prevPart = sentpart
+                #Keep tail of the element
+                del elem[:]
 
-        sentences = OrderedDict()
+            elif sentElem is not None:
+                #Keep words until the sentence is complete
+                continue
 
-        #Get sentences
-        for sentence in textElem.findall(".//default:s", namespaces=self.namespaces):
+            elif len(parents) > 1 and parents[1] is not textElem:
+                #Keep header, etc. until they are complete
+                continue
 
-            #Sentence ID DTA
-            sentID = sentence.attrib.get(r"{http://www.w3.org/XML/1998/namespace}id", None)
+            elif metainfo is None and len(parents) == 1 and elem.tag == tei+"teiHeader":
+                metainfo = self.read_metaheader(elem)
 
-            #Parse ID
-            if "_" in sentID:
-                match = re.match(r"s(?P<hex>[\d\w]+)_(?P<part>\d+)", sentID)
-                sentpart = int(match.group("part"))
-            else:
-                match = re.match(r"s(?P<hex>[\d\w]+)", sentID)
-                sentpart = 1
-            hexval = match.group("hex")
+            #Remove element
+            if parents:
+                parents[-1].remove(elem)
 
-            #Join sentence parts
-            if hexval in sentences:
-                sentences[hexval].append((sentpart, sentence))
-            else:
-                sentences[hexval] = [(sentpart, sentence)]
+        if metainfo is None:
+            metainfo = self.read_metaheader(None)
 
-        #Reorder sentence parts according to ID
-        for s in sentences:
-            sentences[s] = [sent for (sentpart,sent) in sorted(sentences[s])]
+        return metainfo, sentences, last
 
-        return sentences
+    ################################
+
+    def get_sentence_part(self, sentElem, contexts):
+        """
+        Store the ID, structural context and words of a sentence element.
+        Input: Sentence element, list of (paragraph, section)
+               for all open ancestors of the sentence
+        Output: Dictionary with sentence ID, paragraph ID, sections,
+                list of words and the word that ends the sentence element
+        """
+        tei = "{" + self.namespaces["default"] + "}"
+
+        sentpart = {"id" : sentElem.attrib.get(r"{http://www.w3.org/XML/1998/namespace}id", None),
+                    "paragraph" : None,
+                    "sections" : [section for (_, section) in contexts if section],
+                    "words" : [],
+                    "last" : None,
+                    "tail_nl" : False}
+
+        #Innermost paragraph
+        for (paragraph, _) in reversed(contexts):
+            if paragraph:
+                sentpart["paragraph"] = paragraph
+                break
+
+        lastElem = sentElem[-1] if len(sentElem) else None
+
+        for wordElem in sentElem.iter(tei+"w"):
+
+            #(ID, form, linebreak in tail, attributes)
+            word = (wordElem.attrib.get(r"{http://www.w3.org/XML/1998/namespace}id"),
+                    re.sub(r"\n", "<lb/>", "".join(wordElem.itertext())),
+                    bool(wordElem.tail and wordElem.tail.endswith("\n")),
+                    wordElem.attrib)
+
+            sentpart["words"].append(word)
+            if wordElem is lastElem:
+                sentpart["last"] = word
+
+        return sentpart
 
     ################################
 
-    def get_words(self, sentenceElems):
+    def get_words(self, sentence):
 
         words = OrderedDict()
 
-        for sentElem in sentenceElems:
+        for sentpart in sentence:
             #Get words
-            for word in sentElem.findall(".//default:w", namespaces=self.namespaces):
+            for word in sentpart["words"]:
 
                 #Word ID DTA
-                wordID = word.attrib.get(r"{http://www.w3.org/XML/1998/namespace}id", None)
+                wordID = word[0]
 
                 #Parse ID
                 if "_" in wordID:
@@ -455,7 +553,7 @@ class XMLDTAImporter(Importer):
                     words[hexval] = [(wordpart, word)]
 
         for w in words:
-            words[w] = [word for (wordpart,word) in sorted(words[w])]
+            words[w] = [word for (wordpart,word) in sorted(words[w], key=lambda x: x[0])]
 
         return words
 
@@ -468,33 +566,21 @@ class XMLDTAImporter(Importer):
         path, filename = os.path.split(file)
         filename, ext = os.path.splitext(filename)
 
-        #Read xml tree
-        tree = ET.parse(file)
-        root = tree.getroot()
-
-        metaheader = root.find("default:teiHeader", namespaces=self.namespaces)
-        textElem = root.find("default:text", namespaces=self.namespaces)
-
-        #Read meta info
-        metainfo = self.read_metaheader(metaheader)
+        #Read xml file
+        metainfo, sentences, last = self.read_tei(file)
         metainfo["DTA filename"] = filename+ext
 
         self.output_metainfo(metainfo, metadir)
 
         doc = Doc(**metainfo)
 
-        #Look up which sentences appear in which paragraphs
-        paragraphs = self.get_paragraphs(textElem)
-
-        #Look up div types
-        divtypes = self.get_divtypes(textElem)
+        #Remove sentence parts when they are converted
+        while sentences:
 
-        #Get headers, titles, etc.
-        headers = self.get_headlines_etc(textElem)
+            _, sentence = sentences.popitem(last=False)
 
-        #Get sentences
-        sentences = self.get_sentences(textElem)
-        for _, sentence in sentences.items():
+            #Reorder sentence parts according to ID
+            sentence = [sentpart for (partnr, sentpart) in sorted(sentence, key=lambda x: x[0])]
 
             sent = Sentence(**{"text" : ""})
 
@@ -502,22 +588,26 @@ class XMLDTAImporter(Importer):
             for i, sentpart in enumerate(sentence):
 
                 #Sentence ID DTA
-                sentID = sentpart.attrib.get(r"{http://www.w3.org/XML/1998/namespace}id", None)
+                sentID = sentpart["id"]
                 if i == 0:
                     sent.__dict__["sent_id(DTA)"] = sentID
                 else:
                     sent.__dict__["sent_id(DTA)"] += ", " + sentID
 
                 #Get paragraph ID
-                paragraph_id = paragraphs.get(sentID, None)
+                paragraph_id = sentpart["paragraph"]
                 if paragraph_id:
                     if "paragraph_id" in sent.__dict__ and not paragraph_id in sent.__dict__["paragraph_id"]:
                         sent.__dict__["paragraph_id"] += ", " + paragraph_id
                     elif not "paragraph_id" in sent.__dict__:
                         sent.__dict__["paragraph_id"] = paragraph_id
 
+                #Only the last div of each type and the last header, title, etc.
+                #of each kind count
+                sections = {section for (section, pos) in sentpart["sections"] if last[section] == pos}
+
                 #Get div type
-                div_type = divtypes.get(sentID, None)
+                div_type = {name for (kind, name) in sections if kind == "div"}
                 if div_type:
                     if "div_type" in sent.__dict__:
                         for d in div_type:
@@ -527,7 +617,7 @@ class XMLDTAImporter(Importer):
                         sent.__dict__["div_type"] = ", ".join(div_type)
 
                 #Get header, title, ...
-                header_title_etc = headers.get(sentID, None)
+                header_title_etc = {name for (kind, name) in sections if kind == "text_section"}
                 if header_title_etc:
                     if "text_section" in sent.__dict__:
                         for h in header_title_etc:
@@ -545,27 +635,26 @@ class XMLDTAImporter(Importer):
                 #For each word part
                 for i, wordpart in enumerate(word):
 
+                    wordID, tokform, tail_nl, attrib = wordpart
+
                     #DTA id
                     if "DTA:ID" in kwargs:
-                        kwargs["DTA:ID"] += "," + wordpart.attrib.get(r"{http://www.w3.org/XML/1998/namespace}id")
+                        kwargs["DTA:ID"] += "," + wordID
                     else:
-                        kwargs["DTA:ID"] = wordpart.attrib.get(r"{http://www.w3.org/XML/1998/namespace}id")
+                        kwargs["DTA:ID"] = wordID
 
                     #Form
-                    tokform = "".join(wordpart.itertext())
-                    tokform = re.sub(r"\n", "<lb/>", tokform)
                     #Add final linebreak if deleted by ElementTree
                     if not tokform.endswith("<lb/>"):
                         #Part of word's tail
-                        if wordpart.tail and wordpart.tail.endswith("\n"):
+                        if tail_nl:
                             tokform += "<lb/>"
                         #Part of sentence tail
                         elif len(sentence) > 1 \
-                         and any(wordpart == sentpart[-1] \
-                                 and sentpart.tail \
-                                 and sentpart.tail.endswith("\n") \
+                         and any(wordpart is sentpart["last"] \
+                                 and sentpart["tail_nl"] \
                                  for sentpart in sentence \
-                                     if not sentpart == sentence[-1]):
+                                     if not sentpart is sentence[-1]):
                             tokform += "<lb/>"
 
                     tokform = re.sub(r"\s", "", tokform)
@@ -575,30 +664,31 @@ class XMLDTAImporter(Importer):
                         kwargs["FORM"] = tokform
 
                         #XPOS
-                        kwargs["XPOS"] = wordpart.attrib.get("pos", "_")
+                        kwargs["XPOS"] = attrib.get("pos", "_")
 
                         #Lemma
-                        kwargs["LEMMA"] = wordpart.attrib.get("lemma", "_")
+                        kwargs["LEMMA"] = attrib.get("lemma", "_")
 
                         #Norm
-                        kwargs["DTA:NORM"] = wordpart.attrib.get("norm", "_")
+                        kwargs["DTA:NORM"] = attrib.get("norm", "_")
 
                         #Orig
-                        kwargs["DTA:ORIG"] = wordpart.attrib.get("orig", "_")
+                        kwargs["DTA:ORIG"] = attrib.get("orig", "_")
 
                         #Reg
-                        kwargs["DTA:REG"] = wordpart.attrib.get("reg", "_")
+                        kwargs["DTA:REG"] = attrib.get("reg", "_")
 
                     else:
                         #Form
                         kwargs["FORM"] += tokform
 
                     #Remove multiple adjacent linebreaks
-                    while re.search(r"(<lb/>){2,}", kwargs["FORM"]):
+                    #(one substitution replaces all of them)
+                    if "<lb/><lb/>" in kwargs["FORM"]:
                         kwargs["FORM"] = re.sub(r"(<lb/>){2,}", "<lb/>", kwargs["FORM"])
 
                 #Reconstruct text
-                if "join" in word[0].attrib and word[0].attrib["join"] in ("left", "both"):
+                if "join" in word[0][3] and word[0][3]["join"] in ("left", "both"):
                     sent.text += kwargs["FORM"]
                 elif sent.text:
                     sent.text += " " + kwargs["FORM"]
@@ -619,22 +709,248 @@ class XMLDTAImporter(Importer):
 
 ############################
 
-class CoNLLUPlusImporter(Importer):
+class CoNLLImporter(Importer):
+    """
+    Base class for importers of CoNLL-like formats
+    (one token per line with tab-separated columns,
+    sentences separated by empty lines).
+
+    The file is read in large blocks, each line is stripped
+    and split only once and the columns are mapped to
+    annotations with a getter that is built once per file.
+
+    Subclasses define the columns (COLUMNS or get_columns)
+    and adapt the format with the hooks read_comment, split,
+    create_token and finish_sentence.
+    """
+
+    #Column name : index
+    COLUMNS = dict()
+
+    #Value of columns that are missing in a line
+    #(None = missing columns are an error)
+    MISSING = "_"
+
+    #Start of comment lines (None = no comment lines)
+    COMMENT = "#"
+
+    #Number of characters read at once
+    BLOCKSIZE = 2**20
+
+    #Detokenizer for the sentence text (None = tokens joined with spaces)
+    DETOKENIZER = None
+
+    def __init__(self, **kwargs):
+        for key,val in kwargs.items():
+            self.__dict__[key] = val
+
+    ###############################
+
+    def read_lines(self, file):
+        """
+        Yield the lines of an open file (without linebreak).
+        The file is read in large blocks and closed at the end.
+        Input: File object
+        """
+        rest = ""
+        for block in iter(lambda: file.read(self.BLOCKSIZE), ""):
+            lines = (rest + block).split("\n")
+            rest = lines.pop()
+            yield from lines
+        if rest:
+            yield rest
+        file.close()
+
+    ###############################
+
+    def get_getter(self, columns):
+        """
+        Input: Dictionary with column names as keys and indices as values
+        Output: Function that returns the values of the columns
+                (in the same order) from a list of fields
+        """
+        indices = list(columns.values())
+        if len(indices) > 1:
+            return itemgetter(*indices)
+        elif indices:
+            index = indices[0]
+            return lambda fields: (fields[index],)
+        return lambda fields: ()
 
     ###############################
 
+    def yield_sentences(self, lines, columns, metainfo=None):
+        """
+        Read sentences from the lines of a file.
+        Input: Iterator over lines, dictionary with column names
+               as keys and indices as values, meta info for the
+               first sentence (optional)
+        Output: Iterator over Sentence objects
+        """
+        names = list(columns)
+        getter = self.get_getter(columns)
+        comment = self.COMMENT
+        split = self.split
+        create_token = self.create_token
+
+        tokens = list()
+        if metainfo is None:
+            metainfo = dict()
+        n = 0
+
+        for line in lines:
+
+            line = line.strip()
+
+            #Empty line = end of sentence
+            if not line:
+                if tokens:
+                    n += 1
+                    yield self.create_sentence(tokens, metainfo, n)
+                    tokens = list()
+                    metainfo = dict()
+
+            #Comment line = meta data
+            elif comment is not None and line.startswith(comment):
+                self.read_comment(line, metainfo)
+
+            #Token line
+            else:
+                fields = split(line)
+                try:
+                    values = dict(zip(names, getter(fields)))
+                except IndexError:
+                    if self.MISSING is None:
+                        raise
+                    values = {col : fields[i] if i < len(fields) else self.MISSING
+                              for col, i in columns.items()}
+                tokens.append(create_token(values))
+
+        #If file does not end with empty line
+        #save remaining last sentence
+        if tokens:
+            n += 1
+            yield self.create_sentence(tokens, metainfo, n)
+
+    ###############################
+
+    def create_sentence(self, tokens, metainfo, n):
+        """
+        Input: List of tokens, dictionary with meta info,
+               number of the sentence in the file
+        Output: Sentence object
+        """
+        self.finish_sentence(tokens, metainfo, n)
+        sentence = Sentence(**metainfo)
+        for tok in tokens:
+            sentence.add_token(tok)
+        return sentence
+
+    ###############################
+
+    def read_comment(self, line, metainfo):
+        """
+        Store meta info of a comment line ("# key = value").
+        Input: Stripped line, dictionary with meta info
+        """
+        line = line.lstrip("#").strip().split("=")
+        metainfo[line[0].strip()] = "=".join(line[1:]).strip()
+
+    ###############################
+
+    def split(self, line):
+        return line.split("\t")
+
+    ###############################
+
+    def create_token(self, values):
+        return Token(**values)
+
+    ###############################
+
+    def finish_sentence(self, tokens, metainfo, n):
+        """
+        Add meta info of a complete sentence.
+        Input: List of tokens, dictionary with meta info,
+               number of the sentence in the file
+        """
+        if not "text" in metainfo:
+            if self.DETOKENIZER is None:
+                metainfo["text"] = " ".join([tok.FORM for tok in tokens])
+            else:
+                metainfo["text"] = self.DETOKENIZER.detokenize([tok.FORM for tok in tokens])
+
+#############################
+
+class WebAnnoImporter(CoNLLImporter):
+    """
+    Base class for importers of WebAnno TSV files.
+    """
+
     def __init__(self, **kwargs):
         for key,val in kwargs.items():
             self.__dict__[key] = val
 
     ###############################
 
-    def get_columns(self, file):
+    def read_comment(self, line, metainfo):
+        line = line.lstrip("#").strip().split("=")
+        metainfo[line[0].strip().lower()] = "=".join(line[1:]).strip()
+
+    ###############################
+
+    def finish_sentence(self, tokens, metainfo, n):
+
+        #Get sent_id(TSV)
+        metainfo["sent_id(TSV)"] = tokens[0].TSVID.split("-")[0]
+
+        if not "text" in metainfo:
+            metainfo["text"] = " ".join([tok.FORM for tok in tokens])
+
+    ###############################
+
+    def import_file(self, file, metadir=None):
+
+        path, filename = os.path.split(file)
+
+        #Open file
+        tsvfile = open(file, mode="r", encoding="utf-8")
+        lines = self.read_lines(tsvfile)
+
+        #Get columns
+        columns = self.get_columns(lines)
+        if not columns:
+            print("ERROR: Missing column information for {0}.".format(filename))
+            tsvfile.close()
+            return None
+
+        #Create doc object
+        doc = Doc(filename)
+
+        for sentence in self.yield_sentences(lines, columns):
+            doc.add_sent(sentence)
+
+        return doc
+
+############################
+
+
+class CoNLLUPlusImporter(CoNLLImporter):
+
+    ###############################
+
+    def __init__(self, **kwargs):
+        for key,val in kwargs.items():
+            self.__dict__[key] = val
+
+    ###############################
+
+    def get_columns(self, lines):
         columns = dict()
 
         line = ""
         while not line.strip():
-            line = file.__next__()
+            line = lines.__next__()
 
         if line.strip().startswith("#"):
 
@@ -646,74 +962,46 @@ class CoNLLUPlusImporter(Importer):
 
     ###############################
 
-    def import_file(self, file, metadir=None):
+    def import_stream(self, file, metadir=None):
 
         path, filename = os.path.split(file)
 
         #Open file
         conllfile = open(file, mode="r", encoding="utf-8")
+        lines = self.read_lines(conllfile)
 
         #Get columns
-        columns = self.get_columns(conllfile)
+        columns = self.get_columns(lines)
         if not columns:
             print("ERROR: Missing column information for {0}.".format(filename))
+            conllfile.close()
             return None
 
         #Create doc object
         doc = Doc(filename)
+        doc.stream_sents(self.yield_sentences(lines, columns))
 
-        tokens = list()
-        metainfo = dict()
-
-        for line in conllfile:
-
-            #Empty line = end of sentence
-            if not line.strip() and tokens:
-                if not "text" in metainfo:
-                    metainfo["text"] = " ".join([tok.FORM for tok in tokens])
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
-
-            #Comment line = meta data
-            elif line.strip().startswith("#"):
-                line = line.lstrip("#").strip().split("=")
-                metainfo[line[0].strip()] = "=".join(line[1:]).strip()
+        return doc
 
-            #Token line
-            elif line.strip():
-                line = line.strip().split("\t")
-                values = dict()
-                for col in columns:
-                    try:
-                        values[col] = line[columns.get(col, None)]
-                    except IndexError:
-                        values[col] = "_"
-                tok = Token(**values)
-                tokens.append(tok)
+    ###############################
 
-        #If file does not end with empty line
-        #save remaining last sentence
-        if tokens:
-            if not "text" in metainfo:
-                metainfo["text"] = " ".join([tok.FORM for tok in tokens])
-            sentence = Sentence(**metainfo)
-            for tok in tokens:
-                sentence.add_token(tok)
-            tokens.clear()
-            metainfo.clear()
-            doc.add_sent(sentence)
+    def import_file(self, file, metadir=None):
 
-        conllfile.close()
+        doc = self.import_stream(file, metadir)
+        if doc:
+            doc.buffer()
 
         return doc
 
 ############################
 
-class CoNLLUImporter(Importer):
+class CoNLLUImporter(CoNLLImporter):
+
+    COLUMNS = {"ID" : 0, "FORM" : 1, "LEMMA" : 2, "UPOS" : 3, "XPOS" : 4, \
+               "FEATS" : 5, "HEAD" : 6, "DEPREL" : 7, "DEPS" : 8, "MISC" : 9}
+    MISSING = None
+    COMMENT = None
+    DETOKENIZER = PROFILES["default"]
 
     ###############################
 
@@ -723,101 +1011,61 @@ class CoNLLUImporter(Importer):
 
     ###############################
 
-    def import_file(self, file, metadir=None):
+    def clear_ridges_columns(self, sentences):
+        """
+        RIDGES Corpus: Remove UPOS, DEPS and MISC.
+        Input: Iterator over sentences
+        Output: Iterator over sentences
+        """
+        for sentence in sentences:
+            for tok in sentence.tokens:
+                tok.UPOS = "_"
+                tok.DEPS = "_"
+                tok.MISC = "_"
+            yield sentence
+
+    ###############################
+
+    def import_stream(self, file, metadir=None):
 
         path, filename = os.path.split(file)
 
         #Open file
         conllfile = open(file, mode="r", encoding="utf-8")
+        sentences = self.yield_sentences(self.read_lines(conllfile), self.COLUMNS)
 
-        #column names
-        columns = {"ID" : 0, "FORM" : 1, "LEMMA" : 2, "UPOS" : 3, "XPOS" : 4, \
-                   "FEATS" : 5, "HEAD" : 6, "DEPREL" : 7, "DEPS" : 8, "MISC" : 9}
+        #RIDGES Corpus
+        if "RIDGES" in path:
+            sentences = self.clear_ridges_columns(sentences)
 
         #Create doc object
         doc = Doc(filename)
+        doc.stream_sents(sentences)
 
-        tokens = list()
-        metainfo = dict()
-
-        punct_l= [".", ",", ":", ";", "!", "?", ")", "]"]
-        punct_r= ["(", "["]
-
-        for line in conllfile:
-
-            if not line.strip() and tokens:
-                if not "text" in metainfo:
-                    metainfo["text"]= ""
-                    for tok in tokens:
-                        #first token
-                        if not metainfo["text"]:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        #token is punctuation
-                        elif tok.FORM in punct_l:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        elif tok.FORM in punct_r:
-                            metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                        #other token
-                        else:
-                            if metainfo["text"][-1] in punct_r:
-                                metainfo["text"] = metainfo["text"] + tok.FORM
-                            else:
-                                metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
+        return doc
 
-            #Token line
-            elif line.strip():
-                line = line.strip().split("\t")
-                values = dict()
-                for col in columns:
-                    values[col] = line[columns.get(col)]
-                #RIDGES Corpus
-                if "RIDGES" in path:
-                    values["UPOS"] = "_"
-                    values["DEPS"] = "_"
-                    values["MISC"] = "_"
-                tok = Token(**values)
-                tokens.append(tok)
+    ###############################
 
-        #If file does not end with empty line
-        #save remaining last sentence
-        if tokens:
-                if not "text" in metainfo:
-                    metainfo["text"]= ""
-                    for tok in tokens:
-                        #first token
-                        if not metainfo["text"]:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        #token is punctuation
-                        elif tok.FORM in punct_l:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        elif tok.FORM in punct_r:
-                            metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                        #other token
-                        else:
-                            if metainfo["text"][-1] in punct_r:
-                                metainfo["text"] = metainfo["text"] + tok.FORM
-                            else:
-                                metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
+    def import_file(self, file, metadir=None):
 
-        conllfile.close()
+        doc = self.import_stream(file, metadir)
+        doc.buffer()
 
         return doc
 
 ############################
 
-class TigerImporter(Importer):
+class TigerImporter(CoNLLImporter):
+
+    #Meta data is read from TIGER2.2.doc
+    side_files = True
+
+    COLUMNS = {"ID" : 0, "FORM" : 1, "LEMMA" : 2, "PLEMMA" : 3, "XPOS" : 4, \
+               "PPOS" : 5, "FEATS" : 6, "PFEAT" : 7, "HEAD" : 8, "PHEAD" : 9, \
+               "DEPREL" : 10, "PDEPREL" : 11, "FILLPRED" : 12, "PRED" : 13, "APREDs" : 14}
+    MISSING = None
+    COMMENT = None
+    DETOKENIZER = PROFILES["tiger"]
 
     ###############################
 
@@ -946,6 +1194,23 @@ class TigerImporter(Importer):
 
     ################################
 
+    def finish_sentence(self, tokens, metainfo, n):
+
+        if not "text" in metainfo:
+            metainfo["text"] = self.DETOKENIZER.detokenize([tok.FORM for tok in tokens])
+            for tok in tokens:
+
+                #seperate sent_id(Tiger) and tok_id
+                tiger_id, tok_id = tok.ID.split("_")
+                tok.ID = tok_id
+                if not "sent_id(Tiger)" in metainfo:
+                    metainfo["sent_id(Tiger)"]= tiger_id
+                #sentence type
+                if not "sent_type" in metainfo:
+                    metainfo["sent_type"]= self.sent_types[tiger_id]
+
+    ################################
+
     def import_file(self, file, metadir):
 
         path, filename = os.path.split(file)
@@ -953,115 +1218,23 @@ class TigerImporter(Importer):
         metadocs= file.split("\\conll09")[0] + "\\TIGER2.2.doc"
         metainfo= self.read_metadocs(metadocs, filename)
         self.output_metainfo(metainfo, metadir)
+        self.sent_types = metainfo["sent_types"]
 
         #Open file
         conllfile = open(file, mode="r", encoding="utf-8-sig")
 
-
-        columns = {"ID" : 0, "FORM" : 1, "LEMMA" : 2, "PLEMMA" : 3, "XPOS" : 4, \
-                   "PPOS" : 5, "FEATS" : 6, "PFEAT" : 7, "HEAD" : 8, "PHEAD" : 9, \
-                   "DEPREL" : 10, "PDEPREL" : 11, "FILLPRED" : 12, "PRED" : 13, "APREDs" : 14}
-
         #Create doc object
         doc = Doc(filename)
 
-        tokens = list()
-        types = metainfo["sent_types"]
-
-        punct_l= [".", ",", ":", ";", "!", "?", ")", "]", "''", "/"]
-        punct_r= ["(", "[", "`", "/"]
-
-        for line in conllfile:
-
-            #Empty line = end of sentence
-            if not line.strip() and tokens:
-                if not "text" in metainfo:
-                    metainfo["text"]= ""
-                    for tok in tokens:
-
-                        #seperate sent_id(Tiger) and tok_id
-                        tiger_id, tok_id = tok.ID.split("_")
-                        tok.ID = tok_id
-                        if not "sent_id(Tiger)" in metainfo:
-                            metainfo["sent_id(Tiger)"]= tiger_id
-                        #sentence type
-                        if not "sent_type" in metainfo:
-                            metainfo["sent_type"]= types[tiger_id]
-
-                        #first token
-                        if not metainfo["text"]:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        #token is punctuation
-                        elif tok.FORM in punct_l:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        elif tok.FORM in punct_r:
-                            metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                        #other token
-                        else:
-                            if metainfo["text"][-1] in punct_r:
-                                metainfo["text"] = metainfo["text"] + tok.FORM
-                            else:
-                                metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
-
-            #Token line
-            elif line.strip():
-                line = line.strip().split("\t")
-                values = dict()
-                for col in columns:
-                    values[col] = line[columns.get(col)]
-                tok = Token(**values)
-                tokens.append(tok)
-
-        #If file does not end with empty line
-        #save remaining last sentence
-        if tokens:
-                if not "text" in metainfo:
-                    metainfo["text"]= ""
-                    for tok in tokens:
-
-                        #seperate sent_id(Tiger) and tok_id
-                        tiger_id, tok_id = tok.ID.split("_")
-                        tok.ID = tok_id
-                        if not "sent_id(Tiger)" in metainfo:
-                            metainfo["sent_id(Tiger)"]= tiger_id
-                        #sentence type
-                        if not "sent_type" in metainfo:
-                            metainfo["sent_type"]= types[tiger_id]
-
-                        #first token
-                        if not metainfo["text"]:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        #token is punctuation
-                        elif tok.FORM in punct_l:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        elif tok.FORM in punct_r:
-                            metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                        #other token
-                        else:
-                            if metainfo["text"][-1] in punct_r:
-                                metainfo["text"] = metainfo["text"] + tok.FORM
-                            else:
-                                metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
-
-        conllfile.close()
+        #The meta info of the file is stored with the first sentence
+        for sentence in self.yield_sentences(self.read_lines(conllfile), self.COLUMNS, metainfo):
+            doc.add_sent(sentence)
 
         return doc
 
 ############################
 
-class DTATSVImporter(Importer):
+class DTATSVImporter(WebAnnoImporter):
 
     ###############################
 
@@ -1071,12 +1244,12 @@ class DTATSVImporter(Importer):
 
     ###############################
 
-    def get_columns(self, file, simplify=True):
+    def get_columns(self, lines, simplify=True):
 
         line = ""
         metalines = []
         while not line.strip():
-            line = file.__next__()
+            line = lines.__next__()
             if line.strip().startswith("#"):
                 metalines.append(line.strip())
                 line = ""
@@ -1099,92 +1272,92 @@ class DTATSVImporter(Importer):
 
     ###############################
 
-    def import_file(self, file, metadir=None):
-
-        path, filename = os.path.split(file)
-
-        #Open file
-        tsvfile = open(file, mode="r", encoding="utf-8")
-
-        #Get columns
-        columns = self.get_columns(tsvfile)
-        if not columns:
-            print("ERROR: Missing column information for {0}.".format(filename))
-            return None
+    ###############################
 
-        #Create doc object
-        doc = Doc(filename)
+    def create_token(self, values):
 
-        tokens = list()
-        metainfo = dict()
+        #Layers that older files do not have
+        values.setdefault("Cite", "_")
+        values.setdefault("RelCType", "_")
 
-        for line in tsvfile:
+        return Token(**values)
 
-            #Empty line = end of sentence
-            if not line.strip() and tokens:
+############################
 
-                #Get sent_id(TSV)
-                metainfo["sent_id(TSV)"] = tokens[0].TSVID.split("-")[0]
+class TuebaDzImporter(CoNLLImporter):
 
-                if not "Cite" in columns:
-                    tok.Cite = "_"
-                if not "RelCType" in columns:
-                    tok.RelCType = "_"
+    COLUMNS = {"ID" : 0, "FORM" : 1, "LEMMA" : 2, "UPOS" : 3, "XPOS" : 4, \
+               "FEATS" : 5, "HEAD" : 6, "DEPREL" : 7, "DEPS" : 8, "MISC" : 9}
+    MISSING = None
+    DETOKENIZER = PROFILES["tuebadz"]
 
-                if not "text" in metainfo:
-                    metainfo["text"] = " ".join([tok.FORM for tok in tokens])
+    #Annotations in column MISC
+    ANNOTATIONS = ["TopoField", "Typo", "Morph", "NE", "WSD"]
 
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
+    ###############################
 
-            #Comment line = meta data
-            elif line.strip().startswith("#"):
-                line = line.lstrip("#").strip().split("=")
-                metainfo[line[0].strip().lower()] = "=".join(line[1:]).strip()
+    def __init__(self, **kwargs):
+        for key,val in kwargs.items():
+            self.__dict__[key] = val
 
-            #Token line
-            elif line.strip():
-                line = line.strip().split("\t")
-                values = dict()
-                for col in columns:
-                    try:
-                        values[col] = line[columns.get(col, None)]
-                    except IndexError:
-                        values[col] = "_"
-                tok = Token(**values)
-                tokens.append(tok)
+    ###############################
 
-        #If file does not end with empty line
-        #save remaining last sentence
-        if tokens:
-            #Get sent_id(TSV)
-            metainfo["sent_id(TSV)"] = tokens[0].TSVID.split("-")[0]
-            if not "text" in metainfo:
-                metainfo["text"] = " ".join([tok.FORM for tok in tokens])
-            sentence = Sentence(**metainfo)
-            for tok in tokens:
-                sentence.add_token(tok)
-            tokens.clear()
-            metainfo.clear()
-            doc.add_sent(sentence)
+    def read_comment(self, line, metainfo):
+        #doc_id tueba
+        if "# newdoc" in line:
+            line, doc_id = line.split(" = ")
+            metainfo["doc_id(tueba)"] = doc_id
+        #sent_id
+        elif "# sent_id" in line:
+            line, sent_id = line.split(" = ")
+            metainfo["sent_id(tueba)"] = sent_id
+        #text
+        elif "# text" in line:
+            line, sign, text = line.partition(" = ")
+            metainfo["text"] = text
 
-        tsvfile.close()
+    ###############################
 
-        return doc
+    def create_token(self, values):
 
-############################
+        #splitting column MISC
+        if values["MISC"] == "_":
+            for anno in self.ANNOTATIONS:
+                values[anno] = "_"
+        else:
+            misc = dict()
+            for value in values["MISC"].split("|"):
+                try:
+                    anno, val = value.split("=")
+                    misc[anno] = val
+                #if "=" is missing
+                except:
+                    for anno in self.ANNOTATIONS:
+                            if anno in value:
+                                none, val = value.split(anno)
+                                misc[anno] = val
+            for anno in self.ANNOTATIONS:
+                if anno in misc:
+                    values[anno] = misc[anno]
+                else:
+                    values[anno] = "_"
+            #SpaceAfter = MISC
+            if "SpaceAfter" in misc:
+                values["MISC"] = "SpaceAfter=" + misc["SpaceAfter"]
+            else:
+                values["MISC"] = "_"
 
-class TuebaDzImporter(Importer):
+        return Token(**values)
 
     ###############################
 
-    def __init__(self, **kwargs):
-        for key,val in kwargs.items():
-            self.__dict__[key] = val
+    def finish_sentence(self, tokens, metainfo, n):
+
+        #text correction (punctuation marks)
+        if "text" in metainfo:
+            metainfo["text"] = self.DETOKENIZER.fix_spacing(metainfo["text"])
+        else:
+            metainfo["text"] = self.DETOKENIZER.detokenize([tok.FORM for tok in tokens])
 
     ################################
 
@@ -1197,105 +1370,11 @@ class TuebaDzImporter(Importer):
         #Open file
         conllfile = open(file, mode="r", encoding="utf-8")
 
-
-        columns = {"ID" : 0, "FORM" : 1, "LEMMA" : 2, "UPOS" : 3, "XPOS" : 4, \
-                    "FEATS" : 5, "HEAD" : 6, "DEPREL" : 7, "DEPS" : 8, "MISC" : 9}
-        annotations = ["TopoField", "Typo", "Morph", "NE", "WSD"]
-
         #Create doc object
         doc = Doc(filename)
 
-        tokens = list()
-        metainfo = dict()
-
-        punct_l= [".", ",", ":", ";", "!", "?", ")", "]", "/", '"']
-        punct_r= ["(", "[", "/"]
-
-        for line in conllfile:
-
-            #Empty line = end of sentence
-            if not line.strip() and tokens:
-                #text correction (punctuation marks)
-                x = 0
-                while x < len(metainfo["text"])-1:
-                    if metainfo["text"][x] in punct_r and metainfo["text"][x+1]==" ":
-                        metainfo["text"]= metainfo["text"][:x+1] + metainfo["text"][x+2:]
-                    x += 1
-                y = 1
-                while y < len(metainfo["text"]):
-                    if metainfo["text"][y] in punct_l and metainfo["text"][y-1]==" ":
-                        if metainfo["text"][y] =='"' and y < len(metainfo["text"])-1:
-                            if metainfo["text"][y+1] == " ":
-                                metainfo["text"]= metainfo["text"][:y-1] + metainfo["text"][y:]
-                        else:
-                            metainfo["text"]= metainfo["text"][:y-1] + metainfo["text"][y:]
-                    y += 1
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
-
-            elif line.strip():
-                #doc_id tueba
-                if "# newdoc" in line:
-                    line, doc_id = line.strip().split(" = ")
-                    metainfo["doc_id(tueba)"] = doc_id
-                #sent_id
-                elif "# sent_id" in line:
-                    line, sent_id = line.strip().split(" = ")
-                    metainfo["sent_id(tueba)"] = sent_id
-                #text
-                elif "# text" in line:
-                    line, sign, text = line.strip().partition(" = ")
-                    metainfo["text"] = text
-                #Token line
-                else:
-                    line = line.strip().split("\t")
-                    values = dict()
-                    for col in columns:
-                        values[col] = line[columns.get(col)]
-                    #splitting column MISC
-                    if values["MISC"] == "_":
-                        for anno in annotations:
-                            values[anno] = "_"
-                    else:
-                        misc = dict()
-                        for value in values["MISC"].split("|"):
-                            try:
-                                anno, val = value.split("=")
-                                misc[anno] = val
-                            #if "=" is missing
-                            except:
-                                for anno in annotations:
-                                        if anno in value:
-                                            none, val = value.split(anno)
-                                            misc[anno] = val
-                        for anno in annotations:
-                            if anno in misc:
-                                values[anno] = misc[anno]
-                            else:
-                                values[anno] = "_"
-                        #SpaceAfter = MISC
-                        if "SpaceAfter" in misc:
-                            values["MISC"] = "SpaceAfter=" + misc["SpaceAfter"]
-                        else:
-                            values["MISC"] = "_"
-                    tok = Token(**values)
-                    tokens.append(tok)
-
-        #If file does not end with empty line
-        #save remaining last sentence
-        if tokens:
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
-
-        conllfile.close()
+        for sentence in self.yield_sentences(self.read_lines(conllfile), self.COLUMNS):
+            doc.add_sent(sentence)
 
         return doc
 
@@ -1394,7 +1473,7 @@ class ANNISGridSentenceImporter(Importer):
         IDs = list()
         values_all = dict()
 
-        punct_l= [".", ",", ":", ";", "!", "?"]
+        detokenizer = PROFILES["annis"]
 
         for line in gridfile:
 
@@ -1415,17 +1494,7 @@ class ANNISGridSentenceImporter(Importer):
 
                 #sentence
                 if not "text" in metainfo:
-                    metainfo["text"]= ""
-                    for tok in tokens:
-                        #first token
-                        if not metainfo["text"]:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        #token is punctuation
-                        elif tok.FORM in punct_l:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        #other token
-                        else:
-                            metainfo["text"] = metainfo["text"] + " " + tok.FORM
+                    metainfo["text"] = detokenizer.detokenize([tok.FORM for tok in tokens])
                 sentence = Sentence(**metainfo)
                 for tok in tokens:
                     sentence.add_token(tok)
@@ -1508,17 +1577,7 @@ class ANNISGridSentenceImporter(Importer):
 
                 #sentence
                 if not "text" in metainfo:
-                    metainfo["text"]= ""
-                    for tok in tokens:
-                        #first token
-                        if not metainfo["text"]:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        #token is punctuation
-                        elif tok.FORM in punct_l:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        #other token
-                        else:
-                            metainfo["text"] = metainfo["text"] + " " + tok.FORM
+                    metainfo["text"] = detokenizer.detokenize([tok.FORM for tok in tokens])
                 sentence = Sentence(**metainfo)
                 for tok in tokens:
                     sentence.add_token(tok)
@@ -1532,7 +1591,7 @@ class ANNISGridSentenceImporter(Importer):
 
 ############################
 
-class WebAnnoTopFImporter(Importer):
+class WebAnnoTopFImporter(WebAnnoImporter):
 
     ###############################
 
@@ -1542,7 +1601,7 @@ class WebAnnoTopFImporter(Importer):
 
     ###############################
 
-    def get_columns(self, file):
+    def get_columns(self, lines):
 
         morph = False
         xpos = False
@@ -1555,7 +1614,7 @@ class WebAnnoTopFImporter(Importer):
         #Skip header
         line = ""
         while not line.strip():
-            line = file.__next__()
+            line = lines.__next__()
             if line.strip().startswith("#"):
                 if "MorphologicalFeatures" in line:
                     morph = True
@@ -1593,81 +1652,9 @@ class WebAnnoTopFImporter(Importer):
 
     ###############################
 
-    def import_file(self, file, metadir=None):
-
-        path, filename = os.path.split(file)
-
-        #Open file
-        tsvfile = open(file, mode="r", encoding="utf-8")
-
-        #Get columns
-        columns = self.get_columns(tsvfile)
-        if not columns:
-            print("ERROR: Missing column information for {0}.".format(filename))
-            return None
-
-        #Create doc object
-        doc = Doc(filename)
-
-        tokens = list()
-        metainfo = dict()
-
-        for line in tsvfile:
-
-            #Empty line = end of sentence
-            if not line.strip() and tokens:
-
-                #Get sent_id(TSV)
-                metainfo["sent_id(TSV)"] = tokens[0].TSVID.split("-")[0]
-
-                if not "text" in metainfo:
-                    metainfo["text"] = " ".join([tok.FORM for tok in tokens])
-
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
-
-            #Comment line = meta data
-            elif line.strip().startswith("#"):
-                line = line.lstrip("#").strip().split("=")
-                metainfo[line[0].strip().lower()] = "=".join(line[1:]).strip()
-
-            #Token line
-            elif line.strip():
-                line = line.strip().split("\t")
-                values = dict()
-                for col in columns:
-                    try:
-                        values[col] = line[columns.get(col, None)]
-                    except IndexError:
-                        values[col] = "_"
-                tok = Token(**values)
-                tokens.append(tok)
-
-        #If file does not end with empty line
-        #save remaining last sentence
-        if tokens:
-            #Get sent_id(TSV)
-            metainfo["sent_id(TSV)"] = tokens[0].TSVID.split("-")[0]
-            if not "text" in metainfo:
-                metainfo["text"] = " ".join([tok.FORM for tok in tokens])
-            sentence = Sentence(**metainfo)
-            for tok in tokens:
-                sentence.add_token(tok)
-            tokens.clear()
-            metainfo.clear()
-            doc.add_sent(sentence)
-
-        tsvfile.close()
-
-        return doc
-
 #############################
 
-class WebAnnoTSVImporter(Importer):
+class WebAnnoTSVImporter(WebAnnoImporter):
 
     ###############################
 
@@ -1678,14 +1665,14 @@ class WebAnnoTSVImporter(Importer):
 
     ###############################
 
-    def get_columns(self, file):
+    def get_columns(self, lines):
 
         colnames = ["TSVID", "CharOffset", "FORM", "XPOS", "LEMMA"]
 
         #Skip header
         line = ""
         while not line.strip():
-            line = file.__next__()
+            line = lines.__next__()
             if line.strip().startswith("#"):
                 if "|" in line and not (line.strip().endswith("PosValue") or line.strip().endswith("Lemma|value")):
                     colnames.append(line.split("|")[-1])
@@ -1699,81 +1686,161 @@ class WebAnnoTSVImporter(Importer):
 
     ###############################
 
-    def import_file(self, file, metadir=None):
+#############################
 
-        path, filename = os.path.split(file)
+class CoraXMLImporter(Importer):
+    """
+    Base class for importers of CoraXML files.
 
-        #Open file
-        tsvfile = open(file, mode="r", encoding="utf-8")
+    Lines (layoutinfo) and shift tags refer to ranges of
+    token, tok_dipl or tok_anno IDs (range="t1_d1..t5_d1").
+    The positions of the IDs are looked up in a dictionary,
+    which is built once per file, and each range is resolved
+    to a slice of the list of IDs.
 
-        #Get columns
-        columns = self.get_columns(tsvfile)
-        if not columns:
-            print("ERROR: Missing column information for {0}.".format(filename))
-            return None
+    Subclasses set shifttag_path to the elements
+    the shift tags refer to.
+    """
 
-        #Create doc object
-        doc = Doc(filename)
+    #Elements the shift tags refer to
+    shifttag_path = "./token"
 
-        tokens = list()
-        metainfo = dict()
+    def __init__(self, **kwargs):
+        for key,val in kwargs.items():
+            self.__dict__[key] = val
+
+    ################################
+
+    def get_positions(self, ids):
+        """
+        Input: List of IDs
+        Output: Dictionary with IDs as keys and a list
+                of their positions (ascending) as value.
+        """
+        positions = dict()
+        for i, id in enumerate(ids):
+            if id in positions:
+                positions[id].append(i)
+            else:
+                positions[id] = [i]
+        return positions
+
+    ################################
+
+    def find_position(self, positions, id, start, default):
+        """
+        Input: Dictionary with positions of IDs, ID,
+               position where the search starts, default value
+        Output: First position of the ID at or after start
+                (default if the ID does not occur there)
+        """
+        if id in positions:
+            i = bisect_left(positions[id], start)
+            if i < len(positions[id]):
+                return positions[id][i]
+        return default
+
+    ################################
+
+    def split_range(self, elem):
+        """
+        Input: Element with range attribute ("t1..t5" or "t1")
+        Output: Tuple (first ID, last ID)
+        """
+        try:
+            range_start, range_end = elem.attrib["range"].split("..")
+        except ValueError:
+            range_start = elem.attrib["range"]
+            range_end = elem.attrib["range"]
+        return range_start, range_end
 
-        for line in tsvfile:
+    ################################
 
-            #Empty line = end of sentence
-            if not line.strip() and tokens:
+    def get_tokens(self, root):
+        """
+        Index the token elements by their IDs
+        (instead of searching the tree for each ID).
+        Input: Root (text element)
+        Output: Dictionary with IDs as keys and the (first)
+                token element with this ID as value.
+        """
+        tokens = dict()
+        for token in root.findall("./token"):
+            tokens.setdefault(token.attrib["id"], token)
+        return tokens
 
-                #Get sent_id(TSV)
-                metainfo["sent_id(TSV)"] = tokens[0].TSVID.split("-")[0]
+    ################################
 
-                if not "text" in metainfo:
-                    metainfo["text"] = " ".join([tok.FORM for tok in tokens])
+    def get_locs(self, root):
+        """
+        Lines cover the tok_dipls one after the other,
+        i.e., each line starts after the end of the previous line.
+        Input: Root (text element)
+        Output: Dictionary with tok_dipl IDs (t10_d1, ...) as keys
+                and their corresponding loc ID (2a,11, ...) as value.
+        """
+        #list of all tok_dipl IDs
+        tok_dipls = [tok_dipl.attrib["id"] for tok_dipl in root.findall("./token/tok_dipl")]
+        positions = self.get_positions(tok_dipls)
 
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
+        #dictionary with locs
+        locs = dict()
+        start = 0
+        for line in root.findall("./layoutinfo/line"):
+            if start < len(tok_dipls):
+                _, range_end = self.split_range(line)
+                #range = dipl_ids with same loc
+                #(up to the end of the text if range_end is not found)
+                end = self.find_position(positions, range_end, start, len(tok_dipls)-1)
+                loc = line.attrib["loc"]
+                for id in tok_dipls[start:end+1]:
+                    locs[id] = loc
+                start = end+1
 
-            #Comment line = meta data
-            elif line.strip().startswith("#"):
-                line = line.lstrip("#").strip().split("=")
-                metainfo[line[0].strip().lower()] = "=".join(line[1:]).strip()
+        return locs
 
-            #Token line
-            elif line.strip():
-                line = line.strip().split("\t")
-                values = dict()
-                for col in columns:
-                    try:
-                        values[col] = line[columns.get(col, None)]
-                    except IndexError:
-                        values[col] = "_"
-                tok = Token(**values)
-                tokens.append(tok)
+    ################################
 
-        #If file does not end with empty line
-        #save remaining last sentence
-        if tokens:
-            #Get sent_id(TSV)
-            metainfo["sent_id(TSV)"] = tokens[0].TSVID.split("-")[0]
-            if not "text" in metainfo:
-                metainfo["text"] = " ".join([tok.FORM for tok in tokens])
-            sentence = Sentence(**metainfo)
-            for tok in tokens:
-                sentence.add_token(tok)
-            tokens.clear()
-            metainfo.clear()
-            doc.add_sent(sentence)
+    def get_shifttags(self, root):
+        """
+        Input: Root (text element)
+        Output: Dictionary with IDs of the elements in shifttag_path
+                (t1, t23_m1, ...) as keys and their corresponding
+                shifttags ("quote", "fm", "quote, paren" ...) as value.
+        """
+        #list of all IDs
+        ids = [elem.attrib["id"] for elem in root.findall(self.shifttag_path)]
+        positions = self.get_positions(ids)
 
-        tsvfile.close()
+        #dictionary with shifttags
+        shifttags = dict()
+        for tag in root.findall("./shifttags/"):
+            if ids:
+                range_start, range_end = self.split_range(tag)
+                #range = ids with same shifttag
+                #(up to the end of the text if range_end is not found)
+                start = self.find_position(positions, range_start, 0, None)
+                if start is None:
+                    continue
+                if range_start == range_end:
+                    end = start
+                else:
+                    end = self.find_position(positions, range_end, start+1, len(ids)-1)
+                tag_name = tag.tag
+                for id in ids[start:end+1]:
+                    if id in shifttags:
+                        shifttags[id] = shifttags[id] + ", " + tag_name
+                    else:
+                        shifttags[id] = tag_name
 
-        return doc
+        return shifttags
 
 #############################
 
-class CoraXMLReMImporter(Importer):
+class CoraXMLReMImporter(CoraXMLImporter):
+
+    #Shift tags refer to tok_annos
+    shifttag_path = "./token/tok_anno"
 
     ################################
 
@@ -1834,93 +1901,6 @@ class CoraXMLReMImporter(Importer):
 
     ################################
 
-    def get_locs(self, root):
-        """
-        Input: Root (text element)
-        Output: Dictionary with tok_dipl IDs (t10_d1, ...) as keys
-                and their corresponding loc ID (2a,11, ...) as value.
-        """
-        #list of all tok_dipl IDs
-        tok_dipls = list()
-        for tok_dipl in root.findall("./token/tok_dipl"):
-            dipl_id = tok_dipl.attrib["id"]
-            tok_dipls.append(dipl_id)
-
-        #dictionary with locs
-        lines = root.findall("./layoutinfo/line")
-        range = list()
-        locs = dict()
-        for line in lines:
-            if tok_dipls:
-                try:
-                    range_start, range_end = line.attrib["range"].split("..")
-                except:
-                    #only one tok_dipl for this loc
-                    range_end = line.attrib["range"]
-                #range = list of dipl_ids with same loc
-                for tok_dipl in tok_dipls:
-                    if tok_dipl != range_end:
-                        range.append(tok_dipl)
-                    else:
-                        range.append(tok_dipl)
-                        break
-                loc = line.attrib["loc"]
-                for id in range:
-                    locs[id] = loc
-                    tok_dipls.remove(id)
-                range.clear()
-
-        return locs
-
-    ################################
-
-    def get_shifttags(self, root):
-        """
-        Input: Root (text element)
-        Output: Dictionary with tok_anno IDs (t23_m1, ...) as keys
-                and their corresponding shifttags ("quote", "paren", "quote, paren" ...) as value.
-        """
-        #list of all tok_anno IDs
-        tok_annos = list()
-        for tok_anno in root.findall("./token/tok_anno"):
-            anno_id = tok_anno.attrib["id"]
-            tok_annos.append(anno_id)
-
-        #dictionary with shifttags
-        range = list()
-        shifttags = dict()
-        for tag in root.findall("./shifttags/"):
-            if tok_annos:
-                try:
-                    range_start, range_end = tag.attrib["range"].split("..")
-                except:
-                    range_start = tag.attrib["range"]
-                    range_end = tag.attrib["range"]
-                #range = list of anno_ids with same shifttag
-                n = 0
-                for tok_anno in tok_annos:
-                    if n!= 0:
-                        range.append(tok_anno)
-                        if tok_anno == range_end:
-                            break
-                    elif (tok_anno == range_start) & (tok_anno == range_end):
-                        range.append(tok_anno)
-                        break
-                    elif tok_anno == range_start:
-                        range.append(tok_anno)
-                        n+= 1
-                tag_name = tag.tag
-                for id in range:
-                    if id in shifttags:
-                        shifttags[id] = shifttags[id] + ", " + tag_name
-                    else:
-                        shifttags[id] = tag_name
-                range.clear()
-
-        return shifttags
-
-    ################################
-
     def get_sentences(self, root):
         """
         Input: Root (text element)
@@ -1980,6 +1960,9 @@ class CoraXMLReMImporter(Importer):
         #Get sentences
         sentences = self.get_sentences(root)
 
+        #Look up tokens by ID
+        token_elems = self.get_tokens(root)
+
 
         for sentence in sentences:
 
@@ -1996,7 +1979,7 @@ class CoraXMLReMImporter(Importer):
                         "POS" : "pos", "POS_GEN" : "pos_gen", "INFL" :"infl", "INFLCLASS" :"inflClass", "INFLCLASS_GEN" :"inflClass_gen", "PUNC" : "punc"}
 
                 #TOKEN-FORM+ID
-                token = root.find("./token[@id='{0}']".format(token_id))
+                token = token_elems[token_id]
                 kwargs["TOKEN"] = token.attrib["trans"]
                 kwargs["TOK_ID"] = token_id
 
@@ -2156,8 +2139,10 @@ class CoraXMLReMImporter(Importer):
 
 ############################
 
-class TUEBADSConllImporter(Importer):
+class TUEBADSConllImporter(CoNLLImporter):
 
+    COLUMNS = {"ID" : 0, "FORM" : 1, "XPOS" : 2, "POS:HD" : 3, "SYNTAX" : 4}
+    COMMENT = None
 
     ###############################
 
@@ -2174,60 +2159,18 @@ class TUEBADSConllImporter(Importer):
         #Open file
         conllfile = open(file, mode="r", encoding="utf-8")
 
-        #Get columns
-        columns = {"ID" : 0, "FORM" : 1, "XPOS" : 2, "POS:HD" : 3, "SYNTAX" : 4}
-
         #Create doc object
         doc = Doc(filename)
 
-        tokens = list()
-        metainfo = dict()
-
-        for line in conllfile:
-
-            #Empty line = end of sentence
-            if not line.strip() and tokens:
-                if not "text" in metainfo:
-                    metainfo["text"] = " ".join([tok.FORM for tok in tokens])
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
-
-            #Token line
-            elif line.strip():
-                line = line.strip().split("\t")
-                values = dict()
-                for col in columns:
-                    try:
-                        values[col] = line[columns.get(col, None)]
-                    except IndexError:
-                        values[col] = "_"
-                tok = Token(**values)
-                tokens.append(tok)
-
-        #If file does not end with empty line
-        #save remaining last sentence
-        if tokens:
-            if not "text" in metainfo:
-                metainfo["text"] = " ".join([tok.FORM for tok in tokens])
-            sentence = Sentence(**metainfo)
-            for tok in tokens:
-                sentence.add_token(tok)
-            tokens.clear()
-            metainfo.clear()
+        for sentence in self.yield_sentences(self.read_lines(conllfile), self.COLUMNS):
             doc.add_sent(sentence)
 
-        conllfile.close()
-
         return doc
 
 
 ############################
 
-class CoraXMLAnselmImporter(Importer):
+class CoraXMLAnselmImporter(CoraXMLImporter):
 
     ################################
 
@@ -2280,53 +2223,6 @@ class CoraXMLAnselmImporter(Importer):
 
     ################################
 
-    def get_shifttags(self, root):
-        """
-        Input: Root (text element)
-        Output: Dictionary with tok-IDs (t1, t2, ...) as keys
-                and their corresponding shifttags ("fm", ...) as value.
-        """
-        #list of all tok-IDs
-        tok_ids = list()
-        for tok in root.findall("./token"):
-            tok_id = tok.attrib["id"]
-            tok_ids.append(tok_id)
-
-        #dictionary with shifttags
-        range = list()
-        shifttags = dict()
-        for tag in root.findall("./shifttags/"):
-            if tok_ids:
-                try:
-                    range_start, range_end = tag.attrib["range"].split("..")
-                except:
-                    range_start = tag.attrib["range"]
-                    range_end = tag.attrib["range"]
-                #range = list of tok_ids with same shifttag
-                n = 0
-                for tok_id in tok_ids:
-                    if n!= 0:
-                        range.append(tok_id)
-                        if tok_id == range_end:
-                            break
-                    elif (tok_id == range_start) & (tok_id == range_end):
-                        range.append(tok_id)
-                        break
-                    elif tok_id == range_start:
-                        range.append(tok_id)
-                        n+= 1
-                tag_name = tag.tag
-                for id in range:
-                    if id in shifttags:
-                        shifttags[id] = shifttags[id] + ", " + tag_name
-                    else:
-                        shifttags[id] = tag_name
-                range.clear()
-
-        return shifttags
-
-    ################################
-
     def get_sentences(self, root):
         """
         Input: Root (text element)
@@ -2378,6 +2274,9 @@ class CoraXMLAnselmImporter(Importer):
         #Get sentences
         sentences = self.get_sentences(root)
 
+        #Look up tokens by ID
+        token_elems = self.get_tokens(root)
+
         for sentence in sentences:
 
             sent = Sentence(**{"text" : ""})
@@ -2393,7 +2292,7 @@ class CoraXMLAnselmImporter(Importer):
                         "MORPH" : "morph", "TOKEN_TYPE" : "token_type"}
 
                 #TOKEN-FORM+ID
-                token = root.find("./token[@id='{0}']".format(token_id))
+                token = token_elems[token_id]
                 kwargs["TOKEN"] = token.attrib["trans"]
                 kwargs["TOK_ID"] = token_id
 
@@ -2549,7 +2448,7 @@ class CoraXMLAnselmImporter(Importer):
 
 ############################
 
-class CoraXMLReFBoImporter(Importer):
+class CoraXMLReFBoImporter(CoraXMLImporter):
 
     ################################
 
@@ -2609,53 +2508,6 @@ class CoraXMLReFBoImporter(Importer):
 
     ################################
 
-    def get_shifttags(self, root):
-        """
-        Input: Root (text element)
-        Output: Dictionary with tok-IDs (t1, t2, ...) as keys
-                and their corresponding shifttags ("lat", ...) as value.
-        """
-        #list of all tok-IDs
-        tok_ids = list()
-        for tok in root.findall("./token"):
-            tok_id = tok.attrib["id"]
-            tok_ids.append(tok_id)
-
-        #dictionary with shifttags
-        range = list()
-        shifttags = dict()
-        for tag in root.findall("./shifttags/"):
-            if tok_ids:
-                try:
-                    range_start, range_end = tag.attrib["range"].split("..")
-                except:
-                    range_start = tag.attrib["range"]
-                    range_end = tag.attrib["range"]
-                #range = list of tok_ids with same shifttag
-                n = 0
-                for tok_id in tok_ids:
-                    if n!= 0:
-                        range.append(tok_id)
-                        if tok_id == range_end:
-                            break
-                    elif (tok_id == range_start) & (tok_id == range_end):
-                        range.append(tok_id)
-                        break
-                    elif tok_id == range_start:
-                        range.append(tok_id)
-                        n+= 1
-                tag_name = tag.tag
-                for id in range:
-                    if id in shifttags:
-                        shifttags[id] = shifttags[id] + ", " + tag_name
-                    else:
-                        shifttags[id] = tag_name
-                range.clear()
-
-        return shifttags
-
-    ################################
-
     def get_sentences(self, root):
         """
         Input: Root (text element)
@@ -2731,6 +2583,9 @@ class CoraXMLReFBoImporter(Importer):
         #Get sentences
         sentences = self.get_sentences(root)
 
+        #Look up tokens by ID
+        token_elems = self.get_tokens(root)
+
         for sentence in sentences:
 
             sent = Sentence(**{"text" : ""})
@@ -2746,7 +2601,7 @@ class CoraXMLReFBoImporter(Importer):
                         "MORPH" : "morph", "ANNO_TYPE" : "annoType", "TOKEN_TYPE" : "token_type", "CORA_FLAG" : "cora-flag", "BOUNDARY" : "boundary", "PUNC" : "punc"}
 
                 #TOKEN-FORM+ID
-                token = root.find("./token[@id='{0}']".format(token_id))
+                token = token_elems[token_id]
                 kwargs["TOKEN"] = token.attrib["trans"]
                 kwargs["TOK_ID"] = token_id
 
@@ -2962,132 +2817,229 @@ class TextImporter(Importer):
         #Open file
         textfile = open(file, mode="r", encoding="utf-8")
 
-        #Create doc object
-        doc = Doc(filename)
+        #Create doc object
+        doc = Doc(filename)
+
+        tokens = []
+        for line in textfile:
+            if line.strip():
+                tok = Token(**{"FORM" : line.strip()})
+                tokens.append(tok)
+            else:
+                if tokens:
+                    text = " ".join([tok.FORM for tok in tokens])
+                    sentence = Sentence(**{"text" : text})
+                    for tok in tokens:
+                        sentence.add_token(tok)
+                    tokens.clear()
+                    doc.add_sent(sentence)
+
+        if tokens:
+            text = " ".join([tok.FORM for tok in tokens])
+            sentence = Sentence(**{"text" : text})
+            for tok in tokens:
+                sentence.add_token(tok)
+            tokens.clear()
+            doc.add_sent(sentence)
+
+        textfile.close()
+
+        return doc
+
+#####################################
+
+class TigerGraphImporter(Importer):
+    """
+    Base class for importers of TIGER-XML graphs.
+
+    Reads the terminals of a sentence into tokens and
+    the nonterminals into a tree. Nodes and tokens are
+    looked up in dictionaries, which are built once
+    per sentence.
+
+    Subclasses create the tokens from the terminal elements
+    by implementing create_token(terminal).
+    """
+
+    def __init__(self, **kwargs):
+        for key,val in kwargs.items():
+            self.__dict__[key] = val
+
+    #######################
+
+    def create_token(self, terminal):
+        """
+        Input: Terminal element
+        Output: Token object
+        """
+        pass
+
+    #######################
+
+    def iter_sentence_elements(self, file, body=True):
+        """
+        Read a TIGER-XML file incrementally and yield its <s> elements.
+
+        Each sentence element is removed from the tree after it
+        has been used, so only one sentence is in memory at a time.
+
+        Input: Filename, True if sentences are inside the <body>
+               element, False if they are children of the root
+        Output: Generator of sentence elements
+        """
+        parents = []
+        container = None
+
+        for event, elem in ET.iterparse(file, events=("start", "end")):
+
+            if event == "start":
+                #Sentences are in the first <body> element or in root
+                if container is None:
+                    if not parents and not body:
+                        container = elem
+                    elif len(parents) == 1 and body and elem.tag == "body":
+                        container = elem
+                parents.append(elem)
+
+            else:
+                parents.pop()
+                if parents and parents[-1] is container:
+                    yield elem
+                    #Remove sentence
+                    container.remove(elem)
+
+    #######################
+
+    def read_sentence(self, s_elem):
+        """
+        Read a sentence with syntax tree from an <s> element.
+
+        Input: Sentence element
+        Output: Sentence object
+        """
+        #Get graph element
+        graph = s_elem.find("graph")
+        rootID = graph.attrib["root"]
+
+        discontinuous = graph.attrib.get("discontinuous", False)
+        if discontinuous: discontinuous = True
+
+        #Get terminals and nonterminals
+        terminals = graph.find("terminals")
+        nonterminals = graph.find("nonterminals")
 
-        tokens = []
-        for line in textfile:
-            if line.strip():
-                tok = Token(**{"FORM" : line.strip()})
-                tokens.append(tok)
-            else:
-                if tokens:
-                    text = " ".join([tok.FORM for tok in tokens])
-                    sentence = Sentence(**{"text" : text})
-                    for tok in tokens:
-                        sentence.add_token(tok)
-                    tokens.clear()
-                    doc.add_sent(sentence)
+        tokens = [self.create_token(terminal)
+                  for terminal in sorted(terminals, key=lambda t : int(t.attrib["id"].split("_")[-1]))]
 
-        if tokens:
-            text = " ".join([tok.FORM for tok in tokens])
-            sentence = Sentence(**{"text" : text})
-            for tok in tokens:
-                sentence.add_token(tok)
-            tokens.clear()
-            doc.add_sent(sentence)
+        #Create sentence
+        sentence = Sentence(tokens, **{"sent_id(Tiger)" : s_elem.attrib["id"]})
 
-        textfile.close()
+        #If there are no non-terminals
+        if not len(nonterminals):
+            tree = None
 
-        return doc
+        #Otherwise read syntax tree
+        else:
+            tree = self.read_tree(nonterminals, rootID, sentence.tokens)
 
-#####################################
+        sentence.tree = tree
+        sentence.discontinuous_tree = discontinuous
 
-class TigerXMLImporter(Importer):
+        if not "text" in sentence.__dict__:
+            sentence.text = " ".join([tok.FORM for tok in sentence.tokens])
 
-    def __init__(self, **kwargs):
-        for key,val in kwargs.items():
-            self.__dict__[key] = val
+        return sentence
 
     #######################
 
-    def import_file(self, file, metadir=None):
-
-        path, filename = os.path.split(file)
+    def read_tree(self, nonterminals, rootID, tokens):
+        """
+        Build the syntax tree of a sentence.
 
-        #Read xml tree
-        tree = ET.parse(file)
-        root = tree.getroot()
+        Input: Nonterminals element, ID of the root node,
+               list of tokens with TigerID
+        Output: Tree object
+        """
+        #Dictionaries {ID : element} and {TigerID : token}
+        #(first one wins as with find())
+        nodes = dict()
+        for nt in nonterminals:
+            nodes.setdefault(nt.attrib.get("id"), nt)
+        toks = dict()
+        for tok in tokens:
+            toks.setdefault(tok.TigerID, tok)
+
+        ###########################
+
+        def read_node(node, tree):
+            for edge in node.findall("edge"):
+                edgeID = edge.attrib["idref"]
+
+                #Non-terminal
+                if len(edgeID.split("_")[1]) == 3 and int(edgeID.split("_")[1][0]) >= 5:
+                    nonterminal_node = nodes[edgeID]
+                    nonterminal_child = Tree(edgeID, nonterminal_node.attrib["cat"], edge.attrib["label"])
+                    read_node(nonterminal_node, nonterminal_child)
+                    tree.add_child(nonterminal_child)
+
+                #Terminal
+                else:
+                    terminal_child = Tree(edgeID, "Tok", edge.attrib["label"],
+                                          **{"token" : toks[edgeID]})
+                    tree.add_child(terminal_child)
 
-        doc = Doc(filename)
+        ############################
 
-        for s_elem in root:
-            #Get graph element
-            graph = s_elem.find("graph")
-            rootID = graph.attrib["root"]
-            discontinuous = graph.attrib.get("discontinuous", False)
-            if discontinuous: discontinuous = True
-
-            #Get terminals and nonterminals
-            terminals = graph.find("terminals")
-            nonterminals = graph.find("nonterminals")
-
-            tokens = []
-
-            for terminal in sorted(terminals, key=lambda t : int(t.attrib["id"].split("_")[-1])):
-
-                #Get annotations
-                pos = terminal.attrib["pos"]
-                if pos == "--": pos = "_"
-                lemma = terminal.attrib["lemma"]
-                if lemma == "--": lemma = "_"
-                feats = ""
-                for feat in ("number", "degree", "case", "gender", "person", "mood", "tense"):
-                    if terminal.attrib[feat] != "--":
-                        if feats:
-                            feats += "|"+feat+"="+terminal.attrib[feat]
-                        else:
-                            feats = feat+"="+terminal.attrib[feat]
-                if not feats: feats = "_"
+        root_node = nodes[rootID]
+        tree = Tree(rootID, root_node.attrib["cat"], "--")
+        read_node(root_node, tree)
 
-                #Create token
-                token = Token(**{"FORM" : terminal.attrib["word"],
-                                 "LEMMA" : lemma, "XPOS" : pos,
-                                 "FEATS" : feats,
-                                 "TigerID" : terminal.attrib["id"]})
-                tokens.append(token)
+        return tree
 
-            #Create sentence
-            sentence = Sentence(tokens, **{"sent_id(Tiger)" : s_elem.attrib["id"]})
+###################################
 
-            #If there are no non-terminals
-            if not len(nonterminals):
-                tree = None
+class TigerXMLImporter(TigerGraphImporter):
 
-            #Otherwise read syntax tree
-            else:
-                root_node = nonterminals.find("nt[@id='"+rootID+"']")
-                tree = Tree(rootID, root_node.attrib["cat"], "--")
+    def __init__(self, **kwargs):
+        for key,val in kwargs.items():
+            self.__dict__[key] = val
 
-                ###########################
+    #######################
 
-                def read_tree(node, tree):
-                    for edge in node.findall("edge"):
-                        edgeID = edge.attrib["idref"]
+    def create_token(self, terminal):
+
+        #Get annotations
+        pos = terminal.attrib["pos"]
+        if pos == "--": pos = "_"
+        lemma = terminal.attrib["lemma"]
+        if lemma == "--": lemma = "_"
+        feats = ""
+        for feat in ("number", "degree", "case", "gender", "person", "mood", "tense"):
+            if terminal.attrib[feat] != "--":
+                if feats:
+                    feats += "|"+feat+"="+terminal.attrib[feat]
+                else:
+                    feats = feat+"="+terminal.attrib[feat]
+        if not feats: feats = "_"
 
-                        #Non-terminal
-                        if len(edgeID.split("_")[1]) == 3 and int(edgeID.split("_")[1][0]) >= 5:
-                            nonterminal_node = nonterminals.find("nt[@id='"+edgeID+"']")
-                            nonterminal_child = Tree(edgeID, nonterminal_node.attrib["cat"], edge.attrib["label"])
-                            read_tree(nonterminal_node, nonterminal_child)
-                            tree.add_child(nonterminal_child)
+        #Create token
+        token = Token(**{"FORM" : terminal.attrib["word"],
+                         "LEMMA" : lemma, "XPOS" : pos,
+                         "FEATS" : feats,
+                         "TigerID" : terminal.attrib["id"]})
+        return token
 
-                        #Terminal
-                        else:
-                            terminal_child = Tree(edgeID, "Tok", edge.attrib["label"],
-                                                **{"token" : [tok for tok in sentence.tokens if tok.TigerID == edgeID][0]})
-                            tree.add_child(terminal_child)
+    #######################
 
-                ############################
+    def import_file(self, file, metadir=None):
 
-                read_tree(root_node, tree)
+        path, filename = os.path.split(file)
 
-            sentence.tree = tree
-            sentence.discontinuous_tree = discontinuous
+        doc = Doc(filename)
 
-            if not "text" in sentence.__dict__:
-                sentence.text = " ".join([tok.FORM for tok in sentence.tokens])
-            doc.add_sent(sentence)
+        #Read xml file sentence by sentence
+        for s_elem in self.iter_sentence_elements(file, body=False):
+            doc.add_sent(self.read_sentence(s_elem))
 
         return doc
 
@@ -3095,6 +3047,9 @@ class TigerXMLImporter(Importer):
 
 class XMLKaJuKImporter(Importer):
 
+    #Meta data is read from the TEI headers
+    side_files = True
+
     namespaces = {"default" : "http://www.tei-c.org/ns/1.0"}
 
     ################################
@@ -3960,7 +3915,7 @@ class XMLKaJuKImporter(Importer):
 
 ###################################
 
-class MercuriusTigerXMLImporter(Importer):
+class MercuriusTigerXMLImporter(TigerGraphImporter):
 
     def __init__(self, **kwargs):
         for key,val in kwargs.items():
@@ -3968,91 +3923,37 @@ class MercuriusTigerXMLImporter(Importer):
 
     #######################
 
-    def import_file(self, file, metadir=None):
-
-        path, filename = os.path.split(file)
-
-        #Read xml tree
-        tree = ET.parse(file)
-        root = tree.getroot()
-
-        doc = Doc(filename)
-
-        for s_elem in root.find("body"):
-            #Get graph element
-            graph = s_elem.find("graph")
-            rootID = graph.attrib["root"]
+    def create_token(self, terminal):
 
-            discontinuous = graph.attrib.get("discontinuous", False)
-            if discontinuous: discontinuous = True
+        #Get annotations
+        pos = terminal.attrib["pos"]
+        if pos == "--": pos = "_"
+        feats = terminal.attrib["morph"].replace("--", "_")
 
-            #Get terminals and nonterminals
-            terminals = graph.find("terminals")
-            nonterminals = graph.find("nonterminals")
+        #Create token
+        token = Token(**{"FORM" : terminal.attrib["word"],
+                         "POS" : pos,
+                         "FEATS" : feats,
+                         "TigerID" : terminal.attrib["id"]})
+        return token
 
-            tokens = []
-
-            for terminal in sorted(terminals, key=lambda t : int(t.attrib["id"].split("_")[-1])):
-
-                #Get annotations
-                pos = terminal.attrib["pos"]
-                if pos == "--": pos = "_"
-                feats = terminal.attrib["morph"].replace("--", "_")
-
-                #Create token
-                token = Token(**{"FORM" : terminal.attrib["word"],
-                                 "POS" : pos,
-                                 "FEATS" : feats,
-                                 "TigerID" : terminal.attrib["id"]})
-                tokens.append(token)
-
-            #Create sentence
-            sentence = Sentence(tokens, **{"sent_id(Tiger)" : s_elem.attrib["id"]})
-
-            #If there are no non-terminals
-            if not len(nonterminals):
-                tree = None
-
-            #Otherwise read syntax tree
-            else:
-                root_node = nonterminals.find("nt[@id='"+rootID+"']")
-                tree = Tree(rootID, root_node.attrib["cat"], "--")
-
-                ###########################
-
-                def read_tree(node, tree):
-                    for edge in node.findall("edge"):
-                        edgeID = edge.attrib["idref"]
-
-                        #Non-terminal
-                        if len(edgeID.split("_")[1]) == 3 and int(edgeID.split("_")[1][0]) >= 5:
-                            nonterminal_node = nonterminals.find("nt[@id='"+edgeID+"']")
-                            nonterminal_child = Tree(edgeID, nonterminal_node.attrib["cat"], edge.attrib["label"])
-                            read_tree(nonterminal_node, nonterminal_child)
-                            tree.add_child(nonterminal_child)
-
-                        #Terminal
-                        else:
-                            terminal_child = Tree(edgeID, "Tok", edge.attrib["label"],
-                                            **{"token" : [tok for tok in sentence.tokens if tok.TigerID == edgeID][0]})
-                            tree.add_child(terminal_child)
+    #######################
 
-                ############################
+    def import_file(self, file, metadir=None):
 
-                read_tree(root_node, tree)
+        path, filename = os.path.split(file)
 
-            sentence.tree = tree
-            sentence.discontinuous_tree = discontinuous
+        doc = Doc(filename)
 
-            if not "text" in sentence.__dict__:
-                sentence.text = " ".join([tok.FORM for tok in sentence.tokens])
-            doc.add_sent(sentence)
+        #Read xml file sentence by sentence
+        for s_elem in self.iter_sentence_elements(file):
+            doc.add_sent(self.read_sentence(s_elem))
 
         return doc
 
 #####################################
 
-class ReFUPImporter(Importer):
+class ReFUPImporter(TigerGraphImporter):
 
     def __init__(self, **kwargs):
         for key,val in kwargs.items():
@@ -4060,88 +3961,34 @@ class ReFUPImporter(Importer):
 
     #######################
 
-    def import_file(self, file, metadir=None):
-
-        path, filename = os.path.split(file)
-
-        #Read xml tree
-        tree = ET.parse(file)
-        root = tree.getroot()
-
-        doc = Doc(filename)
-
-        for s_elem in root.find("body"):
-            #Get graph element
-            graph = s_elem.find("graph")
-            rootID = graph.attrib["root"]
-
-            discontinuous = graph.attrib.get("discontinuous", False)
-            if discontinuous: discontinuous = True
-
-            #Get terminals and nonterminals
-            terminals = graph.find("terminals")
-            nonterminals = graph.find("nonterminals")
-
-            tokens = []
-
-            for terminal in sorted(terminals, key=lambda t : int(t.attrib["id"].split("_")[-1])):
-
-                #Get annotations
-                pos = terminal.attrib["pos"]
-                if pos == "--": pos = "_"
-                if "morph" in terminal.attrib:
-                    feats = terminal.attrib["morph"].replace("--", "_")
-                else:
-                    feats = "_"
-
-                #Create token
-                token = Token(**{"FORM" : terminal.attrib["word"],
-                                 "POS" : pos,
-                                 "FEATS" : feats,
-                                 "TigerID" : terminal.attrib["id"]})
-                tokens.append(token)
-
-            #Create sentence
-            sentence = Sentence(tokens, **{"sent_id(Tiger)" : s_elem.attrib["id"]})
-
-            #If there are no non-terminals
-            if not len(nonterminals):
-                tree = None
+    def create_token(self, terminal):
 
-            #Otherwise read syntax tree
-            else:
-                root_node = nonterminals.find("nt[@id='"+rootID+"']")
-                tree = Tree(rootID, root_node.attrib["cat"], "--")
-
-                ###########################
-
-                def read_tree(node, tree):
-                    for edge in node.findall("edge"):
-                        edgeID = edge.attrib["idref"]
+        #Get annotations
+        pos = terminal.attrib["pos"]
+        if pos == "--": pos = "_"
+        if "morph" in terminal.attrib:
+            feats = terminal.attrib["morph"].replace("--", "_")
+        else:
+            feats = "_"
 
-                        #Non-terminal
-                        if len(edgeID.split("_")[1]) == 3 and int(edgeID.split("_")[1][0]) >= 5:
-                            nonterminal_node = nonterminals.find("nt[@id='"+edgeID+"']")
-                            nonterminal_child = Tree(edgeID, nonterminal_node.attrib["cat"], edge.attrib["label"])
-                            read_tree(nonterminal_node, nonterminal_child)
-                            tree.add_child(nonterminal_child)
+        #Create token
+        token = Token(**{"FORM" : terminal.attrib["word"],
+                         "POS" : pos,
+                         "FEATS" : feats,
+                         "TigerID" : terminal.attrib["id"]})
+        return token
 
-                        #Terminal
-                        else:
-                            terminal_child = Tree(edgeID, "Tok", edge.attrib["label"],
-                                            **{"token" : [tok for tok in sentence.tokens if tok.TigerID == edgeID][0]})
-                            tree.add_child(terminal_child)
+    #######################
 
-                ############################
+    def import_file(self, file, metadir=None):
 
-                read_tree(root_node, tree)
+        path, filename = os.path.split(file)
 
-            sentence.tree = tree
-            sentence.discontinuous_tree = discontinuous
+        doc = Doc(filename)
 
-            if not "text" in sentence.__dict__:
-                sentence.text = " ".join([tok.FORM for tok in sentence.tokens])
-            doc.add_sent(sentence)
+        #Read xml file sentence by sentence
+        for s_elem in self.iter_sentence_elements(file):
+            doc.add_sent(self.read_sentence(s_elem))
 
         return doc
 
@@ -4489,7 +4336,7 @@ class XMLFnhdCImporter(Importer):
 
 #############################
 
-class CoNLL2000Importer(Importer):
+class CoNLL2000Importer(CoNLLImporter):
 
     COLUMNS = {"FORM" : 0, "XPOS" : 1, "CHUNK" : 2}
 
@@ -4501,7 +4348,20 @@ class CoNLL2000Importer(Importer):
 
     ###############################
 
-    def import_file(self, file, metadir=None):
+    def read_comment(self, line, metainfo):
+        #Skip comment lines
+        pass
+
+    ###############################
+
+    def split(self, line):
+        if "\t" in line:
+            return line.split("\t")
+        return line.split(" ")
+
+    ###############################
+
+    def import_stream(self, file, metadir=None):
 
         path, filename = os.path.split(file)
 
@@ -4510,65 +4370,29 @@ class CoNLL2000Importer(Importer):
 
         #Create doc object
         doc = Doc(filename)
+        doc.stream_sents(self.yield_sentences(self.read_lines(conllfile), self.COLUMNS))
 
-        tokens = list()
-        metainfo = dict()
-
-        for line in conllfile:
-
-            #Empty line = end of sentence
-            if not line.strip() and tokens:
-                if not "text" in metainfo:
-                    metainfo["text"] = " ".join([tok.FORM for tok in tokens])
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                doc.add_sent(sentence)
-
-            #Skip comment lines
-            elif line.strip().startswith("#"):
-                continue
+        return doc
 
-            #Token line
-            elif line.strip():
-                if "\t" in line.strip():
-                    line = line.strip().split("\t")
-                else:
-                    line = line.strip().split(" ")
-                values = dict()
-                for col in self.COLUMNS:
-                    try:
-                        values[col] = line[self.COLUMNS.get(col, None)]
-                    except IndexError:
-                        values[col] = "_"
-                tok = Token(**values)
-                tokens.append(tok)
+    ###############################
 
-        #If file does not end with empty line
-        #save remaining last sentence
-        if tokens:
-            if not "text" in metainfo:
-                metainfo["text"] = " ".join([tok.FORM for tok in tokens])
-            sentence = Sentence(**metainfo)
-            for tok in tokens:
-                sentence.add_token(tok)
-            tokens.clear()
-            metainfo.clear()
-            doc.add_sent(sentence)
+    def import_file(self, file, metadir=None):
 
-        conllfile.close()
+        doc = self.import_stream(file, metadir)
+        doc.buffer()
 
         return doc
 
 ############################
 
-class SDeWaCIteratorImporter(Importer):
+class SDeWaCIteratorImporter(CoNLLImporter):
 
     COLUMNS = {"Joined_ID" : 0, "FORM" : 1, "UNK1" : 2, "LEMMA" : 3, "UPOS" : 4,
                "XPOS" : 5, "UNK2" : 6, "FEATS" : 7, "UNK3" : 8, "HEAD" : 9, "UNK4" : 10,
                "DEPREL" : 11, "UNK5" : 12, "UNK6" : 13}
+    MISSING = None
+    COMMENT = None
+    DETOKENIZER = PROFILES["default"]
 
     ###############################
 
@@ -4578,90 +4402,24 @@ class SDeWaCIteratorImporter(Importer):
 
     ###############################
 
-    def yield_sentences(self, conllfile):
+    def create_token(self, values):
+        values["ID"] = values["Joined_ID"].split("_")[-1]
+        return Token(**values)
 
-        tokens = list()
-        metainfo = dict()
-
-        punct_l= [".", ",", ":", ";", "!", "?", ")", "]"]
-        punct_r= ["(", "["]
-
-        sent_id = 1
-
-        for line in conllfile:
-
-            if not line.strip() and tokens:
-                if not "text" in metainfo:
-                    metainfo["text"]= ""
-                    for tok in tokens:
-                        #first token
-                        if not metainfo["text"]:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        #token is punctuation
-                        elif tok.FORM in punct_l:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        elif tok.FORM in punct_r:
-                            metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                        #other token
-                        else:
-                            if metainfo["text"][-1] in punct_r:
-                                metainfo["text"] = metainfo["text"] + tok.FORM
-                            else:
-                                metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                if not "sent_id(SDeWaC)" in metainfo:
-                    metainfo["sent_id(SDeWaC)"] = tokens[0].Joined_ID.split("_")[0]
-                if not "sent_id" in metainfo:
-                    metainfo["sent_id"] = str(sent_id)
-                    sent_id += 1
-                sentence = Sentence(**metainfo)
-                for tok in tokens:
-                    sentence.add_token(tok)
-                tokens.clear()
-                metainfo.clear()
-                yield sentence
+    ###############################
 
-            #Token line
-            elif line.strip():
-                line = line.strip().split("\t")
-                values = dict()
-                for col in self.COLUMNS:
-                    values[col] = line[self.COLUMNS.get(col)]
-                values["ID"] = values["Joined_ID"].split("_")[-1]
-                tok = Token(**values)
-                tokens.append(tok)
+    def finish_sentence(self, tokens, metainfo, n):
 
-        #If file does not end with empty line
-        #save remaining last sentence
-        if tokens:
-            if not "text" in metainfo:
-                metainfo["text"]= ""
-                for tok in tokens:
-                    #first token
-                    if not metainfo["text"]:
-                        metainfo["text"] = metainfo["text"] + tok.FORM
-                    #token is punctuation
-                    elif tok.FORM in punct_l:
-                        metainfo["text"] = metainfo["text"] + tok.FORM
-                    elif tok.FORM in punct_r:
-                        metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                    #other token
-                    else:
-                        if metainfo["text"][-1] in punct_r:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        else:
-                            metainfo["text"] = metainfo["text"] + " " + tok.FORM
-            sentence = Sentence(**metainfo)
-            for tok in tokens:
-                sentence.add_token(tok)
-            tokens.clear()
-            metainfo.clear()
-            yield sentence
+        super().finish_sentence(tokens, metainfo, n)
 
-        conllfile.close()
+        if not "sent_id(SDeWaC)" in metainfo:
+            metainfo["sent_id(SDeWaC)"] = tokens[0].Joined_ID.split("_")[0]
+        if not "sent_id" in metainfo:
+            metainfo["sent_id"] = str(n)
 
     ###############################
 
-    def import_file(self, file, metadir=None):
+    def import_stream(self, file, metadir=None):
 
         path, filename = os.path.split(file)
 
@@ -4670,8 +4428,16 @@ class SDeWaCIteratorImporter(Importer):
 
         #Create doc object
         doc = Doc(filename)
+        doc.stream_sents(self.yield_sentences(self.read_lines(conllfile), self.COLUMNS))
+
+        return doc
+
+    ###############################
+
+    def import_file(self, file, metadir=None):
 
-        doc.sentences = self.yield_sentences(conllfile)
+        doc = self.import_stream(file, metadir)
+        doc.buffer()
 
         return doc
 
@@ -4679,6 +4445,9 @@ class SDeWaCIteratorImporter(Importer):
 
 class GerManCCoNLLImporter(Importer):
 
+    #Meta data is read from the TEI headers
+    side_files = True
+
     namespaces = {"default" : "http://www.tei-c.org/ns/1.0"}
 
     ################################
@@ -4919,29 +4688,13 @@ class GerManCCoNLLImporter(Importer):
         tokens = list()
         metainfo = dict()
 
-        punct_l= [".", ",", ":", ";", "!", "?", ")", "]", "'"]
-        punct_r= ["(", "["]
+        detokenizer = PROFILES["germanc"]
 
         for line in conllfile:
 
             if not line.strip() and tokens:
                 if not "text" in metainfo:
-                    metainfo["text"]= ""
-                    for tok in tokens:
-                        #first token
-                        if not metainfo["text"]:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        #token is punctuation
-                        elif tok.FORM in punct_l:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        elif tok.FORM in punct_r:
-                            metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                        #other token
-                        else:
-                            if metainfo["text"][-1] in punct_r:
-                                metainfo["text"] = metainfo["text"] + tok.FORM
-                            else:
-                                metainfo["text"] = metainfo["text"] + " " + tok.FORM
+                    metainfo["text"] = detokenizer.detokenize([tok.FORM for tok in tokens])
                 sentence = Sentence(**metainfo)
                 for tok in tokens:
                     sentence.add_token(tok)
@@ -5012,22 +4765,7 @@ class GerManCCoNLLImporter(Importer):
         #save remaining last sentence
         if tokens:
                 if not "text" in metainfo:
-                    metainfo["text"]= ""
-                    for tok in tokens:
-                        #first token
-                        if not metainfo["text"]:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        #token is punctuation
-                        elif tok.FORM in punct_l:
-                            metainfo["text"] = metainfo["text"] + tok.FORM
-                        elif tok.FORM in punct_r:
-                            metainfo["text"] = metainfo["text"] + " " + tok.FORM
-                        #other token
-                        else:
-                            if metainfo["text"][-1] in punct_r:
-                                metainfo["text"] = metainfo["text"] + tok.FORM
-                            else:
-                                metainfo["text"] = metainfo["text"] + " " + tok.FORM
+                    metainfo["text"] = detokenizer.detokenize([tok.FORM for tok in tokens])
                 sentence = Sentence(**metainfo)
                 for tok in tokens:
                     sentence.add_token(tok)
@@ -5088,7 +4826,10 @@ class TuebaDZPTBImporter(Importer):
 
 ###########################
 
-class DDBTigerNegraImporter(Importer):
+class DDBTigerNegraImporter(TigerGraphImporter):
+
+    #Meta data is read from the TEI headers
+    side_files = True
 
     namespaces = {"default" : "http://www.tei-c.org/ns/1.0"}
 
@@ -5287,6 +5028,31 @@ class DDBTigerNegraImporter(Importer):
 
     #######################
 
+    def create_token(self, terminal):
+
+        #Get annotations
+        pos = terminal.attrib["pos"]
+        if pos == "--": pos = "_"
+        feats = terminal.attrib["morph"]
+        if feats == "--": feats = "_"
+
+        #Create token
+        token = Token(**{"FORM" : terminal.attrib["word"],
+                         "POS" : pos,
+                         "XPOS" : pos,
+                         "FEATS" : feats,
+                         "TigerID" : terminal.attrib["id"]})
+
+        #XPOS tag
+        xpos_tags = {"#": "$(", ",": "$,", ":": "$.", ";": "$.", ".": "$.", "enti": "KON", "auuar": "ADV"}
+        if token.XPOS == "_":
+            if "*" in token.FORM: token.XPOS = "$("
+            else: token.XPOS = xpos_tags.get(token.FORM, "_")
+
+        return token
+
+    #######################
+
     def import_file(self, file, metadir):
 
         path, filename = os.path.split(file)
@@ -5303,101 +5069,29 @@ class DDBTigerNegraImporter(Importer):
         metainfo["filename"] = os.path.splitext(filename)[0]
         self.output_metainfo(metainfo, metadir)
 
-        #Read xml tree
-        tree = ET.parse(file)
-        root = tree.getroot()
-
         doc = Doc(filename)
 
         #documents in Negra-format
         if "Hench" in filename:
 
-            for s_elem in root.find("body"):
-                #Get graph element
-                graph = s_elem.find("graph")
-                rootID = graph.attrib["root"]
-
-                discontinuous = graph.attrib.get("discontinuous", False)
-                if discontinuous: discontinuous = True
-
-                #Get terminals and nonterminals
-                terminals = graph.find("terminals")
-                nonterminals = graph.find("nonterminals")
-
-                tokens = []
-
-                for terminal in sorted(terminals, key=lambda t : int(t.attrib["id"].split("_")[-1])):
-
-                    #Get annotations
-                    pos = terminal.attrib["pos"]
-                    if pos == "--": pos = "_"
-                    feats = terminal.attrib["morph"]
-                    if feats == "--": feats = "_"
-
-                    #Create token
-                    token = Token(**{"FORM" : terminal.attrib["word"],
-                                     "POS" : pos,
-                                     "XPOS" : pos,
-                                     "FEATS" : feats,
-                                     "TigerID" : terminal.attrib["id"]})
-
-                    #XPOS tag
-                    xpos_tags = {"#": "$(", ",": "$,", ":": "$.", ";": "$.", ".": "$.", "enti": "KON", "auuar": "ADV"}
-                    if token.XPOS == "_":
-                        if "*" in token.FORM: token.XPOS = "$("
-                        else: token.XPOS = xpos_tags.get(token.FORM, "_")
-                    tokens.append(token)
-
-                #Create sentence
-                sentence = Sentence(tokens, **{"sent_id(Tiger)" : s_elem.attrib["id"]})
-
-                #If there are no non-terminals
-                if not len(nonterminals):
-                    tree = None
-
-                #Otherwise read syntax tree
-                else:
-                    root_node = nonterminals.find("nt[@id='"+rootID+"']")
-                    tree = Tree(rootID, root_node.attrib["cat"], "--")
-
-                    ###########################
-
-                    def read_tree(node, tree):
-                        for edge in node.findall("edge"):
-                            edgeID = edge.attrib["idref"]
-
-                            #Non-terminal
-                            if len(edgeID.split("_")[1]) == 3 and int(edgeID.split("_")[1][0]) >= 5:
-                                nonterminal_node = nonterminals.find("nt[@id='"+edgeID+"']")
-                                nonterminal_child = Tree(edgeID, nonterminal_node.attrib["cat"], edge.attrib["label"])
-                                read_tree(nonterminal_node, nonterminal_child)
-                                tree.add_child(nonterminal_child)
-
-                            #Terminal
-                            else:
-                                terminal_child = Tree(edgeID, "Tok", edge.attrib["label"],
-                                                **{"token" : [tok for tok in sentence.tokens if tok.TigerID == edgeID][0]})
-                                tree.add_child(terminal_child)
-
-                    ############################
-
-                    read_tree(root_node, tree)
-
-                sentence.tree = tree
-                sentence.__dict__["PTBstring"]= tree.to_string()
-                sentence.discontinuous_tree = discontinuous
-
-                if not "text" in sentence.__dict__:
-                    sentence.text = " ".join([tok.FORM for tok in sentence.tokens])
+            #Read xml file sentence by sentence
+            for s_elem in self.iter_sentence_elements(file):
+                sentence = self.read_sentence(s_elem)
+                sentence.__dict__["PTBstring"]= sentence.tree.to_string()
                 doc.add_sent(sentence)
 
         #documents in other format
         else:
+            #Read xml tree
+            tree = ET.parse(file)
+            root = tree.getroot()
+
             columns = ["POS", "CAT", "TENSE", "CONTEXT", "ASPECT", "VOICE"]
 
             #dictionary with IDs as keys and corresponding annotation-dictionaries as values
             tokens = dict()
             body = root.find("basic-body")
+            exb_timeline = EXBTimeline(body.find("common-timeline"))
             for tier in body.findall("tier"):
 
                 #get annotations
@@ -5411,8 +5105,8 @@ class DDBTigerNegraImporter(Importer):
                     if start not in tokens: tokens[start] = {cat : anno}
                     else:
                         if cat == "cat": anno += "[" + start + "-" + included_end + "]"
-                        for id in range(int(start[1:]), int(end[1:])):
-                            tokens["T" + str(id)][cat] = anno
+                        for id in exb_timeline.span(start, end):
+                            tokens[id][cat] = anno
 
             sent = Sentence(**{"text": ""})
             id = 1
@@ -5467,8 +5161,45 @@ class DDBTigerNegraImporter(Importer):
 
 ############################
 
+class EXBTimeline(object):
+    """
+    Common timeline of an EXMARaLDA (EXB) file.
+
+    The position of each timeline ID is looked up in a dictionary,
+    which is built once per file, so an event is resolved to the
+    timeline IDs it covers in O(length of the event).
+    """
+
+    def __init__(self, timeline, **kwargs):
+        """
+        Input: common-timeline element
+        """
+        #Timeline IDs in document order (without duplicates)
+        self.ids = list(dict.fromkeys(tli.attrib["id"] for tli in timeline))
+        self.positions = {id : i for i, id in enumerate(self.ids)}
+        for key,val in kwargs.items():
+            self.__dict__[key] = val
+
+    ################################
+
+    def span(self, start, end):
+        """
+        Input: Start and end ID of an event
+        Output: List of timeline IDs from start up to (excluding) end.
+                Empty if start is unknown or end is not after start,
+                up to the last ID if end is unknown.
+        """
+        if start not in self.positions:
+            return []
+        return self.ids[self.positions[start]:self.positions.get(end, len(self.ids))]
+
+###########################
+
 class FuerstinnenEXBImporter(Importer):
 
+    #Meta data is read from the TEI headers
+    side_files = True
+
     namespaces = {"default" : "http://www.tei-c.org/ns/1.0"}
 
     ################################
@@ -5652,9 +5383,9 @@ class FuerstinnenEXBImporter(Importer):
         body = root.find("basic-body")
 
         #timeline-IDs
-        timelines = body.find("common-timeline")
-        for timeline in timelines:
-            tokens[timeline.attrib["id"]] = dict()
+        exb_timeline = EXBTimeline(body.find("common-timeline"))
+        for timeline in exb_timeline.ids:
+            tokens[timeline] = dict()
 
         #text+annotations
         for tier in body.findall("tier"):
@@ -5665,15 +5396,8 @@ class FuerstinnenEXBImporter(Importer):
                 end = event.attrib["end"]
                 anno = event.text
                 #save annotations in dictionary
-                started = 0
-                for timeline in tokens:
-                    if timeline == end:
-                        break
-                    elif started == 1:
-                        tokens[timeline][cat] = anno
-                    elif timeline == start:
-                        tokens[timeline][cat] = anno
-                        started = 1
+                for timeline in exb_timeline.span(start, end):
+                    tokens[timeline][cat] = anno
 
         sent = Sentence(**{"text": ""})
         id = 1
@@ -5719,6 +5443,9 @@ class FuerstinnenEXBImporter(Importer):
 
 class GraphVarEXBImporter(Importer):
 
+    #Meta data is read from the .xml file next to the input file
+    side_files = True
+
     ################################
 
     def __init__(self, **kwargs):
@@ -5792,8 +5519,9 @@ class GraphVarEXBImporter(Importer):
 
         #timeline-IDs
         timelines = body.find("common-timeline")
-        for timeline in timelines:
-            tokens[timeline.attrib["id"]] = dict()
+        exb_timeline = EXBTimeline(timelines)
+        for timeline in exb_timeline.ids:
+            tokens[timeline] = dict()
 
         #text+annotations
         #layers 'tier' can be embedded at different positions
@@ -5820,17 +5548,8 @@ class GraphVarEXBImporter(Importer):
                 end = event.attrib["end"]
                 anno = event.text
                 #save annotations in dictionary
-                started = 0
                 # for span annotations: collect annos
-                collect = list()
-                for timeline in tokens:
-                    if timeline == end:
-                        break
-                    elif started == 1:
-                        collect.append((timeline,anno))
-                    elif timeline == start:
-                        collect.append((timeline,anno))
-                        started = 1
+                collect = [(timeline,anno) for timeline in exb_timeline.span(start, end)]
                 # span annotations: add B- / I- / E-
                 if len(collect) > 1:
                     for (i, (timeline,anno)) in enumerate(collect):
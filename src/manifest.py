@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+'''
+Build manifest for incremental conversion.
+
+The manifest in the output directory records for each output file
+the input file (modification time and hash) and the settings it
+was converted with (importer, processors, exporter, column order
+and a hash of the program code, CODE_VERSION).
+Input files whose outputs are up to date are skipped on the next run.
+This requires that the output of a file only depends on the file itself
+and the settings, i.e. exporters keep no state from one doc to the next.
+'''
+
+import os
+import json
+import tempfile
+from cache import hash_file, hash_modules, MODULES as DOC_MODULES
+
+############################
+
+#Modules that determine the outputs
+#(the modules of the imported docs, see cache.py,
+#and the processors and exporters with the modules they import)
+MODULES = DOC_MODULES + ("processor.py", "tagsets.py", "exporter.py")
+
+#Hash of these modules
+CODE_VERSION = hash_modules(MODULES)
+
+############################
+
+class Manifest(object):
+
+    #Name of the manifest file in the output directory
+    FILENAME = ".c6c_manifest.json"
+
+    #Increase if the format of the manifest changes
+    #(or if outputs of earlier versions cannot be reused)
+    #2: CoNLL-U Plus columns no longer depend on previous docs
+    VERSION = 2
+
+    def __init__(self, outdir, **kwargs):
+        """
+        Read the manifest of the given output directory (if there is one).
+        Input: Output directory
+        """
+        self.outdir = outdir
+        self.path = os.path.join(outdir, self.FILENAME)
+        for key,val in kwargs.items():
+            self.__dict__[key] = val
+
+        #{output file (relative to outdir) : entry}
+        self.outputs = dict()
+        try:
+            with open(self.path, mode="r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == self.VERSION:
+                self.outputs = manifest["outputs"]
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, AttributeError):
+            print("WARNING: Ignoring invalid manifest {0}.".format(self.path))
+
+        #{input file : output files}
+        self.inputs = dict()
+        for output, entry in self.outputs.items():
+            self.inputs.setdefault(entry["input"], set()).add(output)
+
+        #Hashes of input files computed in this run
+        self.hashes = dict()
+
+    ##########################
+
+    def get_settings(self, pipeline, position):
+        """
+        Return the settings of a pipeline that determine the output.
+
+        Importers that number their files (filenr) name the docs
+        after the position of the file, so it is part of the settings.
+        Outputs of another program version are not reused.
+        Input: Pipeline object, position of the file in the input files
+        Output: Dictionary with settings
+        """
+        column_order = pipeline.__dict__.get("column_order", "alpha")
+        return {"importer" : type(pipeline.importer).__name__,
+                "processors" : [type(p).__name__ for p in pipeline.processors],
+                "column_order" : column_order,
+                "position" : position if hasattr(pipeline.importer, "filenr") else None,
+                "code_version" : CODE_VERSION}
+
+    ##########################
+
+    def get_hash(self, file):
+        if not file in self.hashes:
+            self.hashes[file] = hash_file(file)
+        return self.hashes[file]
+
+    ##########################
+
+    def is_current(self, file, pipeline, position):
+        """
+        Return if the outputs of all exporters of the pipeline
+        exist and were converted from the same input with the same settings.
+
+        The input file is only hashed if its modification time changed.
+        If the content is the same, the new modification time
+        is stored, so the file is not hashed again on the next run.
+        Input: Input filename, Pipeline object, position of the file
+        Output: True or False
+        """
+        file = os.path.abspath(file)
+        settings = self.get_settings(pipeline, position)
+        mtime = os.path.getmtime(file)
+
+        for name, _ in pipeline.exporter:
+            entries = [(output, self.outputs[output]) for output in self.inputs.get(file, ())
+                       if self.outputs[output]["exporter"] == name]
+            if not entries:
+                return False
+            for output, entry in entries:
+                if entry["settings"] != settings:
+                    return False
+                if not os.path.isfile(os.path.join(self.outdir, output)):
+                    return False
+                if entry["mtime"] != mtime:
+                    if entry["sha256"] != self.get_hash(file):
+                        return False
+                    entry["mtime"] = mtime
+
+        return True
+
+    ##########################
+
+    def update(self, file, pipeline, position, outputs):
+        """
+        Replace the entries of an input file with its new outputs.
+        Input: Input filename, Pipeline object, position of the file,
+               list of tuples (exporter name, output filename)
+        """
+        file = os.path.abspath(file)
+        settings = self.get_settings(pipeline, position)
+        entry = {"input" : file, "mtime" : os.path.getmtime(file),
+                 "sha256" : self.get_hash(file), "settings" : settings}
+
+        #Remove old outputs of this input
+        for output in self.inputs.pop(file, ()):
+            del self.outputs[output]
+
+        for name, output in outputs:
+            output = os.path.relpath(output, self.outdir)
+            #Output of another input with the same name
+            old = self.outputs.get(output, None)
+            if old is not None:
+                self.inputs[old["input"]].discard(output)
+            self.outputs[output] = dict(entry, exporter=name)
+            self.inputs.setdefault(file, set()).add(output)
+
+    ##########################
+
+    def save(self):
+        """
+        Write the manifest to the output directory.
+        """
+        fd, tmpfile = tempfile.mkstemp(suffix=".tmp", dir=self.outdir)
+        with os.fdopen(fd, mode="w", encoding="utf-8") as f:
+            json.dump({"version" : self.VERSION, "outputs" : self.outputs}, f, indent=1, sort_keys=True)
+        os.replace(tmpfile, self.path)
@@ -6,14 +6,35 @@ Created on 14.10.2019
 '''
 
 import os, re
+from tagsets import get_tagset, RESOURCE_DIR
 
 ############################
 
 class Processor(object):
 
+    #Processors that can work on one sentence at a time
+    #set this to False and implement process_sentence(sent)
+    NEEDS_DOC = True
+
     def __init__(self):
         pass
 
+    def process_stream(self, doc):
+        """
+        Process a doc, whose sentences may be streamed.
+
+        Processors that need the whole doc get all sentences
+        at once (i.e. the doc is buffered). All others process
+        each sentence when it is read.
+        """
+        if self.NEEDS_DOC or not doc.is_streamed():
+            doc.buffer()
+            return self.process(doc)
+
+        doc.sentences = (self.process_sentence(sent) for sent in doc.sentences)
+
+        return doc
+
 ############################
 
 
@@ -105,6 +126,8 @@ class TopFChopper(Processor):
 
 class DTASimplifier(Processor):
 
+    NEEDS_DOC = False
+
     #######################
 
     def __init__(self):
@@ -125,56 +148,65 @@ class DTASimplifier(Processor):
 
     #######################
 
-    def process(self, doc):
+    def process_sentence(self, sent):
 
-        for sent in doc.sentences:
-            for tok in sent.tokens:
-                #print(tok.__dict__)
-                #i = input()
-                #Map annotation names and delete unneeded ones
-                for annoname in list(tok.__dict__):
-
-                    newname = self.mapping.get(annoname, None)
-                    if newname:
-                        tok.__dict__[newname] = tok.__dict__[annoname]
-                    if newname != annoname:
-                        del tok.__dict__[annoname]
-
-                if tok.Antec != "_":
-                    if not "|" in tok.Antec and "_" in tok.Antec:
-                        tok.Antec = "_"
-                    else:
-                        tok.Antec = "|".join([re.sub(r"\[\d+\]", "", a).split("-")[-1] for a in tok.Antec.split("|")])
+        for tok in sent.tokens:
+            #print(tok.__dict__)
+            #i = input()
+            #Map annotation names and delete unneeded ones
+            for annoname in list(tok.__dict__):
+
+                newname = self.mapping.get(annoname, None)
+                if newname:
+                    tok.__dict__[newname] = tok.__dict__[annoname]
+                if newname != annoname:
+                    del tok.__dict__[annoname]
+
+            if tok.Antec != "_":
+                if not "|" in tok.Antec and "_" in tok.Antec:
+                    tok.Antec = "_"
+                else:
+                    tok.Antec = "|".join([re.sub(r"\[\d+\]", "", a).split("-")[-1] for a in tok.Antec.split("|")])
 
-                if tok.AntecHead == "*":
-                    tok.AntecHead = "_"
-                elif tok.AntecHead != "_":
-                    tok.AntecHead = "|".join([a.split("-")[-1] for a in tok.AntecHead.split("|") if not "*" in a])
+            if tok.AntecHead == "*":
+                tok.AntecHead = "_"
+            elif tok.AntecHead != "_":
+                tok.AntecHead = "|".join([a.split("-")[-1] for a in tok.AntecHead.split("|") if not "*" in a])
 
-                if tok.MovElemPos != "_":
-                    tok.MovElemPos = "|".join([a for a in tok.MovElemPos.split("|") if not "*" in a])
+            if tok.MovElemPos != "_":
+                tok.MovElemPos = "|".join([a for a in tok.MovElemPos.split("|") if not "*" in a])
 
-                if tok.AdvCVPos == "*":
-                    tok.AdvCVPos = "_"
-                elif tok.AdvCVPos != "_":
-                    if not "|" in tok.AdvCVPos and "_" in tok.AdvCVPos:
-                        tok.AdvCVPos = "_"
-                    else:
-                        tok.AdvCVPos = "|".join([a for a in tok.AdvCVPos.split("|") if not "_" in a])
-                if not tok.AdvCVPos:
+            if tok.AdvCVPos == "*":
+                tok.AdvCVPos = "_"
+            elif tok.AdvCVPos != "_":
+                if not "|" in tok.AdvCVPos and "_" in tok.AdvCVPos:
                     tok.AdvCVPos = "_"
+                else:
+                    tok.AdvCVPos = "|".join([a for a in tok.AdvCVPos.split("|") if not "_" in a])
+            if not tok.AdvCVPos:
+                tok.AdvCVPos = "_"
+
+            if tok.AdvCVHead == "*":
+                tok.AdvCVHead = "_"
+            elif tok.AdvCVHead != "_":
+                tok.AdvCVHead = "|".join([a.split("-")[-1] for a in tok.AdvCVHead.split("|") if not "*" in a])
+            if not tok.AdvCVHead:
+                tok.AdvCVHead = "_"
+
+            if "Cite" in tok.__dict__ and tok.Cite != "_":
+                tok.Cite = "|".join([a.replace("*", "cite") for a in tok.Cite.split("|")])
+            #print(tok.__dict__)
+            #i = input()
+
+        return sent
+
+    #######################
+
+    def process(self, doc):
+
+        for sent in doc.sentences:
+            sent = self.process_sentence(sent)
 
-                if tok.AdvCVHead == "*":
-                    tok.AdvCVHead = "_"
-                elif tok.AdvCVHead != "_":
-                    tok.AdvCVHead = "|".join([a.split("-")[-1] for a in tok.AdvCVHead.split("|") if not "*" in a])
-                if not tok.AdvCVHead:
-                    tok.AdvCVHead = "_"
-
-                if "Cite" in tok.__dict__ and tok.Cite != "_":
-                    tok.Cite = "|".join([a.replace("*", "cite") for a in tok.Cite.split("|")])
-                #print(tok.__dict__)
-                #i = input()
         return doc
 
 ############################
@@ -188,16 +220,10 @@ class HIPKONtoSTTSMapper(Processor):
 
     def process(self, doc):
 
-        filedir = "./../res"
-        file = open(os.path.join(filedir, "HIPKON-STTS.txt"), mode="r", encoding="utf-8")
+        filedir = RESOURCE_DIR
 
         #dictionary "HIPKON" : "STTS"
-        tags = dict()
-        for line in file:
-            hipkon, stts = line.strip().split()
-            tags[hipkon] = stts
-
-        file.close()
+        tags = get_tagset("HIPKON")
 
         punct = [".", ":", "!", "?", ";"]
         comma = [",", "/"]
@@ -300,7 +326,7 @@ class addmissingSTTStoHIPKON(Processor):
 
     def process(self, doc):
 
-        filedir = "./../res"
+        filedir = RESOURCE_DIR
         missing_stts = open(os.path.join(filedir, "hipkon_missing_stts.csv"), mode="r", encoding="utf-8")
 
         for line in missing_stts:
@@ -321,6 +347,8 @@ class addmissingSTTStoHIPKON(Processor):
 
 class TopFSimplifier(Processor):
 
+    NEEDS_DOC = False
+
     def __init__(self):
         self.mapping = {"ID" : "ID",
                         "FORM" : "FORM",
@@ -334,59 +362,67 @@ class TopFSimplifier(Processor):
 
     #####################
 
-    def process(self, doc):
+    def process_sentence(self, sent):
 
-        for sent in doc.sentences:
-            for tok in sent.tokens:
+        for tok in sent.tokens:
 
-                #Map annotation names and delete unneeded ones
-                for annoname in list(tok.__dict__):
-
-                    newname = self.mapping.get(annoname, None)
-                    if newname:
-                        tok.__dict__[newname] = tok.__dict__[annoname]
-                    if newname != annoname:
-                        del tok.__dict__[annoname]
-
-                #Remove backslash escapes from FEAT
-                if tok.__dict__.get("FEATS", None):
-                    tok.FEATS = re.sub(r"\\", "", tok.FEATS)
-
-                #Simplify TopF column
-                TopF = ""
-                annotations = tok.TopF.split("|")
-                if len(annotations) == 1:
-                    if annotations[0] == "_" or not "[" in annotations[0]:
-                        pass
-                    else:
-                        tok.TopF = re.sub(r"\[\d+\]", "", annotations[0])
+            #Map annotation names and delete unneeded ones
+            for annoname in list(tok.__dict__):
+
+                newname = self.mapping.get(annoname, None)
+                if newname:
+                    tok.__dict__[newname] = tok.__dict__[annoname]
+                if newname != annoname:
+                    del tok.__dict__[annoname]
+
+            #Remove backslash escapes from FEAT
+            if tok.__dict__.get("FEATS", None):
+                tok.FEATS = re.sub(r"\\", "", tok.FEATS)
+
+            #Simplify TopF column
+            TopF = ""
+            annotations = tok.TopF.split("|")
+            if len(annotations) == 1:
+                if annotations[0] == "_" or not "[" in annotations[0]:
+                    pass
                 else:
-                    sorted_annotations = []
-                    for a in annotations:
-                        field = a.split("[")[0]
-                        number = a.split("[")[-1].rstrip("]")
-                        try:
-                            number = int(number)
-                        except:
-                            number = 99999
-                        sorted_annotations.append((field, number))
-                    sorted_annotations.sort(key=lambda l: int(l[1]))
-                    tok.TopF = "-".join([a for a,i in sorted_annotations])
-
-                #Create Sentence Bracket Column
-                tok.__dict__["SentBrckt"] = ""
-                for anno in tok.TopF.split("-"):
-                    if anno in ["LK", "RK"]:
-                        if tok.SentBrckt:
-                            tok.__dict__["SentBrckt"] += "-" + anno
-                        else:
-                            tok.__dict__["SentBrckt"] += anno
-                if not tok.SentBrckt:
-                    tok.__dict__["SentBrckt"] = "_"
+                    tok.TopF = re.sub(r"\[\d+\]", "", annotations[0])
+            else:
+                sorted_annotations = []
+                for a in annotations:
+                    field = a.split("[")[0]
+                    number = a.split("[")[-1].rstrip("]")
+                    try:
+                        number = int(number)
+                    except:
+                        number = 99999
+                    sorted_annotations.append((field, number))
+                sorted_annotations.sort(key=lambda l: int(l[1]))
+                tok.TopF = "-".join([a for a,i in sorted_annotations])
+
+            #Create Sentence Bracket Column
+            tok.__dict__["SentBrckt"] = ""
+            for anno in tok.TopF.split("-"):
+                if anno in ["LK", "RK"]:
+                    if tok.SentBrckt:
+                        tok.__dict__["SentBrckt"] += "-" + anno
+                    else:
+                        tok.__dict__["SentBrckt"] += anno
+            if not tok.SentBrckt:
+                tok.__dict__["SentBrckt"] = "_"
 
-                #Strip sentID from depHead
-                if tok.__dict__.get("HEAD", None) and tok.HEAD != "_":
-                    tok.HEAD = tok.HEAD.split("-")[-1]
+            #Strip sentID from depHead
+            if tok.__dict__.get("HEAD", None) and tok.HEAD != "_":
+                tok.HEAD = tok.HEAD.split("-")[-1]
+
+        return sent
+
+    #####################
+
+    def process(self, doc):
+
+        for sent in doc.sentences:
+            sent = self.process_sentence(sent)
 
         return doc
 
@@ -486,59 +522,65 @@ class CoNLLUPLUSIndexer(Processor):
 
 class HiTStoSTTSMapper(Processor):
 
+    NEEDS_DOC = False
+
     def __init__(self):
         pass
 
     #####################
 
-    def process(self, doc):
+    def get_tags(self):
 
-        file = open("./../res/HiTS_STTS_mapping.csv", mode="r", encoding="utf-8")
+        #dictionary {("pos", "posLemma") : "STTS"}
+        return get_tagset("HiTS")
 
-        #dictionary {"pos" : {"posLemma" : "STTS"}}
-        tags = dict()
-        for line in file:
-            line = line.strip().split("\t")
-            if line[0] in tags:
-                tags[line[0]][line[1]] = line[4]
-            else:
-                tags[line[0]] = {line[1] : line[4]}
+    #####################
+
+    def process_sentence(self, sent):
 
-        file.close()
+        tags = self.get_tags()
 
         punct = [":", "!", "?", ";"]
         comma = [",", "/", "//"]
         other = ["(", ")", "[", "]", "-", '"', "'", "„"]
 
-        for sent in doc.sentences:
-            for tok in sent.tokens:
+        for tok in sent.tokens:
 
-                if "-" not in tok.ID:
+            if "-" not in tok.ID:
 
-                    #punctuation
-                    if tok.POS == "$_":
-                        #look up tok.FORM and punc-annotation
-                        if tok.FORM in [".", "·"]:
-                            if tok.PUNC == "$E":
-                                tok.__dict__["XPOS"] = "$."
-                            else:
-                                tok.__dict__["XPOS"] = "$,"
-                        elif tok.FORM in punct:
+                #punctuation
+                if tok.POS == "$_":
+                    #look up tok.FORM and punc-annotation
+                    if tok.FORM in [".", "·"]:
+                        if tok.PUNC == "$E":
                             tok.__dict__["XPOS"] = "$."
-                        elif tok.FORM in comma:
-                            tok.__dict__["XPOS"] = "$,"
-                        elif tok.FORM in other:
-                            tok.__dict__["XPOS"] = "$("
-
-                    #other
-                    elif tok.POS == "_":
-                        if tok.POS_GEN == "_":
-                            tok.__dict__["XPOS"] = tags["--"]["--"]
                         else:
-                            tok.__dict__["XPOS"] = tags["--"][tok.POS_GEN]
+                            tok.__dict__["XPOS"] = "$,"
+                    elif tok.FORM in punct:
+                        tok.__dict__["XPOS"] = "$."
+                    elif tok.FORM in comma:
+                        tok.__dict__["XPOS"] = "$,"
+                    elif tok.FORM in other:
+                        tok.__dict__["XPOS"] = "$("
 
+                #other
+                elif tok.POS == "_":
+                    if tok.POS_GEN == "_":
+                        tok.__dict__["XPOS"] = tags[("--", "--")]
                     else:
-                        tok.__dict__["XPOS"] = tags[tok.POS][tok.POS_GEN]
+                        tok.__dict__["XPOS"] = tags[("--", tok.POS_GEN)]
+
+                else:
+                    tok.__dict__["XPOS"] = tags[(tok.POS, tok.POS_GEN)]
+
+        return sent
+
+    #####################
+
+    def process(self, doc):
+
+        for sent in doc.sentences:
+            sent = self.process_sentence(sent)
 
         return doc
 
@@ -747,107 +789,131 @@ def find_ANNIS_matches(grid_file, conll_folder, outdir):
 
 class ANSELMtoSTTSMapper(Processor):
 
+    NEEDS_DOC = False
+
     def __init__(self):
         pass
 
     #####################
 
-    def process(self, doc):
-
-        file = open("./../res/Anselm_pos_tags.csv", mode="r", encoding="utf-8")
+    def get_tags(self):
 
         #dictionary {"Anselm" : "STTS"}
-        tags = dict()
-        for line in file:
-            anselm, stts = line.strip().split("\t")
-            tags[anselm] = stts
-        tags["_"] = "_"
-        file.close()
+        return get_tagset("Anselm")
+
+    #####################
+
+    def process_sentence(self, sent):
+
+        tags = self.get_tags()
+
+        for tok in sent.tokens:
+            tok.__dict__["XPOS"] = tags[tok.POS]
+
+        return sent
+
+    #####################
+
+    def process(self, doc):
 
         for sent in doc.sentences:
-            for tok in sent.tokens:
-                tok.__dict__["XPOS"] = tags[tok.POS]
+            sent = self.process_sentence(sent)
 
         return doc
 
+    #####################
+
+    def process_columns(self, cdoc):
+
+        tags = self.get_tags()
+        cdoc.map(["POS"], "XPOS", lambda pos: tags[pos])
+
+        return cdoc
+
 ############################
 
 class ReFHiTStoSTTSMapper(Processor):
 
+    NEEDS_DOC = False
+
     def __init__(self):
         pass
 
     #####################
 
-    def process(self, doc):
+    def get_tags(self):
 
-        file = open("./../res/ReF_HiTS-STTS_mapping.csv", mode="r", encoding="utf-8")
+        #dictionary {("pos", "posLemma") : "STTS"}
+        return get_tagset("ReFHiTS")
 
-        #dictionary {"pos" : {"posLemma" : "STTS"}}
-        tags = dict()
-        for line in file:
-            line = line.strip().split("\t")
-            if line[0] in tags:
-                tags[line[0]][line[1]] = line[2]
-            else:
-                tags[line[0]] = {line[1] : line[2]}
-        tags["_"] = {"_" : "_"}
-        file.close()
+    #####################
+
+    def process_sentence(self, sent):
+
+        tags = self.get_tags()
 
         punct = [":", "!", "?", ";"]
         comma = [","]
 
-        for sent in doc.sentences:
-            for i, tok in enumerate(sent.tokens):
+        for i, tok in enumerate(sent.tokens):
 
-                if "-" not in tok.ID:
+            if "-" not in tok.ID:
 
-                    if "XPOS" in tok.__dict__: del tok.__dict__["XPOS"]
+                if "XPOS" in tok.__dict__: del tok.__dict__["XPOS"]
 
-                    #punctuation
-                    if tok.POS == "$_":
-                        #look up tok.FORM and boundary-tag
-                        if tok.FORM in [".", "·", "/"]:
-                            if "." in tok.__dict__.get("BOUNDARY", ""):
-                                tok.__dict__["XPOS"] = "$."
-                            elif "," in tok.__dict__.get("BOUNDARY", ""):
-                                tok.__dict__["XPOS"] = "$,"
-                            else:
-                                for punc in punct:
-                                    if punc in tok.__dict__.get("BOUNDARY", ""):
-                                        tok.__dict__["XPOS"] = "$."
-                        elif tok.FORM in punct:
+                #punctuation
+                if tok.POS == "$_":
+                    #look up tok.FORM and boundary-tag
+                    if tok.FORM in [".", "·", "/"]:
+                        if "." in tok.__dict__.get("BOUNDARY", ""):
                             tok.__dict__["XPOS"] = "$."
-                        elif tok.FORM in comma:
+                        elif "," in tok.__dict__.get("BOUNDARY", ""):
                             tok.__dict__["XPOS"] = "$,"
+                        else:
+                            for punc in punct:
+                                if punc in tok.__dict__.get("BOUNDARY", ""):
+                                    tok.__dict__["XPOS"] = "$."
+                    elif tok.FORM in punct:
+                        tok.__dict__["XPOS"] = "$."
+                    elif tok.FORM in comma:
+                        tok.__dict__["XPOS"] = "$,"
 
-                        if "XPOS" not in tok.__dict__:
-                            if i == len(sent.tokens)-1:
-                                tok.__dict__["XPOS"] = "$."
+                    if "XPOS" not in tok.__dict__:
+                        if i == len(sent.tokens)-1:
+                            tok.__dict__["XPOS"] = "$."
+                        else:
+                            tok.__dict__["XPOS"] = "$,"
+
+                #other
+                elif tok.POS == "DRELS":
+                    tok_id = int(tok.ID)
+                    for token in sent.tokens:
+                        if token.ID == str(tok_id + 1):
+                            if tags[(token.POS, token.POS_LEMMA)] in ["ADJA", "NN"]:
+                                tok.__dict__["XPOS"] = "PRELAT"
                             else:
-                                tok.__dict__["XPOS"] = "$,"
+                                tok.__dict__["XPOS"] = "PRELS"
+
+                elif tok.POS == "PW":
+                    tok_id = int(tok.ID)
+                    for token in sent.tokens:
+                        if token.ID == str(tok_id + 1):
+                            if tags[(token.POS, token.POS_LEMMA)] in ["ADJA", "NN"]:
+                                tok.__dict__["XPOS"] = "PWAT"
+                            else:
+                                tok.__dict__["XPOS"] = "PWS"
 
-                    #other
-                    elif tok.POS == "DRELS":
-                        tok_id = int(tok.ID)
-                        for token in sent.tokens:
-                            if token.ID == str(tok_id + 1):
-                                if tags[token.POS][token.POS_LEMMA] in ["ADJA", "NN"]:
-                                    tok.__dict__["XPOS"] = "PRELAT"
-                                else:
-                                    tok.__dict__["XPOS"] = "PRELS"
-
-                    elif tok.POS == "PW":
-                        tok_id = int(tok.ID)
-                        for token in sent.tokens:
-                            if token.ID == str(tok_id + 1):
-                                if tags[token.POS][token.POS_LEMMA] in ["ADJA", "NN"]:
-                                    tok.__dict__["XPOS"] = "PWAT"
-                                else:
-                                    tok.__dict__["XPOS"] = "PWS"
+                else:
+                    tok.__dict__["XPOS"] = tags[(tok.POS, tok.POS_LEMMA)]
 
-                    else:
-                        tok.__dict__["XPOS"] = tags[tok.POS][tok.POS_LEMMA]
+        return sent
+
+    #####################
+
+    def process(self, doc):
+
+        for sent in doc.sentences:
+            sent = self.process_sentence(sent)
 
         return doc
 
@@ -862,16 +928,8 @@ class MercuriusToSTTSMapper(Processor):
 
     def process(self, doc):
 
-        filedir = "./../res"
-        file = open(os.path.join(filedir, "mercurius_STTS.csv"), mode="r", encoding="utf-8")
-
         #dictionary "Mercurius" : "STTS"
-        tags = dict()
-        for line in file:
-            mercurius, stts, comments = line.strip().split("\t")
-            tags[mercurius] = stts
-
-        file.close()
+        tags = get_tagset("Mercurius")
 
         for sent in doc.sentences:
             for i, tok in enumerate(sent.tokens):
@@ -931,19 +989,8 @@ class ReFUPToSTTSMapper(Processor):
 
     def process(self, doc):
 
-        filedir = "./../res"
-        file = open(os.path.join(filedir, "ReF-UP-STTS.csv"), mode="r", encoding="utf-8")
-
         #dictionary "ReF.UP" : "STTS"
-        tags = dict()
-        for line in file:
-            if "POS" in line and "STTS" in line:
-                continue
-            refup = line.strip().split("\t")[0]
-            stts = line.strip().split("\t")[1]
-            tags[refup] = stts
-
-        file.close()
+        tags = get_tagset("ReFUP")
 
         for sent in doc.sentences:
             for t, tok in enumerate(sent.tokens):
@@ -971,94 +1018,164 @@ class ReFUPToSTTSMapper(Processor):
 
 class FuerstinnentoSTTSMapper(Processor):
 
+    NEEDS_DOC = False
+
     def __init__(self):
         pass
 
     #####################
 
-    def process(self, doc):
-
-        file = open("./../res/Fuerstinnen_STTS.csv", mode="r", encoding="utf-8")
+    def get_tags(self):
 
         #dictionary {"POS" : "STTS"}
-        tags = dict()
-        for line in file:
-            pos, stts = line.strip().split("\t")
-            tags[pos] = stts
-        file.close()
+        return get_tagset("Fuerstinnen")
 
-        for sent in doc.sentences:
-            for tok in sent.tokens:
+    #####################
 
-                if tok.__dict__["POS"] == "_":
-                    if tok.__dict__["LEMMA"] == "_":
-                        tok.__dict__["XPOS"] = "XY"
-                        tok.__dict__["LEMMA"] = "#"
-                    else:
-                        tok.__dict__["XPOS"] = "XY"
+    def process_sentence(self, sent):
+
+        tags = self.get_tags()
 
+        for tok in sent.tokens:
+
+            if tok.__dict__["POS"] == "_":
+                if tok.__dict__["LEMMA"] == "_":
+                    tok.__dict__["XPOS"] = "XY"
+                    tok.__dict__["LEMMA"] = "#"
                 else:
-                    tok.__dict__["XPOS"] = tags[tok.POS]
+                    tok.__dict__["XPOS"] = "XY"
+
+            else:
+                tok.__dict__["XPOS"] = tags[tok.POS]
+
+        return sent
+
+    #####################
+
+    def process(self, doc):
+
+        for sent in doc.sentences:
+            sent = self.process_sentence(sent)
 
         return doc
 
+    #####################
+
+    def process_columns(self, cdoc):
+
+        tags = self.get_tags()
+
+        #Untagged tokens without lemma get lemma '#'
+        cdoc.map(["POS", "LEMMA"], "LEMMA",
+                 lambda pos, lemma: "#" if pos == "_" and lemma == "_" else lemma)
+        cdoc.map(["POS"], "XPOS", lambda pos: "XY" if pos == "_" else tags[pos])
+
+        return cdoc
+
 ############################
 
 class VirgelMapper(Processor):
 
+    NEEDS_DOC = False
+
     def __init__(self):
         pass
 
     #####################
 
+    def process_sentence(self, sent):
+
+        for tok in sent.tokens:
+
+            if tok.__dict__["FORM"] == "/":
+                tok.__dict__["XPOS"] = "$("
+
+        return sent
+
+    #####################
+
     def process(self, doc):
 
         for sent in doc.sentences:
-            for tok in sent.tokens:
-
-                if tok.__dict__["FORM"] == "/":
-                    tok.__dict__["XPOS"] = "$("
+            sent = self.process_sentence(sent)
 
         return doc
 
+    #####################
+
+    def process_columns(self, cdoc):
+
+        cdoc.column("XPOS").assign("$(", cdoc.column("FORM").equals("/"))
+
+        return cdoc
+
 ############################
 
 class PronominalAdverbMapper(Processor):
 
+    NEEDS_DOC = False
+
     def __init__(self):
         pass
 
     #####################
 
+    def process_sentence(self, sent):
+
+        for tok in sent.tokens:
+
+            if tok.__dict__["XPOS"] == "PROAV":
+                tok.__dict__["XPOS"] = "PAV"
+
+        return sent
+
+    #####################
+
     def process(self, doc):
 
         for sent in doc.sentences:
-            for tok in sent.tokens:
-
-                if tok.__dict__["XPOS"] == "PROAV":
-                    tok.__dict__["XPOS"] = "PAV"
+            sent = self.process_sentence(sent)
 
         return doc
 
+    #####################
+
+    def process_columns(self, cdoc):
+
+        xpos = cdoc.column("XPOS")
+        xpos.assign("PAV", xpos.equals("PROAV"))
+
+        return cdoc
+
 ############################
 
 class ReFUPCoding(Processor):
 
+    NEEDS_DOC = False
+
     def __init__(self):
         pass
 
     #####################
 
-    def process(self, doc):
+    def process_sentence(self, sent):
 
-        for sent in doc.sentences:
-            for tok in sent.tokens:
+        for tok in sent.tokens:
 
-                if "Ã" in tok.__dict__["FORM"]:
-                    #print(tok.__dict__["FORM"])
-                    tok.__dict__["FORM"] = tok.__dict__["FORM"].replace("Ã", "ß")
+            if "Ã" in tok.__dict__["FORM"]:
+                #print(tok.__dict__["FORM"])
+                tok.__dict__["FORM"] = tok.__dict__["FORM"].replace("Ã", "ß")
 
-            sent.text = " ".join([tok.FORM for tok in sent.tokens])
+        sent.text = " ".join([tok.FORM for tok in sent.tokens])
+
+        return sent
+
+    #####################
+
+    def process(self, doc):
+
+        for sent in doc.sentences:
+            sent = self.process_sentence(sent)
 
         return doc
 
@@ -1066,21 +1183,31 @@ class ReFUPCoding(Processor):
 
 class BracketRemover(Processor):
 
+    NEEDS_DOC = False
+
     def __init__(self):
         pass
 
     #####################
 
-    def process(self, doc):
+    def process_sentence(self, sent):
 
         brackets = ["(", ")", "{", "}", "[", "]", "<", ">"]
 
-        for sent in doc.sentences:
-            for tok in sent.tokens:
+        for tok in sent.tokens:
+
+            if any(c.isalnum() for c in tok.FORM) and any(b in tok.FORM for b in brackets):
+                for b in brackets:
+                    if b in tok.FORM: tok.FORM = tok.FORM.replace(b, "")
 
-                if any(c.isalnum() for c in tok.FORM) and any(b in tok.FORM for b in brackets):
-                    for b in brackets:
-                        if b in tok.FORM: tok.FORM = tok.FORM.replace(b, "")
+        return sent
+
+    #####################
+
+    def process(self, doc):
+
+        for sent in doc.sentences:
+            sent = self.process_sentence(sent)
 
         return doc
 
@@ -1088,6 +1215,8 @@ class BracketRemover(Processor):
 
 class DependencyProcessor(Processor):
 
+    NEEDS_DOC = False
+
     def __init__(self):
         pass
 
@@ -1095,24 +1224,18 @@ class DependencyProcessor(Processor):
 
     def process_sentence(self, sent):
 
+        graph = sent.dependency_graph()
+
         #Add root(s) to sentence
-        #And inform every tok about its head-token
-        sent.roots = []
+        sent.roots = list(graph.roots)
+
+        #And inform every tok about its head-token and its children
         for tok in sent.tokens:
-            if tok.HEAD == "0":
-                sent.roots.append(tok)
+            if graph.is_root(tok):
                 tok.head_tok = "ROOT"
-            elif tok.HEAD != "_":
-                try:
-                    tok.head_tok = [t for t in sent.tokens if t.ID == tok.HEAD][0]
-                except:
-                    tok.head_tok = None
             else:
-                tok.head_tok = None
-
-        #Then inform every tok about its children
-        for tok in sent.tokens:
-            tok.dep_toks = [t for t in sent.tokens if t.head_tok == tok]          
+                tok.head_tok = graph.head(tok)
+            tok.dep_toks = list(graph.children(tok))
 
         return sent
 
@@ -1129,6 +1252,8 @@ class DependencyProcessor(Processor):
 
 class DependencyManipulator(Processor):
 
+    NEEDS_DOC = False
+
     def __init__(self):
         pass
 
@@ -1139,6 +1264,17 @@ class DependencyManipulator(Processor):
         if not "roots" in sent.__dict__:
             sent = DependencyProcessor().process_sentence(sent)
 
+        #Index of the current head_tok relations,
+        #dependents are updated whenever a head changes
+        graph = sent.dependency_graph()
+        for tok in sent.tokens:
+            graph.set_head(tok, tok.head_tok)
+
+        def attach(tok, head_tok, head):
+            tok.head_tok = head_tok
+            tok.HEAD = head
+            graph.set_head(tok, head_tok)
+
         #for tok in sent.tokens:
         #    print(tok.ID, tok.FORM, tok.DEPREL, tok.HEAD)
 
@@ -1149,29 +1285,25 @@ class DependencyManipulator(Processor):
             if new_pred == "ROOT" or new_pred == None:
                 continue
             #Dependents of former head become dependents of former copula
-            deps = [tok for tok in sent.tokens 
-                    if tok.head_tok == new_pred and tok != copula
+            deps = [tok for tok in graph.children(new_pred)
+                    if tok != copula
                     and not tok.DEPREL in ["amod", "case", 'det', 'det:neg', "nmod:poss", "nmod", "fixed", 
                                            "appos", 'flat', 'flat:foreign', "nummod"]]
             for dep in deps:
-                dep.head_tok = copula
-                dep.HEAD = copula.ID
+                attach(dep, copula, copula.ID)
             #Former copula becomes head
-            copula.head_tok = new_pred.head_tok
-            copula.HEAD = new_pred.HEAD
+            attach(copula, new_pred.head_tok, new_pred.HEAD)
             copula.DEPREL = new_pred.DEPREL
             #Former head becomes pred dependent
-            new_pred.head_tok = copula
-            new_pred.HEAD = copula.ID
+            attach(new_pred, copula, copula.ID)
             new_pred.DEPREL = "pred"
 
         #Switch aux relation
         #auxiliaries = [tok for tok in sent.tokens if tok.DEPREL.startswith("aux")]
         verbs = [tok for tok in sent.tokens 
-                 if any(t.DEPREL.startswith("aux") and t.head_tok == tok for t in sent.tokens)]
+                 if any(t.DEPREL.startswith("aux") for t in graph.children(tok))]
         for verb in verbs:
-            auxiliaries = [tok for tok in sent.tokens 
-                           if tok.DEPREL.startswith("aux") and tok.head_tok == verb]
+            auxiliaries = [tok for tok in graph.children(verb) if tok.DEPREL.startswith("aux")]
             finite_aux = [tok for tok in auxiliaries if tok.XPOS.endswith("FIN")]
             if finite_aux:
                 head_aux = finite_aux[0]
@@ -1179,94 +1311,76 @@ class DependencyManipulator(Processor):
             else:
                 head_aux = auxiliaries.pop(0)
             #nsubj/nsubj:pass, advmod:neg -> dep of aux
-            deps = [tok for tok in sent.tokens 
-                    if tok.head_tok == verb 
-                       and tok.DEPREL in ["nsubj", "nsubj:pass", "advmod:neg", "conj", "cc", "mark", "case"]]
+            deps = [tok for tok in graph.children(verb)
+                    if tok.DEPREL in ["nsubj", "nsubj:pass", "advmod:neg", "conj", "cc", "mark", "case"]]
             for dep in deps:
-                dep.head_tok = head_aux
-                dep.HEAD = head_aux.ID
+                attach(dep, head_aux, head_aux.ID)
             #aux head is head of verb
-            head_aux.head_tok = verb.head_tok
-            head_aux.HEAD = verb.HEAD
+            attach(head_aux, verb.head_tok, verb.HEAD)
             head_aux.DEPREL = verb.DEPREL
             #Other auxiliaries deps of one another
             for aux in reversed(auxiliaries):
-                aux.head_tok = head_aux
-                aux.HEAD = head_aux.ID
+                attach(aux, head_aux, head_aux.ID)
                 aux.DEPREL = "oc"
                 head_aux = aux
             #verb dep of aux
-            verb.head_tok = head_aux
-            verb.HEAD = head_aux.ID
+            attach(verb, head_aux, head_aux.ID)
             verb.DEPREL = "oc"
             
         #Switch case relation for preposition  
         prep_heads = [tok for tok in sent.tokens 
-                      if any(t.head_tok == tok and t.DEPREL == "case" 
-                             and t.XPOS.startswith("AP") for t in sent.tokens)]
+                      if any(t.DEPREL == "case" and t.XPOS.startswith("AP")
+                             for t in graph.children(tok))]
         for prep_head in prep_heads:
-            preps = [tok for tok in sent.tokens 
-                     if tok.head_tok == prep_head and tok.DEPREL == "case" 
-                     and tok.XPOS.startswith("AP")]
-            circumpreps = [tok for tok in sent.tokens
-                           if tok.head_tok == prep_head and tok.DEPREL == "fixed"
-                           and tok.XPOS == "APZR"]
+            preps = [tok for tok in graph.children(prep_head)
+                     if tok.DEPREL == "case" and tok.XPOS.startswith("AP")]
+            circumpreps = [tok for tok in graph.children(prep_head)
+                           if tok.DEPREL == "fixed" and tok.XPOS == "APZR"]
             #Define prep_head
             new_head = preps[-1]
 
             #Make prep head of zircumpreps
             for cp in circumpreps:
-                cp.head_tok = new_head
-                cp.HEAD = new_head.ID
+                attach(cp, new_head, new_head.ID)
                 cp.DEPREL = "ac"
             #Make prep head of other preps
             for p in preps[:-1]:
-                p.head_tok = new_head
-                p.HEAD = new_head.ID
+                attach(p, new_head, new_head.ID)
                 p.DEPREL = "ac"
             #Make prep head of its prior head
-            new_head.head_tok = prep_head.head_tok
-            new_head.HEAD = prep_head.HEAD
+            attach(new_head, prep_head.head_tok, prep_head.HEAD)
             new_head.DEPREL = prep_head.DEPREL
-            prep_head.head_tok = new_head
-            prep_head.HEAD = new_head.ID
+            attach(prep_head, new_head, new_head.ID)
             prep_head.DEPREL = "nk" 
 
         #Switch coordination
         conjuncts = [tok for tok in sent.tokens if tok.DEPREL == "conj"]
         for conj in conjuncts:
-            conjunctions = [tok for tok in sent.tokens if tok.head_tok == conj and tok.DEPREL == "cc"]
+            conjunctions = [tok for tok in graph.children(conj) if tok.DEPREL == "cc"]
             if not conjunctions:
                 continue
             new_head = conjunctions.pop(0)
             for cc in conjunctions:
-                cc.head_tok = new_head
-                cc.HEAD = new_head.ID
-            new_head.head_tok = conj.head_tok
-            new_head.HEAD = conj.HEAD
-            conj.head_tok = new_head
-            conj.HEAD = new_head.ID
+                attach(cc, new_head, new_head.ID)
+            attach(new_head, conj.head_tok, conj.HEAD)
+            attach(conj, new_head, new_head.ID)
 
         #Switch flat relation
         flat_heads = [tok for tok in sent.tokens 
-                      if any(t.head_tok == tok and t.DEPREL == "flat" for t in sent.tokens)]
+                      if any(t.DEPREL == "flat" for t in graph.children(tok))]
         for flat_head in flat_heads:
             #Identify new head
-            flat_deps = [tok for tok in sent.tokens 
-                         if tok.head_tok == flat_head and tok.DEPREL == "flat"]
+            flat_deps = [tok for tok in graph.children(flat_head) if tok.DEPREL == "flat"]
             new_head = flat_deps[-1]
             #Change head of all deps of previous head
-            all_deps = [tok for tok in sent.tokens if tok.head_tok == flat_head and not tok == new_head]
+            all_deps = [tok for tok in graph.children(flat_head) if not tok == new_head]
             for dep in all_deps:
-                dep.head_tok = new_head
-                dep.HEAD = new_head.ID
+                attach(dep, new_head, new_head.ID)
             #Make last flat dep the new head
-            new_head.head_tok = flat_head.head_tok
-            new_head.HEAD = flat_head.HEAD
+            attach(new_head, flat_head.head_tok, flat_head.HEAD)
             new_head.DEPREL  = flat_head.DEPREL
             #Make previous head a dep of new head
-            flat_head.head_tok = new_head
-            flat_head.HEAD = new_head.ID
+            attach(flat_head, new_head, new_head.ID)
             flat_head.DEPREL = "flat"
 
         #for tok in sent.tokens:
@@ -1287,6 +1401,8 @@ class DependencyManipulator(Processor):
 ############################
 
 class TreeToBIOProcessor(Processor):
+
+    NEEDS_DOC = False
     
     def __init__(self):
         pass
@@ -1313,59 +1429,48 @@ class TreeToBIOProcessor(Processor):
 
         def get_bio_spans(node):
             """
-            Recursively get node tuples.
+            Get node tuples of all non-terminal nodes
+            in one traversal of the tree.
 
             Input: Tree object
             Output: List of node tuples (cat, startIndex, endIndex)
             """
-            if node.is_terminal():
-                return []
-
             spans = []
 
-            #If node does not contain any token
-            #and (therefore) has no start or end, skip it
-            if node.get_start_index() == None or node.get_end_index() == None:
-                pass
-            #Add tuple of this node
-            else:
-                spans.append((node.cat(), node.get_start_index(), node.get_end_index()))
+            #Non-terminal nodes in pre-order
+            for current in node.non_terminals():
+                start = current.get_start_index()
+                end = current.get_end_index()
 
-            #Recursively repeat
-            for child in node:
-                if not child.is_terminal():
-                    spans.extend(get_bio_spans(child))
+                #If node does not contain any token
+                #and (therefore) has no start or end, skip it
+                if start == None or end == None:
+                    continue
+
+                #Add tuple of this node
+                spans.append((current.cat(), start, end))
 
             return spans
 
         ##########################
         
         #Create list with empty annotation for all tokens
-        bio_annotations = ["" for _ in sentence.tokens]
+        bio_annotations = [[] for _ in sentence.tokens]
 
         bio_spans = []
         
-        #Recursively get tuples of cat, start and end
+        #Get tuples of cat, start and end
         for node in sentence.__dict__.get(treename, []):
             bio_spans.extend(get_bio_spans(node))
             
         #Add spans to annotation of the respective tokens
         for span in sorted(bio_spans, key=lambda l: (l[1], 0-l[2])):
-            
-            if bio_annotations[span[1]]:
-                bio_annotations[span[1]] += "|" + "B-"+span[0]
-            else:
-                bio_annotations[span[1]] += "B-"+span[0]
+            bio_annotations[span[1]].append("B-"+span[0])
             for i in range(span[1]+1, span[2]+1):
-                if bio_annotations[i]:
-                    bio_annotations[i] += "|" + "I-"+span[0]
-                else:
-                    bio_annotations[i] += "I-"+span[0]
+                bio_annotations[i].append("I-"+span[0])
         
-        #Add O for tokens outside spans
-        for t in range(len(bio_annotations)):
-            if not bio_annotations[t]:
-                bio_annotations[t] = "O"
+        #Join annotations and add O for tokens outside spans
+        bio_annotations = ["|".join(bio) if bio else "O" for bio in bio_annotations]
         
         #Move annotations from list to token attributes
         for tok, bio in zip(sentence.tokens, bio_annotations):
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+'''
+Timing and memory of the pipeline stages.
+
+The profiler records the wall-clock and CPU time of each stage
+(import, each processor, each exporter) for each file, together
+with the number of sentences and tokens after the stage.
+The summary reports the throughput (tokens per second) of each
+importer, processor and exporter.
+
+Optionally, the memory after each stage and the peak memory during
+the stage are measured with tracemalloc (relative to the memory
+before the import of the file). The memory after a stage divided by
+the number of tokens shows how many bytes per token the doc needs.
+
+Streamed docs are not read into memory for the measurement. Instead,
+the sentence iterator of each stage is wrapped and each stage gets the
+time it needs to deliver its sentences (without the time of the stages
+before it). Streamed stages run interleaved, so their peak memory is
+the peak of the whole streaming pass and their memory is measured
+when their last sentence was read.
+'''
+
+import os
+import csv
+import json
+import tracemalloc
+from time import perf_counter, process_time
+from contextlib import contextmanager
+from document import ColumnDoc
+
+############################
+
+def count(doc):
+    """
+    Return number of sentences and tokens of a doc.
+    Input: Doc or ColumnDoc object (or None)
+    Output: Tuple (sentences, tokens)
+    """
+    if doc is None:
+        return 0, 0
+    if isinstance(doc, ColumnDoc):
+        return doc.n_sents, len(doc)
+    return len(doc.sentences), sum(len(sent.tokens) for sent in doc.sentences)
+
+############################
+
+class Profiler(object):
+
+    FIELDS = ["file", "stage", "component", "sentences", "tokens", "wall", "cpu", "tokens/s"]
+    MEMORY_FIELDS = ["memory", "peak", "bytes/token"]
+
+    def __init__(self, memory=False, **kwargs):
+        """
+        Initialize a profiler.
+        Input: Measure memory (True/False)
+        """
+        self.records = []
+        self.memory = memory
+        #Wall and CPU time of measured stages inside the running measurements
+        self.nested = []
+        #Record of the last stage that streams its sentences
+        self.stream_record = None
+        #Traced memory before the import of the current file
+        self.base = 0
+        for key,val in kwargs.items():
+            self.__dict__[key] = val
+
+    ##########################
+
+    def get_fields(self):
+        if self.memory:
+            return self.FIELDS + self.MEMORY_FIELDS
+        return self.FIELDS
+
+    ##########################
+
+    @contextmanager
+    def measure(self, file, stage, component):
+        """
+        Measure the time of a stage for a file.
+
+        The block stores the resulting doc as stage["doc"].
+        If the doc is streamed, its sentences are measured when
+        they are read (see measure_stream) and the record is stored
+        after the last sentence.
+        Input: Filename, stage (import, process, export), component object
+        """
+        record = {"file" : file, "stage" : stage, "component" : type(component).__name__,
+                  "wall" : 0.0, "cpu" : 0.0}
+
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if stage == "import":
+                self.base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        with self.timer(record):
+            yield record
+
+        doc = record.pop("doc", None)
+        if doc is not None and not isinstance(doc, ColumnDoc) and doc.is_streamed():
+            #The exporter has read the stream of the previous stage
+            if stage == "export":
+                record["sentences"] = self.stream_record["sentences"]
+                record["tokens"] = self.stream_record["tokens"]
+                self.add_record(record)
+            else:
+                record["sentences"], record["tokens"] = 0, 0
+                doc.sentences = self.measure_stream(record, doc.sentences)
+                self.stream_record = record
+        else:
+            record["sentences"], record["tokens"] = count(doc)
+            self.add_record(record)
+
+    ##########################
+
+    @contextmanager
+    def timer(self, record):
+        """
+        Add the wall and CPU time of the block to the record,
+        without the time of measured stages inside the block.
+        """
+        self.nested.append([0.0, 0.0])
+        wall, cpu = perf_counter(), process_time()
+        try:
+            yield
+        finally:
+            wall = perf_counter() - wall
+            cpu = process_time() - cpu
+            inner_wall, inner_cpu = self.nested.pop()
+            record["wall"] += wall - inner_wall
+            record["cpu"] += cpu - inner_cpu
+            #The time is not counted again for an outer measurement
+            if self.nested:
+                self.nested[-1][0] += wall
+                self.nested[-1][1] += cpu
+
+    ##########################
+
+    def measure_stream(self, record, sentences):
+        """
+        Yield the sentences of a streamed doc and add the time
+        to read each sentence to the record of the stage.
+        Input: Record of the stage, iterator over sentences
+        """
+        sentences = iter(sentences)
+        try:
+            while True:
+                with self.timer(record):
+                    sent = next(sentences, None)
+                if sent is None:
+                    break
+                record["sentences"] += 1
+                record["tokens"] += len(sent.tokens)
+                yield sent
+        finally:
+            self.add_record(record)
+
+    ##########################
+
+    def add_record(self, record):
+        """
+        Complete the record of a stage with throughput and memory.
+        """
+        record["tokens/s"] = record["tokens"] / record["wall"] if record["wall"] else 0.0
+
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            record["memory"] = current - self.base
+            record["peak"] = peak - self.base
+            record["bytes/token"] = record["memory"] / record["tokens"] if record["tokens"] else 0.0
+
+        self.records.append(record)
+
+    ##########################
+
+    def summary(self):
+        """
+        Sum up the records of all files for each component.
+        For memory, the maximal peak and the average
+        bytes per token of all files are given.
+        Output: List of dictionaries (in pipeline order)
+        """
+        rows = dict()
+        for record in self.records:
+            key = (record["stage"], record["component"])
+            if not key in rows:
+                rows[key] = {"stage" : record["stage"], "component" : record["component"],
+                             "files" : 0, "sentences" : 0, "tokens" : 0, "wall" : 0.0, "cpu" : 0.0}
+                if self.memory:
+                    rows[key].update({"memory" : 0, "peak" : 0})
+            row = rows[key]
+            row["files"] += 1
+            for field in ("sentences", "tokens", "wall", "cpu"):
+                row[field] += record[field]
+            if self.memory:
+                row["memory"] += record["memory"]
+                row["peak"] = max(row["peak"], record["peak"])
+
+        for row in rows.values():
+            row["tokens/s"] = row["tokens"] / row["wall"] if row["wall"] else 0.0
+            if self.memory:
+                row["bytes/token"] = row.pop("memory") / row["tokens"] if row["tokens"] else 0.0
+
+        return list(rows.values())
+
+    ##########################
+
+    def print_summary(self):
+        """
+        Print time, throughput (and memory) of each component.
+        """
+        header = "{0:<8} {1:<30} {2:>6} {3:>10} {4:>10} {5:>10} {6:>12}".format(
+                 "stage", "component", "files", "tokens", "wall (s)", "cpu (s)", "tokens/s")
+        if self.memory:
+            header += " {0:>12} {1:>12}".format("peak (MB)", "bytes/token")
+        print(header)
+
+        for row in self.summary():
+            line = "{stage:<8} {component:<30} {files:>6} {tokens:>10} {wall:>10.3f} {cpu:>10.3f} {tokens/s:>12.0f}".format(**row)
+            if self.memory:
+                line += " {0:>12.1f} {1:>12.0f}".format(row["peak"]/2**20, row["bytes/token"])
+            print(line)
+
+    ##########################
+
+    def write(self, file):
+        """
+        Write the records and the summary to a file.
+        CSV (comma-separated) and TSV (tab-separated) files
+        contain one line per file and stage,
+        all other files are written as JSON.
+        Input: Filename (.csv, .tsv, .tab or other)
+        """
+        ext = os.path.splitext(file)[1].lower()
+        if ext in (".csv", ".tsv", ".tab"):
+            delimiter = "," if ext == ".csv" else "\t"
+            with open(file, mode="w", encoding="utf-8", newline="") as outfile:
+                writer = csv.DictWriter(outfile, fieldnames=self.get_fields(), delimiter=delimiter)
+                writer.writeheader()
+                writer.writerows(self.records)
+        else:
+            with open(file, mode="w", encoding="utf-8") as outfile:
+                json.dump({"summary" : self.summary(), "files" : self.records}, outfile, indent=1)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+'''
+Registry for the tagset mappings in the res folder.
+
+Each mapping table is read only once per process and
+shared by all processors as a read-only dictionary.
+'''
+
+import os
+from types import MappingProxyType
+
+#Resource folder of the package (independent of the working directory)
+RESOURCE_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "res"))
+
+#Tables that have already been read
+_tagsets = dict()
+
+############################
+
+def read_table(filename, sep="\t"):
+    """
+    Read a mapping file from the resource folder.
+    Input: Filename, column separator (None for any whitespace)
+    Output: Generator of lists with the fields of each line
+    """
+    file = open(os.path.join(RESOURCE_DIR, filename), mode="r", encoding="utf-8")
+    for line in file:
+        yield line.strip().split(sep)
+    file.close()
+
+############################
+
+def read_HIPKON():
+    #dictionary {"HIPKON" : "STTS"}
+    return {line[0] : line[1] for line in read_table("HIPKON-STTS.txt", sep=None)}
+
+def read_HiTS():
+    #dictionary {("pos", "posLemma") : "STTS"}
+    return {(line[0], line[1]) : line[4] for line in read_table("HiTS_STTS_mapping.csv")}
+
+def read_ReFHiTS():
+    #dictionary {("pos", "posLemma") : "STTS"}
+    tags = {(line[0], line[1]) : line[2] for line in read_table("ReF_HiTS-STTS_mapping.csv")}
+    tags[("_", "_")] = "_"
+    return tags
+
+def read_Anselm():
+    #dictionary {"Anselm" : "STTS"}
+    tags = {line[0] : line[1] for line in read_table("Anselm_pos_tags.csv")}
+    tags["_"] = "_"
+    return tags
+
+def read_Mercurius():
+    #dictionary {"Mercurius" : "STTS"}
+    return {line[0] : line[1] for line in read_table("mercurius_STTS.csv")}
+
+def read_ReFUP():
+    #dictionary {"ReF.UP" : "STTS"} without header
+    return {line[0] : line[1] for line in read_table("ReF-UP-STTS.csv")
+            if not ("POS" in "\t".join(line) and "STTS" in "\t".join(line))}
+
+def read_Fuerstinnen():
+    #dictionary {"POS" : "STTS"}
+    return {line[0] : line[1] for line in read_table("Fuerstinnen_STTS.csv")}
+
+############################
+
+TAGSETS = {"HIPKON" : read_HIPKON, "HiTS" : read_HiTS, "ReFHiTS" : read_ReFHiTS,
+           "Anselm" : read_Anselm, "Mercurius" : read_Mercurius, "ReFUP" : read_ReFUP,
+           "Fuerstinnen" : read_Fuerstinnen}
+
+############################
+
+def get_tagset(name):
+    """
+    Return the mapping for the given tagset.
+    The table is read when it is requested for the first time.
+    Two-level mappings (HiTS, ReFHiTS) have (POS, POS_GEN/POS_LEMMA) tuples as keys.
+    Input: Name of the tagset (see TAGSETS)
+    Output: Read-only dictionary {tag : STTS tag}
+    """
+    if not name in _tagsets:
+        _tagsets[name] = MappingProxyType(TAGSETS[name]())
+    return _tagsets[name]
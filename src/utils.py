@@ -54,6 +54,26 @@ def normalize_filename(filename, remove=None):
 
 ##################################
 
+def append_metainfo(metadir, metafilename, lines):
+    """
+    Append lines of a meta file to the file with the same name in metadir.
+    The header (first line) is skipped if the target file already has it.
+    Input: Target directory, name of the meta file, list of lines
+    """
+    if not lines:
+        return
+    metafile = open(os.path.join(metadir, metafilename), mode="a+", encoding="utf-8")
+    #Skip header if target already has one
+    if metafile.tell() != 0:
+        metafile.seek(0)
+        if metafile.readline() == lines[0]:
+            lines = lines[1:]
+        metafile.seek(0, os.SEEK_END)
+    metafile.writelines(lines)
+    metafile.close()
+
+##################################
+
 def get_DTA_context(sample_folder, complete_folder, targetdir):
 
     samplefiles = sorted([os.path.join(sample_folder, f) for f in os.listdir(sample_folder)])